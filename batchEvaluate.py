@@ -0,0 +1,302 @@
+import dataclasses
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import numpy as np
+from models import IncomeStatement, Stocks, Symbol, Valuation, ValuationModel
+import evaluate
+import intrinsicValue
+from intrinsicValue import safeDivide
+import trendEstimate
+import utils
+
+
+@dataclass
+class ValuationInputs:
+    """
+    the per stock values getValuation needs, one array element per stock
+    """
+
+    symbols: List[Symbol] = field(default_factory=list)
+    isValid: np.ndarray = None  # does the stock have a valid balance sheet
+    currentPrice: np.ndarray = None
+    sharesOutstanding: np.ndarray = None
+    assets: np.ndarray = None
+    liabilities: np.ndarray = None
+    currentLiabilities: np.ndarray = None
+    retainedEarnings: np.ndarray = None
+    cash: np.ndarray = None
+    netIncomeAvg: np.ndarray = None
+    dividendsPaid: np.ndarray = None
+    fcf: np.ndarray = None
+    totalRevenue: np.ndarray = None
+    earningsBeforeInterestAndTax: np.ndarray = None
+    growthRate: np.ndarray = None
+    priceGrowthRate: np.ndarray = None
+    statementYears: np.ndarray = None
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+def getGrowthRatesFromEstimates(initialValues, finalValues, model: ValuationModel):
+    """
+    the rest of evaluate.getNetIncomeGrowthRate given the trend estimates
+    """
+    # evaluate.getGrowthRate of [initialValue, finalValue]
+    isNegative = np.where((finalValues < 0) | (initialValues < 0), -1, 1)
+    ratios = np.abs(safeDivide(finalValues, initialValues))
+    growthRates = isNegative * (np.sqrt(ratios) - 1) / model.yearsForEarningsCalcs
+    conservativeGrowthRates = growthRates * (
+        1 - np.where(growthRates < 0, -1, 1) * model.minMos
+    )
+
+    return np.where(
+        (initialValues == 0) | (finalValues == 0), 0, conservativeGrowthRates
+    )
+
+
+def getNetIncomeGrowthRates(stocks: Stocks, model: ValuationModel) -> np.ndarray:
+    """
+    evaluate.getNetIncomeGrowthRate for every stock using one batched linear fit
+    """
+    now = datetime.now()
+    then = now - timedelta(days=(365 * model.yearsForEarningsCalcs))
+    statementsList = [
+        stocks[symbol].financialStatements.incomeStatements for symbol in stocks
+    ]
+    fits = trendEstimate.getTrendFits(statementsList, "netIncome", IncomeStatement())
+    initialValues = trendEstimate.getFitEstimates(
+        fits, utils.dateStringToNum(utils.dateToDateString(then))
+    )
+    finalValues = trendEstimate.getFitEstimates(
+        fits, utils.dateStringToNum(utils.dateToDateString(now))
+    )
+
+    return getGrowthRatesFromEstimates(initialValues, finalValues, model)
+
+
+def getValuationInputs(
+    stocks: Stocks, model: Optional[ValuationModel], closedForm: bool = False
+) -> ValuationInputs:
+    """
+    extract the inputs of every stock using the same helpers as getValuation
+    closedForm uses a batched linear fit for the net income growth rates
+    without a model the model dependent inputs (netIncomeAvg, growthRate) are 0
+    """
+    rows = []
+
+    for symbol in stocks:
+        stock = stocks[symbol]
+        latestBalanceSheet = evaluate.getLatestValidBalanceSheet(stock)
+        isValid = evaluate.validateBalanceSheet(latestBalanceSheet)
+
+        if not isValid:
+            rows.append((symbol, False, stock.currentPrice) + (0,) * 14)
+            continue
+
+        rows.append(
+            (
+                symbol,
+                True,
+                stock.currentPrice,
+                stock.sharesOutstanding,
+                latestBalanceSheet.assets,
+                latestBalanceSheet.liabilities,
+                evaluate.customRound(latestBalanceSheet.currentLiabilities, 2),
+                latestBalanceSheet.retainedEarnings,
+                latestBalanceSheet.cash,
+                (
+                    evaluate.getNetIncomeAvg(stock, model.yearsForEarningsCalcs)
+                    if model
+                    else 0
+                ),
+                evaluate.getDividendsPaidForYear(stock),
+                evaluate.getFcfForYear(stock),
+                evaluate.getTotalRevenueForYear(stock),
+                evaluate.getEarningsBeforeInterestAndTaxForYear(stock),
+                (
+                    evaluate.getNetIncomeGrowthRate(stock, model)
+                    if model and not closedForm
+                    else 0
+                ),
+                evaluate.getPriceGrowthRate(stock),
+                evaluate.getStatementYears(stock),
+            )
+        )
+
+    columns = list(zip(*rows)) or [[]] * 17
+    names = [inputField.name for inputField in dataclasses.fields(ValuationInputs)]
+    inputs = ValuationInputs(symbols=list(columns[0]))
+
+    for name, column in zip(names[1:], columns[1:]):
+        setattr(
+            inputs, name, np.array(column, dtype=bool if name == "isValid" else float)
+        )
+
+    if model and closedForm and inputs.symbols:
+        inputs.growthRate = np.where(
+            inputs.isValid, getNetIncomeGrowthRates(stocks, model), 0
+        )
+
+    return inputs
+
+
+def getPegs(pe, growthRate):
+    peg = safeDivide(pe, 100 * growthRate)
+
+    return np.where((pe < 0) & (growthRate < 0), -peg, peg)
+
+
+def getGrahamIvs(eps, growthRate, discountRate):
+    grahamIv = eps * (7 + growthRate * 100) * 4.4 / (discountRate * 100)
+
+    # a negative eps and growth rate will cancel each other out and appear positive
+    return np.where((eps < 0) & (growthRate < 0), -grahamIv, grahamIv)
+
+
+def getPeMultipleIvs(eps, pe, growthRate, discountRate):
+    noYrs = 5
+
+    return eps * pe * (1 + growthRate) ** noYrs / (1 + discountRate) ** noYrs
+
+
+def getAltmanZScores(
+    assets, liabilities, retainedEarnings, earningsBeforeInterestAndTax, totalRevenue
+):
+    equity = assets - liabilities
+    altmanZScore = (
+        1.2 * safeDivide(equity, assets)
+        + 1.4 * safeDivide(retainedEarnings, assets)
+        + 3.3 * safeDivide(earningsBeforeInterestAndTax, assets)
+        + 0.6 * safeDivide(equity, liabilities)
+        + 1 * safeDivide(totalRevenue, assets)
+    )
+
+    return np.where((liabilities == 0) | (totalRevenue == 0), 0, altmanZScore)
+
+
+def getViabilities(valuation: Dict[str, np.ndarray], model: ValuationModel):
+    # the same checks as evaluate.getViability
+    isNotViable = (
+        (valuation["roe"] < model.minRoe)
+        | (valuation["growthRate"] < model.minGrowthRate)
+        | (valuation["dte"] > model.maxDte)
+        | (valuation["dte"] < 0)
+        | (valuation["cr"] < model.minCr)
+        | (valuation["eps"] < model.minEps)
+        | (valuation["pe"] > model.maxPe)
+        | (valuation["pe"] < 0)
+        | (valuation["peg"] > model.maxPeg)
+        | (valuation["peg"] <= 0)
+        | (valuation["pb"] > model.maxPb)
+        | (valuation["pb"] < 0)
+        | (valuation["blendedMultiplier"] > model.maxBlendedMultiplier)
+        | (valuation["blendedMultiplier"] <= 0)
+        | (valuation["altmanZScore"] < model.minAltmanZScore)
+        | (valuation["statementYears"] < model.minStatementYears)
+    )
+
+    return ~isNotViable
+
+
+def getBatchValuation(
+    inputs: ValuationInputs, model: ValuationModel
+) -> Dict[str, np.ndarray]:
+    """
+    compute every Valuation field for all stocks at once
+    returns a column per Valuation field
+    """
+    price = inputs.currentPrice
+    shares = inputs.sharesOutstanding
+    assets = inputs.assets
+    growthRate = inputs.growthRate
+    equity = assets - inputs.liabilities
+    roe = safeDivide(inputs.netIncomeAvg, equity)
+    dividendYield = safeDivide(safeDivide(inputs.dividendsPaid, shares), price)
+    eps = safeDivide(inputs.netIncomeAvg, shares)
+    pe = safeDivide(price, eps)
+    pb = np.round(safeDivide(price, safeDivide(equity, shares)), 2)
+
+    valuation = {
+        "dividendYield": dividendYield,
+        "marketCap": shares * price,
+        "roe": roe,
+        "roa": safeDivide(inputs.netIncomeAvg, assets),
+        "growthRate": growthRate,
+        "priceGrowthRate": inputs.priceGrowthRate,
+        "dte": safeDivide(inputs.currentLiabilities, equity),
+        "cr": safeDivide(assets, inputs.currentLiabilities),
+        "eps": eps,
+        "pe": pe,
+        "peg": getPegs(pe, growthRate),
+        "pb": pb,
+        "blendedMultiplier": pe * pb,
+        "fcf": inputs.fcf,
+        "liquidationIv": safeDivide(equity, shares),
+        "peMultipleIv": getPeMultipleIvs(eps, pe, growthRate, model.discountRate),
+        "grahamIv": getGrahamIvs(eps, growthRate, model.discountRate),
+        "dcfIv": intrinsicValue.getDcfIvs(
+            inputs.fcf,
+            inputs.cash,
+            inputs.currentLiabilities,
+            shares,
+            growthRate,
+            model.declineRate,
+            model.discountRate,
+        ),
+        "roeIv": intrinsicValue.getRoeIvs(
+            equity, roe, shares, dividendYield, growthRate, model.discountRate
+        ),
+        "altmanZScore": getAltmanZScores(
+            assets,
+            inputs.liabilities,
+            inputs.retainedEarnings,
+            inputs.earningsBeforeInterestAndTax,
+            inputs.totalRevenue,
+        ),
+    }
+
+    # round like getValuation and use an empty Valuation for invalid stocks
+    for key in valuation:
+        valuation[key] = np.where(inputs.isValid, np.round(valuation[key], 2), 0)
+
+    valuation["statementYears"] = np.where(
+        inputs.isValid, inputs.statementYears, 0
+    ).astype(int)
+
+    # evaluate/assess the valuation
+    fairValue = valuation["peMultipleIv"]
+    isViable = getViabilities(valuation, model)
+    isSell = ~isViable | (price >= fairValue)
+    isBuy = ~isSell & (price <= fairValue)
+    altmanZScore = valuation["altmanZScore"]
+
+    valuation["fairValue"] = fairValue
+    valuation["expectedReturn"] = np.round(
+        safeDivide(100 * (fairValue - price), price), 2
+    )
+    valuation["instruction"] = np.where(isSell, "SELL", np.where(isBuy, "BUY", "HOLD"))
+    valuation["health"] = np.where(
+        altmanZScore < 1.8,
+        "DYING",
+        np.where(altmanZScore >= 3.0, "HEALTHY", "AVERAGE"),
+    )
+
+    return valuation
+
+
+def getValuations(
+    stocks: Stocks, model: ValuationModel, closedForm: bool = False
+) -> Dict[Symbol, Valuation]:
+    """
+    the batch equivalent of calling evaluate for each stock
+    """
+    inputs = getValuationInputs(stocks, model, closedForm)
+    batchValuation = getBatchValuation(inputs, model)
+    columns = {key: batchValuation[key].tolist() for key in batchValuation}
+
+    return {
+        symbol: Valuation(**{key: columns[key][i] for key in columns})
+        for i, symbol in enumerate(inputs.symbols)
+    }
@@ -0,0 +1,109 @@
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+import numpy as np
+import batchEvaluate
+import evaluate
+import utils
+from models import (
+    Stock,
+    FinancialStatements,
+    IncomeStatement,
+    BalanceSheet,
+    CashFlowStatement,
+    HistoricalPrice,
+    ValuationModel,
+)
+
+
+def makeStock(symbol: str, seed: int) -> Stock:
+    # a stock with 5 years of random (but plausible) quarterly statements
+    random = np.random.default_rng(seed)
+    incomeStatements = {}
+    balanceSheets = {}
+    cashFlowStatements = {}
+    historicalPricing = {}
+    netIncome = random.uniform(-50, 200)
+    assets = random.uniform(1000, 5000)
+    date = utils.getEndOfMonth(datetime.now() - relativedelta(years=5))
+
+    for i in range(20):
+        dateString = utils.dateToDateString(date)
+        netIncome = netIncome * random.uniform(0.9, 1.15)
+        incomeStatements[dateString] = IncomeStatement(
+            totalRevenue=random.uniform(500, 2000),
+            netIncome=netIncome,
+            incomeBeforeTax=netIncome * 1.3,
+            interestIncome=random.uniform(0, 10),
+            interestExpense=random.uniform(0, 10),
+        )
+        balanceSheets[dateString] = BalanceSheet(
+            assets=assets,
+            currentAssets=assets * random.uniform(0.2, 0.6),
+            liabilities=assets * random.uniform(0.1, 0.7),
+            currentLiabilities=assets * random.uniform(0.05, 0.3),
+            retainedEarnings=random.uniform(-100, 500),
+            cash=random.uniform(10, 300),
+        )
+        cashFlowStatements[dateString] = CashFlowStatement(
+            dividendsPaid=random.uniform(0, 20),
+            cashFromOperations=random.uniform(50, 300),
+            capex=random.uniform(-100, 0),
+        )
+        historicalPricing[dateString] = HistoricalPrice(
+            open=random.uniform(1, 20), close=random.uniform(1, 20)
+        )
+        date = utils.getEndOfMonth(date + relativedelta(months=3))
+
+    return Stock(
+        symbol=symbol,
+        currentPrice=random.uniform(0.5, 20),
+        sharesOutstanding=int(random.uniform(50, 500)),
+        historicalPricing=historicalPricing,
+        financialStatements=FinancialStatements(
+            incomeStatements=incomeStatements,
+            balanceSheets=balanceSheets,
+            cashFlowStatements=cashFlowStatements,
+        ),
+    )
+
+
+def testGetValuations():
+    # a lenient model so that we get both BUYs and SELLs
+    model = ValuationModel(
+        discountRate=0.01,
+        minRoe=0,
+        minGrowthRate=0,
+        maxDte=10,
+        minCr=0,
+        maxPe=1000,
+        maxPeg=1000,
+        maxPb=1000,
+        minAltmanZScore=0,
+        maxBlendedMultiplier=10000,
+    )
+    stocks = {f"S{i}": makeStock(f"S{i}", i) for i in range(50)}
+    stocks["INVALID"] = makeStock("INVALID", 50)
+    stocks["INVALID"].financialStatements.balanceSheets = {}
+    valuations = batchEvaluate.getValuations(stocks, model)
+
+    # it matches the scalar path
+    instructions = set()
+    for symbol in stocks:
+        batchValuation = valuations[symbol]
+        valuation = evaluate.evaluate(stocks[symbol], model)
+        instructions.add(valuation.instruction)
+
+        assert batchValuation.instruction == valuation.instruction
+        assert batchValuation.health == valuation.health
+        assert batchValuation.statementYears == valuation.statementYears
+
+        for key in ["roe", "pe", "peg", "pb", "dcfIv", "roeIv", "fairValue"]:
+            assert np.isclose(
+                batchValuation[key], valuation[key], rtol=1e-9, atol=0.01
+            ), (symbol, key)
+
+    assert instructions == {"BUY", "SELL"}
+
+
+def testSafeDivide():
+    assert batchEvaluate.safeDivide([1, 2, 3], [2, 0, 3]).tolist() == [0.5, 0, 1]
@@ -0,0 +1,228 @@
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from typing import Dict
+import evaluate
+import priceSeries
+import seriesCache
+import simulate
+import tradingCalendar
+import trendCache
+import utils
+from benchmarkUtils import getFastestTime
+from getStocks import getStocks
+from getStockSnapshot import getStockSnapshot
+from makeFinancialStatements import makeFinancialStatements
+from makeSyntheticStocks import (
+    makeSyntheticStocks,
+    makeLatestStatements,
+    writeSyntheticStocks,
+)
+from models import Portfolio, ValuationModel
+
+exchange = "SYNTH"
+# the synthetic stocks end on a fixed date so that runs on different days compare
+defaultEndDate = "2020-06-30"
+baselineFilename = "data/benchmarks/baseline.json"
+
+
+def clearCaches():
+    # every run starts cold so that the runs are comparable
+    seriesCache.clearSeriesCache()
+    trendCache.clearTrendCache()
+    priceSeries.clearPriceSeriesCache()
+
+
+def benchmark(name, function, noOperations, noRuns):
+    """
+    the fastest of noRuns runs of function, which does noOperations operations
+    """
+    with redirect_stdout(io.StringIO()):
+        seconds = getFastestTime(function, noRuns, setup=clearCaches)
+
+    perOperation = seconds / noOperations
+    print(f"{name}: {round(perOperation * 1000, 3)}ms per operation")
+
+    return {
+        "seconds": seconds,
+        "noOperations": noOperations,
+        "perOperation": perOperation,
+    }
+
+
+def getSimulationRange(endDate, noDays):
+    # simulate the last noDays days of the stocks
+    return endDate - timedelta(days=noDays), endDate + timedelta(days=1)
+
+
+def runSimulation(stocks, model, endDate, noDays):
+    startDate, simulationEndDate = getSimulationRange(endDate, noDays)
+    portfolio = simulate.makeDeposit(Portfolio(), startDate, 1000)
+
+    return simulate.simulate(
+        portfolio,
+        stocks,
+        model,
+        utils.dateToDateString(startDate),
+        utils.dateToDateString(simulationEndDate),
+        exchange,
+    )
+
+
+def runScenarios(noStocks, noYears, noDays, noRuns, seed, endDate) -> Dict:
+    stocks = makeSyntheticStocks(noStocks, noYears, seed, endDate)
+    model = ValuationModel()
+    # a snapshot of every stock on each of noDays days (like simulate takes them)
+    snapshotDates = [
+        endDate - timedelta(days=365 * noYears // 2 + day) for day in range(noDays)
+    ]
+    # simulate skips the days that nothing happens on (e.g. weekends)
+    noSimulationDays = len(
+        tradingCalendar.getSimulationDays(
+            *getSimulationRange(endDate, noDays),
+            tradingCalendar.getTradingDates(stocks),
+            tradingCalendar.getDividendDates(stocks),
+        )
+    )
+    results = {}
+
+    results["getValuation"] = benchmark(
+        "getValuation",
+        lambda: [evaluate.getValuation(stocks[symbol], model) for symbol in stocks],
+        len(stocks),
+        noRuns,
+    )
+    results["getStockSnapshot"] = benchmark(
+        "getStockSnapshot",
+        lambda: [
+            getStockSnapshot(stocks[symbol], date)
+            for date in snapshotDates
+            for symbol in stocks
+        ],
+        len(stocks) * noDays,
+        noRuns,
+    )
+    results["makeFinancialStatements"] = benchmark(
+        "makeFinancialStatements",
+        lambda: [
+            makeFinancialStatements(
+                stocks[symbol].financialStatements, makeLatestStatements(stocks[symbol])
+            )
+            for symbol in stocks
+        ],
+        len(stocks),
+        noRuns,
+    )
+
+    # the file based scenarios run in a temporary directory (simulate saves snapshots)
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+
+        try:
+            writeSyntheticStocks(stocks, exchange)
+            results["getStocks"] = benchmark(
+                "getStocks", lambda: getStocks(exchange), len(stocks), noRuns
+            )
+            results["simulateDay"] = benchmark(
+                "simulate (per day)",
+                lambda: runSimulation(stocks, model, endDate, noDays),
+                noSimulationDays,
+                noRuns,
+            )
+        finally:
+            os.chdir(cwd)
+
+    return results
+
+
+def compareToBaseline(results: Dict, baseline: Dict, tolerance: float) -> bool:
+    """
+    print each scenario's speed against the baseline
+    returns False if a scenario is slower than the tolerance allows
+    """
+    isOk = True
+
+    for name in results:
+        if name not in baseline["results"]:
+            print(f"{name}: not in the baseline")
+            continue
+
+        ratio = (
+            results[name]["perOperation"] / baseline["results"][name]["perOperation"]
+        )
+        isRegression = ratio > 1 + tolerance
+        isOk = isOk and not isRegression
+        print(
+            f"{name}: {round(ratio, 2)}x the baseline time{isRegression and ' REGRESSION' or ''}"
+        )
+
+    return isOk
+
+
+def runBenchmark():
+    argParser = argparse.ArgumentParser()
+    argParser.add_argument("--stocks", type=int, default=50)
+    argParser.add_argument("--years", type=int, default=10)
+    argParser.add_argument("--days", type=int, default=30)
+    argParser.add_argument("--runs", type=int, default=3)
+    argParser.add_argument("--seed", type=int, default=0)
+    argParser.add_argument("--endDate", type=str, default=defaultEndDate)
+    argParser.add_argument("--tolerance", type=float, default=0.1)
+    argParser.add_argument("--saveBaseline", type=bool, default=False)
+    args = argParser.parse_known_args()
+
+    print(
+        f"{args[0].stocks} stocks x {args[0].years} years, simulating {args[0].days} days"
+    )
+    now = datetime.now()
+    benchmarkResults = {
+        "date": now.isoformat(),
+        "stocks": args[0].stocks,
+        "years": args[0].years,
+        "days": args[0].days,
+        "seed": args[0].seed,
+        "endDate": args[0].endDate,
+        "results": runScenarios(
+            args[0].stocks,
+            args[0].years,
+            args[0].days,
+            args[0].runs,
+            args[0].seed,
+            utils.dateStringToDate(args[0].endDate),
+        ),
+    }
+
+    filename = f"data/benchmarks/{now.strftime('%Y-%m-%dT%H-%M-%S')}.json"
+    with utils.safeOpenWrite(filename) as file:
+        file.write(json.dumps(benchmarkResults, indent=2))
+    print(f"Saved the results to {filename}")
+
+    if args[0].saveBaseline:
+        with utils.safeOpenWrite(baselineFilename) as file:
+            file.write(json.dumps(benchmarkResults, indent=2))
+        print(f"Saved the results as the baseline")
+    elif utils.fileExists(baselineFilename):
+        with open(baselineFilename) as file:
+            baseline = json.load(file)
+
+        print(f"\nCompared to the baseline of {baseline['date']}")
+
+        for key in ["stocks", "years", "days", "endDate"]:
+            if baseline.get(key) != benchmarkResults[key]:
+                print(f"NOTE the baseline has {baseline.get(key)} {key}")
+
+        if not compareToBaseline(
+            benchmarkResults["results"], baseline, args[0].tolerance
+        ):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    runBenchmark()
@@ -0,0 +1,15 @@
+import timeit
+
+
+def getFastestTime(function, noRuns: int, setup="pass") -> float:
+    """
+    the seconds of the fastest of noRuns runs of function, setup runs before each
+    """
+    return min(timeit.repeat(function, setup=setup, number=1, repeat=noRuns))
+
+
+def benchmark(name, function, noRuns: int) -> float:
+    seconds = getFastestTime(function, noRuns)
+    print(f"{name}: {round(seconds * 1000, 2)}ms")
+
+    return seconds
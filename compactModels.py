@@ -0,0 +1,130 @@
+import sys
+import dataclasses
+from array import array
+from models import (
+    IncomeStatement,
+    BalanceSheet,
+    CashFlowStatement,
+    HistoricalPrice,
+    FinancialStatements,
+    Stock,
+    Stocks,
+)
+
+
+def makeNumberProperty(index: int):
+    def getter(self):
+        return self.values[index]
+
+    def setter(self, value):
+        self.values[index] = value
+
+    return property(getter, setter)
+
+
+def makeCompactModel(cls):
+    """
+    make a slotted version of a statement/price dataclass that packs its
+    number fields into a single array ("d" for float64 or "f" for float32)
+    and interns its string fields
+    """
+    fields = dataclasses.fields(cls)
+    fieldNames = tuple(field.name for field in fields)
+    numberFields = [field for field in fields if field.type is float]
+    otherFields = [field for field in fields if field.type is not float]
+    stringFieldNames = [field.name for field in otherFields if field.type is str]
+
+    def __init__(self, *args, float32: bool = False, **kwargs):
+        values = dict(zip(fieldNames, args))
+        values.update(kwargs)
+        self.values = array(
+            "f" if float32 else "d",
+            [values.get(field.name, field.default) for field in numberFields],
+        )
+
+        for field in otherFields:
+            value = values.get(field.name, field.default)
+
+            if field.name in stringFieldNames:
+                value = sys.intern(value)
+
+            setattr(self, field.name, value)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __eq__(self, other):
+        if not all(hasattr(other, name) for name in fieldNames):
+            return NotImplemented
+
+        return all(getattr(self, name) == getattr(other, name) for name in fieldNames)
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in fieldNames)
+        return f"{type(self).__name__}({values})"
+
+    namespace = {
+        "__slots__": ("values",) + tuple(field.name for field in otherFields),
+        "__init__": __init__,
+        "__getitem__": __getitem__,
+        "__eq__": __eq__,
+        "__hash__": None,
+        "__repr__": __repr__,
+        "fieldNames": fieldNames,
+    }
+
+    for index, field in enumerate(numberFields):
+        namespace[field.name] = makeNumberProperty(index)
+
+    return type(f"Compact{cls.__name__}", (), namespace)
+
+
+CompactIncomeStatement = makeCompactModel(IncomeStatement)
+CompactBalanceSheet = makeCompactModel(BalanceSheet)
+CompactCashFlowStatement = makeCompactModel(CashFlowStatement)
+CompactHistoricalPrice = makeCompactModel(HistoricalPrice)
+
+
+def compactModel(obj, compactCls, float32: bool = False):
+    return compactCls(
+        **{name: getattr(obj, name) for name in compactCls.fieldNames}, float32=float32
+    )
+
+
+def compactStatements(statements, compactCls, float32: bool = False):
+    # the same dates are used by every stock so we intern them too
+    return {
+        sys.intern(date): compactModel(statements[date], compactCls, float32)
+        for date in statements
+    }
+
+
+def compactStock(stock: Stock, float32: bool = False) -> Stock:
+    """
+    replace a stock's statements and pricing with their compact versions (in place)
+    """
+    stock.financialStatements = FinancialStatements(
+        incomeStatements=compactStatements(
+            stock.financialStatements.incomeStatements, CompactIncomeStatement, float32
+        ),
+        balanceSheets=compactStatements(
+            stock.financialStatements.balanceSheets, CompactBalanceSheet, float32
+        ),
+        cashFlowStatements=compactStatements(
+            stock.financialStatements.cashFlowStatements,
+            CompactCashFlowStatement,
+            float32,
+        ),
+    )
+    stock.historicalPricing = compactStatements(
+        stock.historicalPricing, CompactHistoricalPrice, float32
+    )
+
+    return stock
+
+
+def compactStocks(stocks: Stocks, float32: bool = False) -> Stocks:
+    for symbol in stocks:
+        compactStock(stocks[symbol], float32)
+
+    return stocks
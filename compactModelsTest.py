@@ -0,0 +1,67 @@
+import sys
+import modelLoader
+from compactModels import (
+    CompactIncomeStatement,
+    CompactHistoricalPrice,
+    compactModel,
+    compactStock,
+)
+from models import (
+    Stock,
+    FinancialStatements,
+    IncomeStatement,
+    BalanceSheet,
+    CashFlowStatement,
+    HistoricalPrice,
+)
+
+
+def makeStock() -> Stock:
+    return Stock(
+        symbol="SS",
+        historicalPricing={"2020-07-01": HistoricalPrice(open=10.1, close=11.5)},
+        financialStatements=FinancialStatements(
+            incomeStatements={
+                "2020-06-30": IncomeStatement(netIncome=100.3, source="actual")
+            },
+            balanceSheets={"2020-06-30": BalanceSheet(assets=1000, source="actual")},
+            cashFlowStatements={"2020-06-30": CashFlowStatement(estimate=True)},
+        ),
+    )
+
+
+def testCompactModel():
+    incomeStatement = IncomeStatement(totalRevenue=1000.5, netIncome=100.3)
+    compactIncomeStatement = compactModel(incomeStatement, CompactIncomeStatement)
+
+    # it behaves like the model it replaces
+    assert compactIncomeStatement == incomeStatement
+    assert compactIncomeStatement.netIncome == 100.3
+    assert compactIncomeStatement["totalRevenue"] == 1000.5
+    assert compactIncomeStatement != IncomeStatement()
+
+    compactIncomeStatement.netIncome = 50.0
+    assert compactIncomeStatement.netIncome == 50.0
+
+    # it has no __dict__
+    assert not hasattr(compactIncomeStatement, "__dict__")
+
+    # it interns strings
+    source = "".join(["act", "ual"])
+    assert CompactIncomeStatement(source=source).source is sys.intern("actual")
+
+    # it rounds to float32 when asked to
+    price = CompactHistoricalPrice(open=10.1, float32=True)
+    assert price.open != 10.1
+    assert round(price.open, 2) == 10.1
+
+
+def testCompactStock():
+    stock = makeStock()
+    stockData = modelLoader.dump(stock)
+    compactStock(stock)
+
+    assert isinstance(stock.historicalPricing["2020-07-01"], CompactHistoricalPrice)
+
+    # it dumps the same data
+    assert modelLoader.dump(stock) == stockData
@@ -0,0 +1,128 @@
+import argparse
+import numpy as np
+import pandas as pd
+import utils
+from benchmarkUtils import benchmark
+from models import HistoricalPrice
+from fetchHistoricalPricing import getHistoricalPricingFromDataFrame
+from fetchLatestFinancialStatements import (
+    getFinancialStatementsFromDataFrame,
+)
+
+
+# the iterrows implementations that the vectorized converters replaced
+def iterrowsHistoricalPricing(dataframe):
+    historicalPricings = {}
+
+    for index, row in dataframe.iterrows():
+        symbol = index[0]
+        date = index[1].__str__()
+        pricing = HistoricalPrice()
+        pricing.open = round(row.open, 2)
+        pricing.close = round(row.close, 2)
+
+        if symbol not in historicalPricings:
+            historicalPricings[symbol] = {}
+
+        historicalPricings[symbol][date] = pricing
+
+    return historicalPricings
+
+
+def iterrowsFinancialStatements(dataframe):
+    financialStatements = {}
+
+    for symbol, row in dataframe.iterrows():
+        dateString = utils.pandasDateToDateString(row["asOfDate"], True)
+        rowData = row.to_dict()
+
+        if rowData["periodType"] != "TTM":
+            if symbol not in financialStatements:
+                financialStatements[symbol] = {}
+
+            financialStatements[symbol][dateString] = rowData
+
+    return utils.falsyToInt(financialStatements)
+
+
+def makePriceHistoryDataFrame(noSymbols, noDays):
+    random = np.random.default_rng(0)
+    dates = pd.date_range("2019-01-01", periods=noDays, freq="B").date
+    symbols = [f"SYM{i}.JO" for i in range(noSymbols)]
+    index = pd.MultiIndex.from_product([symbols, dates], names=["symbol", "date"])
+    prices = random.uniform(1, 500, (len(index), 2))
+
+    return pd.DataFrame(prices, index=index, columns=["open", "close"])
+
+
+def makeStatementsDataFrame(noSymbols, noPeriods):
+    random = np.random.default_rng(0)
+    columns = [
+        "TotalRevenue",
+        "NetIncomeCommonStockholders",
+        "PretaxIncome",
+        "InterestIncome",
+        "NetInterestIncome",
+        "NetNonOperatingInterestIncomeExpense",
+    ]
+    symbols = np.repeat([f"SYM{i}.JO" for i in range(noSymbols)], noPeriods + 1)
+    noRows = len(symbols)
+    values = random.uniform(-1e9, 1e9, (noRows, len(columns)))
+    values[random.random((noRows, len(columns))) < 0.1] = np.nan
+    dataframe = pd.DataFrame(
+        values, index=pd.Index(symbols, name="symbol"), columns=columns
+    )
+    periodDates = pd.date_range("2015-03-31", periods=noPeriods + 1, freq=pd.offsets.QuarterEnd())
+    dataframe.insert(0, "asOfDate", np.tile(periodDates, noSymbols))
+    periodTypes = np.tile(["3M"] * noPeriods + ["TTM"], noSymbols)
+    dataframe.insert(1, "periodType", periodTypes)
+    dataframe.insert(2, "currencyCode", "ZAR")
+
+    return dataframe
+
+
+def runBenchmark():
+    argParser = argparse.ArgumentParser()
+    argParser.add_argument("--symbols", type=int, default=100)
+    argParser.add_argument("--days", type=int, default=252)
+    argParser.add_argument("--periods", type=int, default=20)
+    argParser.add_argument("--runs", type=int, default=3)
+    args = argParser.parse_known_args()
+    noSymbols = args[0].symbols
+    noRuns = args[0].runs
+
+    priceHistoryDf = makePriceHistoryDataFrame(noSymbols, args[0].days)
+    print(f"Historical pricing: {len(priceHistoryDf)} rows, {noSymbols} symbols")
+    assert iterrowsHistoricalPricing(
+        priceHistoryDf
+    ) == getHistoricalPricingFromDataFrame(priceHistoryDf)
+    before = benchmark(
+        "iterrows", lambda: iterrowsHistoricalPricing(priceHistoryDf), noRuns
+    )
+    after = benchmark(
+        "vectorized",
+        lambda: getHistoricalPricingFromDataFrame(priceHistoryDf),
+        noRuns,
+    )
+    print(f"Speed-up: {round(before / after, 1)}x\n")
+
+    statementsDf = makeStatementsDataFrame(noSymbols, args[0].periods)
+    # the statements are fetched (and converted) a symbol at a time
+    symbolDfs = [statementsDf.loc[[symbol]] for symbol in statementsDf.index.unique()]
+    print(f"Financial statements: {len(statementsDf)} rows, {noSymbols} symbols")
+    before = benchmark(
+        "iterrows",
+        lambda: [iterrowsFinancialStatements(symbolDf) for symbolDf in symbolDfs],
+        noRuns,
+    )
+    after = benchmark(
+        "vectorized",
+        lambda: [
+            getFinancialStatementsFromDataFrame(symbolDf) for symbolDf in symbolDfs
+        ],
+        noRuns,
+    )
+    print(f"Speed-up: {round(before / after, 1)}x")
+
+
+runBenchmark()
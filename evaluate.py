@@ -1,9 +1,10 @@
 import argparse
 import math
+import multiprocessing
 import json
 from typing import List
 from datetime import datetime, timedelta
-import typedload
+import modelLoader
 from models import (
     Currency,
     Shares,
@@ -15,8 +16,14 @@ from models import (
     CashFlowStatement,
     ValuationModel,
     Symbol,
+    Date,
+    Fundamentals,
 )
 import utils
+import trendCache
+import trendEstimate
+import seriesCache
+import priceSeries
 from getStockSnapshot import getStockSnapshot, getHistoricalPrice
 from getStocks import getStockList
 from decimal import Decimal
@@ -107,27 +114,33 @@ def getGrowthRate(values):
     return growthRate
 
 
-def getNetIncomeGrowthRate(stock: Stock, model: ValuationModel) -> Ratio:
+def getNetIncomeGrowthRate(
+    stock: Stock, model: ValuationModel, closedForm: bool = False
+) -> Ratio:
     now = datetime.now()
     then = now - timedelta(days=(365 * model.yearsForEarningsCalcs))
     thenString = utils.dateToDateString(then)
     nowString = utils.dateToDateString(now)
     order = 1  # CFO using linear growth here but we normally use poly for growth rate
 
-    initialValue = utils.getTrendEstimateForDate(
-        stock.financialStatements.incomeStatements,
-        "netIncome",
-        IncomeStatement(),
-        thenString,
-        order,
-    )
-    finalValue = utils.getTrendEstimateForDate(
-        stock.financialStatements.incomeStatements,
-        "netIncome",
-        IncomeStatement(),
-        nowString,
-        order,
-    )
+    if closedForm:
+        trend = trendEstimate.getLinearTrendModel(
+            stock.financialStatements,
+            "incomeStatements",
+            "netIncome",
+            IncomeStatement(),
+        )
+    else:
+        trend = trendCache.getTrendModel(
+            stock.symbol,
+            stock.financialStatements.incomeStatements,
+            "netIncome",
+            IncomeStatement(),
+            order,
+        )
+
+    initialValue = utils.getTrendEstimate(trend, thenString)
+    finalValue = utils.getTrendEstimate(trend, nowString)
 
     if not initialValue or not finalValue:
         return 0
@@ -139,21 +152,14 @@ def getNetIncomeGrowthRate(stock: Stock, model: ValuationModel) -> Ratio:
     return conservativeGrowthRate
 
 
-def getPriceGrowthRate(stock: Stock) -> Ratio:
-    # get the price growth rate over the last year
-    historicalValues = []
-    now = datetime.now()
-    aYearAgo = now - timedelta(days=365)
-    aYearAgoString = utils.dateToDateString(aYearAgo)
-
-    for date in stock.historicalPricing:
-        if date > aYearAgoString:
-            price = stock.historicalPricing[date].open
-
-            if price:
-                historicalValues.append(price)
-
-    priceGrowthRate = getGrowthRate(historicalValues)
+def getPriceGrowthRate(stock: Stock, asOfDate: datetime = None) -> Ratio:
+    # get the price growth rate over the year up to asOfDate (or now)
+    aYearAgo = (asOfDate or datetime.now()) - timedelta(days=365)
+    historicalValues = priceSeries.getPriceWindow(
+        stock, aYearAgo + timedelta(days=1), asOfDate
+    )
+    historicalValues = historicalValues[historicalValues != 0]
+    priceGrowthRate = getGrowthRate(historicalValues.tolist())
 
     return priceGrowthRate
 
@@ -317,23 +323,24 @@ def getAltmanZScore(
 
 
 def getLatestValidFinancialStatement(statements, validator):
-    latestDate = ""
-
-    for date in statements:
-        latestDate = utils.getLargest(date, latestDate)
+    # walk back from the latest date, without modifying statements
+    for date in sorted(statements, reverse=True):
+        statement = statements[date]
 
-    if not latestDate:
-        return None
+        if validator(statement):
+            return statement
 
-    statement = statements[latestDate]
-    isValid = validator(statement)
+    return None
 
-    if isValid:
-        return statement
 
-    # remove the invalid date and try again
-    del statements[latestDate]
-    return getLatestValidFinancialStatement(statements, validator)
+def getLatestValidBalanceSheet(stock: Stock, asOfDate: Date = None) -> BalanceSheet:
+    """
+    the latest valid balance sheet on or before asOfDate (or ever)
+    uses an index of valid dates that is built once per stock's statements
+    """
+    return seriesCache.getLatestValidStatement(
+        stock.financialStatements, "balanceSheets", validateBalanceSheet, asOfDate
+    )
 
 
 def validateBalanceSheet(balanceSheet: BalanceSheet) -> bool:
@@ -362,15 +369,16 @@ def getStatementYears(stock: Stock):
 
 def getAvgPe(stock):
     peList = []
-    historicalNetIncomes = utils.getHistoricalValuesFromFinancialStatements(
-        stock.financialStatements.incomeStatements,
+    historicalNetIncomes = seriesCache.getStockValues(
+        stock,
+        "incomeStatements",
         "netIncome",
         ValuationModel.yearsForEarningsCalcs * 4,
     )
 
-    for item in historicalNetIncomes:
+    for netIncome in historicalNetIncomes.tolist():
         # TODO we should do this for each statements's sharesOutstanding but we don't have that info
-        historicalEps = getEps(item["value"], stock.sharesOutstanding)
+        historicalEps = getEps(netIncome, stock.sharesOutstanding)
         historicalPe = getPe(stock.currentPrice, historicalEps)
         peList.append(historicalPe)
 
@@ -382,113 +390,53 @@ def getAvgPe(stock):
     return avgPe
 
 
-def getDividendYieldForYear(stock):
-    historicalDividends = utils.getHistoricalValuesFromFinancialStatements(
-        stock.financialStatements.cashFlowStatements, "dividendsPaid", 4
-    )
+def getDividendsPaidForYear(stock):
+    return seriesCache.getTrailingSum(stock, "cashFlowStatements", "dividendsPaid", 4)
 
-    dividendsPaidInLastYear = 0
-    for item in historicalDividends:
-        dividendsPaidInLastYear = dividendsPaidInLastYear + item["value"]
 
+def getDividendYieldForYear(stock):
     dividendYield = getDividendYield(
-        dividendsPaidInLastYear, stock.sharesOutstanding, stock.currentPrice,
+        getDividendsPaidForYear(stock), stock.sharesOutstanding, stock.currentPrice,
     )
 
     return dividendYield
 
 
 def getFcfForYear(stock):
-    historicalCashFromOperations = utils.getHistoricalValuesFromFinancialStatements(
-        stock.financialStatements.cashFlowStatements, "cashFromOperations", 4
-    )
-    historicalCapex = utils.getHistoricalValuesFromFinancialStatements(
-        stock.financialStatements.cashFlowStatements, "capex", 4
-    )
-
-    fcfForYear = 0
-    for i in range(len(historicalCashFromOperations)):
-        fcfForQuarter = getFcf(
-            historicalCashFromOperations[i]["value"], historicalCapex[i]["value"]
-        )
-        fcfForYear = fcfForYear + fcfForQuarter
-
-    return fcfForYear
+    # the sum of getFcf for each quarter
+    return seriesCache.getTrailingSum(stock, "cashFlowStatements", "fcf", 4)
 
 
 def getNetIncomeForYear(stock):
-    historicalNetIncomes = utils.getHistoricalValuesFromFinancialStatements(
-        stock.financialStatements.incomeStatements, "netIncome", 4
-    )
-
-    netIncomeForYear = 0
-    for i in range(len(historicalNetIncomes)):
-        netIncomeForQuarter = historicalNetIncomes[i]["value"]
-        netIncomeForYear = netIncomeForYear + netIncomeForQuarter
-
-    return netIncomeForYear
+    return seriesCache.getTrailingSum(stock, "incomeStatements", "netIncome", 4)
 
 
 def getNetIncomeAvg(stock, years):
-    historicalNetIncomes = utils.getHistoricalValuesFromFinancialStatements(
-        stock.financialStatements.incomeStatements,
-        "netIncome",
-        years * 4,  # * 4 quarters
+    totalNetIncome = seriesCache.getTrailingSum(
+        stock, "incomeStatements", "netIncome", years * 4  # * 4 quarters
     )
 
-    totalNetIncome = 0
-    for i in range(len(historicalNetIncomes)):
-        netIncomeForQuarter = historicalNetIncomes[i]["value"]
-        totalNetIncome = totalNetIncome + netIncomeForQuarter
-
     return totalNetIncome / years
 
 
 def getTotalRevenueForYear(stock):
-    historicalTotalRevenue = utils.getHistoricalValuesFromFinancialStatements(
-        stock.financialStatements.incomeStatements, "totalRevenue", 4
-    )
-
-    totalRevenueForYear = 0
-    for i in range(len(historicalTotalRevenue)):
-        totalRevenueForQuarter = historicalTotalRevenue[i]["value"]
-        totalRevenueForYear = totalRevenueForYear + totalRevenueForQuarter
-
-    return totalRevenueForYear
+    return seriesCache.getTrailingSum(stock, "incomeStatements", "totalRevenue", 4)
 
 
 def getEarningsBeforeInterestAndTaxForYear(stock):
-    historicalIncomeBeforeTax = utils.getHistoricalValuesFromFinancialStatements(
-        stock.financialStatements.incomeStatements, "incomeBeforeTax", 4
-    )
-    historicalInterestExpense = utils.getHistoricalValuesFromFinancialStatements(
-        stock.financialStatements.incomeStatements, "interestExpense", 4
-    )
-    historicalInterestIncome = utils.getHistoricalValuesFromFinancialStatements(
-        stock.financialStatements.incomeStatements, "interestIncome", 4
-    )
+    # NOTE: the interest terms of the original per quarter expression never
+    # contributed (incomeBeforeTax or 0), so this is the trailing incomeBeforeTax
+    return seriesCache.getTrailingSum(stock, "incomeStatements", "incomeBeforeTax", 4)
 
-    earningsBeforeInterestAndTaxForYear = 0
-    for i in range(len(historicalIncomeBeforeTax)):
-        earningsBeforeInterestAndTaxForQuarter = historicalIncomeBeforeTax[i] and (
-            historicalIncomeBeforeTax[i]["value"]
-            or 0 - i in historicalInterestExpense
-            and abs(historicalInterestExpense[i]["value"])
-            or 0 + i in historicalInterestIncome
-            and abs(historicalInterestIncome[i]["value"])
-            or 0
-        )
-        earningsBeforeInterestAndTaxForYear = (
-            earningsBeforeInterestAndTaxForYear + earningsBeforeInterestAndTaxForQuarter
-        )
-
-    return earningsBeforeInterestAndTaxForYear
 
-
-def getValuation(stock: Stock, model: ValuationModel) -> Valuation:
-    latestBalanceSheet: BalanceSheet = getLatestValidFinancialStatement(
-        stock.financialStatements.balanceSheets, validateBalanceSheet
-    )
+def getFundamentals(
+    stock: Stock, model: ValuationModel, closedForm: bool = False
+) -> Fundamentals:
+    """
+    the price independent part of getValuation, None if there's no valid balance sheet
+    closedForm uses trendEstimate's running linear fit for the net income growth rate
+    """
+    latestBalanceSheet: BalanceSheet = getLatestValidBalanceSheet(stock)
 
     if not validateBalanceSheet(latestBalanceSheet):
         print(
@@ -496,27 +444,17 @@ def getValuation(stock: Stock, model: ValuationModel) -> Valuation:
             latestBalanceSheet,
             "\n",
         )
-        return Valuation()
+        return None
 
     netIncomeAvg = getNetIncomeAvg(stock, model.yearsForEarningsCalcs)
     assets = latestBalanceSheet.assets
     liabilities = latestBalanceSheet.liabilities
     equity = getEquity(assets, liabilities)
-    roe = getRoe(netIncomeAvg, equity)
-    roa = getRoa(netIncomeAvg, assets)
-    dividendYield = getDividendYieldForYear(stock)
     fcf = getFcfForYear(stock)
-    marketCap = getMarketCap(stock.sharesOutstanding, stock.currentPrice)
     eps = getEps(netIncomeAvg, stock.sharesOutstanding)
-    pe = getPe(stock.currentPrice, eps)
-    growthRate = getNetIncomeGrowthRate(stock, model)
-    priceGrowthRate = getPriceGrowthRate(stock)
-    peg = getPeg(pe, growthRate)
+    growthRate = getNetIncomeGrowthRate(stock, model, closedForm)
     totalRevenue = getTotalRevenueForYear(stock)
     earningsBeforeInterestAndTax = getEarningsBeforeInterestAndTaxForYear(stock)
-    statementYears = getStatementYears(stock)
-    pb = customRound(getPb(stock.currentPrice, equity, stock.sharesOutstanding), 2)
-    blendedMultiplier = pe * pb
     currentLiabilities = customRound(latestBalanceSheet.currentLiabilities, 2)
     altmanZScore = getAltmanZScore(
         assets,
@@ -525,8 +463,6 @@ def getValuation(stock: Stock, model: ValuationModel) -> Valuation:
         earningsBeforeInterestAndTax,
         totalRevenue,
     )
-    peMultipleIv = getPeMultipleIv(eps, pe, growthRate, model.discountRate)
-    grahamIv = getGrahamIv(eps, growthRate, model.discountRate)
     dcfIv = getDcfIv(
         fcf,
         latestBalanceSheet.cash,
@@ -536,42 +472,88 @@ def getValuation(stock: Stock, model: ValuationModel) -> Valuation:
         model.declineRate,
         model.discountRate,
     )
+
+    return Fundamentals(
+        sharesOutstanding=stock.sharesOutstanding,
+        assets=assets,
+        equity=equity,
+        netIncomeAvg=netIncomeAvg,
+        dividendsPaid=getDividendsPaidForYear(stock),
+        roe=getRoe(netIncomeAvg, equity),
+        roa=getRoa(netIncomeAvg, assets),
+        eps=eps,
+        growthRate=growthRate,
+        priceGrowthRate=getPriceGrowthRate(stock),
+        dte=getDte(currentLiabilities, equity),
+        cr=getCr(assets, currentLiabilities),
+        fcf=fcf,
+        altmanZScore=altmanZScore,
+        statementYears=getStatementYears(stock),
+        grahamIv=getGrahamIv(eps, growthRate, model.discountRate),
+        dcfIv=dcfIv,
+        liquidationIv=getLiquidationIv(equity, stock.sharesOutstanding),
+    )
+
+
+def getPricedValuation(
+    fundamentals: Fundamentals, currentPrice: Currency, model: ValuationModel
+) -> Valuation:
+    # the price dependent part of getValuation
+    sharesOutstanding = fundamentals.sharesOutstanding
+    growthRate = fundamentals.growthRate
+    dividendYield = getDividendYield(
+        fundamentals.dividendsPaid, sharesOutstanding, currentPrice
+    )
+    marketCap = getMarketCap(sharesOutstanding, currentPrice)
+    pe = getPe(currentPrice, fundamentals.eps)
+    peg = getPeg(pe, growthRate)
+    pb = customRound(getPb(currentPrice, fundamentals.equity, sharesOutstanding), 2)
+    blendedMultiplier = pe * pb
+    peMultipleIv = getPeMultipleIv(fundamentals.eps, pe, growthRate, model.discountRate)
     roeIv = getRoeIv(
-        equity,
-        roe,
-        stock.sharesOutstanding,
+        fundamentals.equity,
+        fundamentals.roe,
+        sharesOutstanding,
         dividendYield,
         growthRate,
         model.discountRate,
     )
-    liquidationIv = getLiquidationIv(equity, stock.sharesOutstanding)
 
     valuation = Valuation()
     valuation.dividendYield = customRound(dividendYield, 2)
     valuation.marketCap = customRound(marketCap, 2)
-    valuation.roe = customRound(roe, 2)
-    valuation.roa = customRound(roa, 2)
+    valuation.roe = customRound(fundamentals.roe, 2)
+    valuation.roa = customRound(fundamentals.roa, 2)
     valuation.growthRate = customRound(growthRate, 2)
-    valuation.priceGrowthRate = customRound(priceGrowthRate, 2)
-    valuation.dte = customRound(getDte(currentLiabilities, equity), 2)
-    valuation.cr = customRound(getCr(assets, currentLiabilities), 2)
-    valuation.eps = customRound(eps, 2)
+    valuation.priceGrowthRate = customRound(fundamentals.priceGrowthRate, 2)
+    valuation.dte = customRound(fundamentals.dte, 2)
+    valuation.cr = customRound(fundamentals.cr, 2)
+    valuation.eps = customRound(fundamentals.eps, 2)
     valuation.pe = customRound(pe, 2)
     valuation.peg = customRound(peg, 2)
     valuation.pb = customRound(pb, 2)
     valuation.blendedMultiplier = customRound(blendedMultiplier, 2)
-    valuation.fcf = customRound(fcf, 2)
-    valuation.altmanZScore = customRound(altmanZScore, 2,)
-    valuation.statementYears = statementYears
+    valuation.fcf = customRound(fundamentals.fcf, 2)
+    valuation.altmanZScore = customRound(fundamentals.altmanZScore, 2)
+    valuation.statementYears = fundamentals.statementYears
     valuation.peMultipleIv = customRound(peMultipleIv, 2)
-    valuation.grahamIv = customRound(grahamIv, 2)
-    valuation.dcfIv = customRound(dcfIv, 2,)
-    valuation.roeIv = customRound(roeIv, 2,)
-    valuation.liquidationIv = customRound(liquidationIv, 2)
+    valuation.grahamIv = customRound(fundamentals.grahamIv, 2)
+    valuation.dcfIv = customRound(fundamentals.dcfIv, 2)
+    valuation.roeIv = customRound(roeIv, 2)
+    valuation.liquidationIv = customRound(fundamentals.liquidationIv, 2)
 
     return valuation
 
 
+def getValuation(stock: Stock, model: ValuationModel) -> Valuation:
+    fundamentals = getFundamentals(stock, model)
+
+    if not fundamentals:
+        return Valuation()
+
+    return getPricedValuation(fundamentals, stock.currentPrice, model)
+
+
 def getFairValue(valuation: Valuation) -> Currency:
     return valuation.peMultipleIv
 
@@ -632,25 +614,47 @@ def getHealth(valuation: Valuation) -> str:
         return "AVERAGE"
 
 
-def evaluate(stock: Stock) -> Valuation:
-    model = ValuationModel()
+def assessValuation(
+    valuation: Valuation, currentPrice: Currency, model: ValuationModel
+) -> Valuation:
+    valuation.fairValue = getFairValue(valuation)
+    valuation.expectedReturn = getExpectedReturn(valuation, currentPrice)
+    valuation.instruction = getInstruction(valuation, currentPrice, model)
+    valuation.health = getHealth(valuation)
+
+    return valuation
+
+
+def evaluate(stock: Stock, model: ValuationModel = None) -> Valuation:
+    model = model or ValuationModel()
 
     # get the valuation
     valuation = getValuation(stock, model)
 
     # evaluate/assess the valuation
-    valuation.fairValue = getFairValue(valuation)
-    valuation.expectedReturn = getExpectedReturn(valuation, stock.currentPrice)
-    valuation.instruction = getInstruction(valuation, stock.currentPrice, model)
-    valuation.health = getHealth(valuation)
+    return assessValuation(valuation, stock.currentPrice, model)
+
+
+def evaluateFundamentals(
+    fundamentals: Fundamentals, currentPrice: Currency, model: ValuationModel
+) -> Valuation:
+    """
+    evaluate a stock whose fundamentals we already have at currentPrice
+    the same as evaluate but without touching the statements
+    """
+    valuation = (
+        getPricedValuation(fundamentals, currentPrice, model)
+        if fundamentals
+        else Valuation()
+    )
 
-    return valuation
+    return assessValuation(valuation, currentPrice, model)
 
 
 def evaluateStock(symbol: Symbol, exchange: str, dateString: str = ""):
     filepath = f"data/stocks/{exchange}/{symbol}.json"
     with open(filepath) as file:
-        stock = typedload.load(json.load(file), Stock)
+        stock = modelLoader.load(json.load(file), Stock)
 
     if dateString:
         date = utils.dateStringToDate(dateString)
@@ -661,12 +665,83 @@ def evaluateStock(symbol: Symbol, exchange: str, dateString: str = ""):
     stock.valuation = valuation
 
     with utils.safeOpenWrite(filepath) as file:
-        jsonString = json.dumps(stock, default=lambda o: o.__dict__, indent=2)
+        jsonString = json.dumps(modelLoader.dump(stock), indent=2)
         file.write(jsonString)
 
     print(f"{symbol} added to {filepath}")
 
 
+def evaluateStockJob(job):
+    """
+    runs in a worker process, the writer process does the writing
+    with valuationOnly the worker replaces the stock file's valuation block itself
+    so that the files are patched in parallel, the writer only reports them
+    """
+    symbol, exchange, valuationOnly = job
+    filepath = f"data/stocks/{exchange}/{symbol}.json"
+    with open(filepath) as file:
+        data = json.load(file)
+
+    stock = modelLoader.load(data, Stock)
+    valuation = evaluate(stock)
+
+    if valuationOnly:
+        data["valuation"] = modelLoader.dump(valuation)
+
+        # not indented, json's indenting encoder is pure python and several times slower
+        with utils.safeOpenWrite(filepath) as file:
+            file.write(json.dumps(data))
+
+        return symbol, None
+
+    stock.valuation = valuation
+
+    return symbol, json.dumps(modelLoader.dump(stock), indent=2)
+
+
+def writeResults(queue, exchange: str):
+    """
+    the single writer, writes the results as they arrive until it gets None
+    results without data were written by their worker (valuationOnly)
+    """
+    while True:
+        result = queue.get()
+
+        if result is None:
+            break
+
+        symbol, data = result
+        filepath = f"data/stocks/{exchange}/{symbol}.json"
+
+        if data is not None:
+            with utils.safeOpenWrite(filepath) as file:
+                file.write(data)
+
+        print(f"{symbol} added to {filepath}")
+
+
+def evaluateStocks(
+    symbols: List[Symbol],
+    exchange: str,
+    noProcesses: int = None,
+    valuationOnly: bool = False,
+):
+    """
+    evaluate stocks over a pool of processes and stream the results to one writer
+    """
+    queue = multiprocessing.Queue()
+    writer = multiprocessing.Process(target=writeResults, args=(queue, exchange))
+    writer.start()
+
+    jobs = [(symbol, exchange, valuationOnly) for symbol in symbols]
+    with multiprocessing.Pool(noProcesses) as pool:
+        for result in pool.imap_unordered(evaluateStockJob, jobs, chunksize=8):
+            queue.put(result)
+
+    queue.put(None)
+    writer.join()
+
+
 def evaluateManager():
     # parse args
     argParser = argparse.ArgumentParser()
@@ -674,12 +749,16 @@ def evaluateManager():
     argParser.add_argument("--exchange", type=str)
     argParser.add_argument("--date", type=str)
     argParser.add_argument("--allStocks", type=bool)
+    argParser.add_argument("--processes", type=int, default=1)
+    argParser.add_argument("--valuationOnly", type=bool)
     args = argParser.parse_known_args()
 
     stock = args[0].stock
     exchange = args[0].exchange
     date = args[0].date
     allStocks = args[0].allStocks
+    processes = args[0].processes
+    valuationOnly = args[0].valuationOnly
 
     if stock and exchange and date:
         evaluateStock(stock, exchange, date)
@@ -688,8 +767,12 @@ def evaluateManager():
         # get a list of the stocks and evaluate each one
         stocks = getStockList(exchange)
 
-        for symbol in stocks:
-            evaluateStock(symbol, exchange)
+        if processes > 1 or valuationOnly:
+            evaluateStocks(stocks, exchange, processes, valuationOnly)
+        else:
+            for symbol in stocks:
+                evaluateStock(symbol, exchange)
 
 
-evaluateManager()
+if __name__ == "__main__":
+    evaluateManager()
@@ -0,0 +1,142 @@
+import dataclasses
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+import numpy as np
+from models import IncomeStatement, Stocks, Symbol, Valuation, ValuationModel
+from batchEvaluate import (
+    ValuationInputs,
+    getValuationInputs,
+    getGrowthRatesFromEstimates,
+    getBatchValuation,
+)
+import seriesCache
+import trendEstimate
+import utils
+
+
+@dataclass
+class ModelIndependentMetrics:
+    """
+    everything a valuation needs that doesn't depend on the model
+    """
+
+    inputs: ValuationInputs = None  # netIncomeAvg and growthRate are 0
+    # [i, q - 1] is the net income of stock i over its latest q quarters
+    trailingNetIncomes: np.ndarray = None
+    # the trendEstimate fits (slopes, intercepts, counts) of every stock's net income
+    netIncomeFits: Tuple = None
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+def getTrailingNetIncomes(stocks: Stocks) -> np.ndarray:
+    series = [
+        seriesCache.getStockValues(stocks[symbol], "incomeStatements", "netIncome")
+        for symbol in stocks
+    ]
+    noQuarters = max([len(values) for values in series] or [0])
+    trailingNetIncomes = np.zeros((len(series), noQuarters))
+
+    for i, values in enumerate(series):
+        # latest first, a stock with fewer quarters keeps its total
+        sums = np.cumsum(values[::-1])
+        trailingNetIncomes[i, : len(sums)] = sums
+        trailingNetIncomes[i, len(sums) :] = sums[-1] if len(sums) else 0
+
+    return trailingNetIncomes
+
+
+def getModelIndependentMetrics(stocks: Stocks) -> ModelIndependentMetrics:
+    statementsList = [
+        stocks[symbol].financialStatements.incomeStatements for symbol in stocks
+    ]
+
+    return ModelIndependentMetrics(
+        inputs=getValuationInputs(stocks, None),
+        trailingNetIncomes=getTrailingNetIncomes(stocks),
+        netIncomeFits=trendEstimate.getTrendFits(
+            statementsList, "netIncome", IncomeStatement()
+        ),
+    )
+
+
+def stackModels(models: List[ValuationModel]) -> ValuationModel:
+    """
+    a ValuationModel whose number fields are (model x 1) columns
+    so that it broadcasts against (stock) arrays to (model x stock)
+    """
+    stackedModel = ValuationModel()
+
+    for modelField in dataclasses.fields(ValuationModel):
+        if modelField.type in (int, float):
+            values = [getattr(model, modelField.name) for model in models]
+            setattr(stackedModel, modelField.name, np.array(values)[:, None])
+
+    return stackedModel
+
+
+def getModelValuations(
+    metrics: ModelIndependentMetrics, models: List[ValuationModel]
+) -> Dict[str, np.ndarray]:
+    """
+    apply every model to the metrics in one vectorized pass
+    returns a (model x stock) array per Valuation field
+    """
+    inputs = metrics.inputs
+    stackedModel = stackModels(models)
+    years = stackedModel.yearsForEarningsCalcs
+
+    # the net income averages of each model's years
+    noQuarters = metrics.trailingNetIncomes.shape[1]
+    if noQuarters:
+        indexes = np.minimum(years[:, 0] * 4, noQuarters) - 1
+        netIncomeAvgs = metrics.trailingNetIncomes[:, indexes].T / years
+    else:
+        netIncomeAvgs = np.zeros((len(models), len(inputs.symbols)))
+
+    # the growth rates from each model's trend estimates
+    now = datetime.now()
+    thenXs = np.array(
+        [
+            utils.dateStringToNum(
+                utils.dateToDateString(now - timedelta(days=365 * int(noYears)))
+            )
+            for noYears in years[:, 0]
+        ]
+    )[:, None]
+    initialValues = trendEstimate.getFitEstimates(metrics.netIncomeFits, thenXs)
+    finalValues = trendEstimate.getFitEstimates(
+        metrics.netIncomeFits, utils.dateStringToNum(utils.dateToDateString(now))
+    )
+    growthRates = getGrowthRatesFromEstimates(initialValues, finalValues, stackedModel)
+
+    modelInputs = dataclasses.replace(
+        inputs,
+        netIncomeAvg=np.where(inputs.isValid, netIncomeAvgs, 0),
+        growthRate=np.where(inputs.isValid, growthRates, 0),
+    )
+    valuation = getBatchValuation(modelInputs, stackedModel)
+    shape = (len(models), len(inputs.symbols))
+
+    return {key: np.broadcast_to(valuation[key], shape) for key in valuation}
+
+
+def evaluateModels(
+    stocks: Stocks, models: List[ValuationModel]
+) -> List[Dict[Symbol, Valuation]]:
+    """
+    the valuations of every stock for every model (in the same order as models)
+    """
+    metrics = getModelIndependentMetrics(stocks)
+    modelValuations = getModelValuations(metrics, models)
+    columns = {key: modelValuations[key].tolist() for key in modelValuations}
+
+    return [
+        {
+            symbol: Valuation(**{key: columns[key][k][i] for key in columns})
+            for i, symbol in enumerate(metrics.inputs.symbols)
+        }
+        for k in range(len(models))
+    ]
@@ -0,0 +1,74 @@
+import numpy as np
+import batchEvaluate
+import evaluateModels
+from batchEvaluateTest import makeStock
+from models import ValuationModel
+
+
+def makeModels():
+    return [
+        ValuationModel(name="default"),
+        ValuationModel(
+            name="lenient",
+            discountRate=0.01,
+            minRoe=0,
+            minGrowthRate=0,
+            maxDte=10,
+            minCr=0,
+            maxPe=1000,
+            maxPeg=1000,
+            maxPb=1000,
+            minAltmanZScore=0,
+            maxBlendedMultiplier=10000,
+        ),
+        ValuationModel(
+            name="longer",
+            discountRate=0.05,
+            declineRate=0.1,
+            minMos=0.1,
+            minGrowthRate=0,
+            maxPe=1000,
+            maxPeg=1000,
+            maxPb=1000,
+            minCr=0,
+            maxDte=10,
+            maxBlendedMultiplier=10000,
+            yearsForEarningsCalcs=5,
+        ),
+    ]
+
+
+def testEvaluateModels():
+    stocks = {f"S{i}": makeStock(f"S{i}", i) for i in range(40)}
+    stocks["INVALID"] = makeStock("INVALID", 40)
+    stocks["INVALID"].financialStatements.balanceSheets = {}
+    models = makeModels()
+    modelValuations = evaluateModels.evaluateModels(stocks, models)
+    instructions = set()
+
+    assert len(modelValuations) == len(models)
+
+    # each model matches the single model batch valuation
+    for model, valuations in zip(models, modelValuations):
+        expected = batchEvaluate.getValuations(stocks, model, closedForm=True)
+
+        for symbol in stocks:
+            instructions.add(valuations[symbol].instruction)
+
+            assert valuations[symbol].instruction == expected[symbol].instruction
+            assert valuations[symbol].statementYears == expected[symbol].statementYears
+
+            for key in ["growthRate", "roe", "pe", "dcfIv", "roeIv", "fairValue"]:
+                assert np.isclose(
+                    valuations[symbol][key], expected[symbol][key], atol=0.01
+                ), (model.name, symbol, key)
+
+    assert instructions == {"BUY", "SELL"}
+
+
+def testStackModels():
+    stackedModel = evaluateModels.stackModels(makeModels())
+
+    assert stackedModel.discountRate.shape == (3, 1)
+    assert stackedModel.yearsForEarningsCalcs[:, 0].tolist() == [3, 3, 5]
+    assert stackedModel.name == ""
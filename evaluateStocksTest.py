@@ -0,0 +1,46 @@
+import json
+import modelLoader
+import utils
+from batchEvaluateTest import makeStock
+from evaluate import evaluate, evaluateStocks
+
+
+def writeStocks(symbols):
+    stocks = {}
+
+    for i, symbol in enumerate(symbols):
+        stocks[symbol] = makeStock(symbol, i)
+        with utils.safeOpenWrite(f"data/stocks/TEST/{symbol}.json") as file:
+            file.write(json.dumps(modelLoader.dump(stocks[symbol])))
+
+    return stocks
+
+
+def testEvaluateStocks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stocks = writeStocks(["S0", "S1", "S2", "S3"])
+    evaluateStocks(list(stocks), "TEST", 2)
+
+    for symbol in stocks:
+        with open(f"data/stocks/TEST/{symbol}.json") as file:
+            data = json.load(file)
+
+        assert data["valuation"] == modelLoader.dump(evaluate(stocks[symbol]))
+        assert data["financialStatements"] == modelLoader.dump(
+            stocks[symbol].financialStatements
+        )
+
+
+def testEvaluateStocksValuationOnly(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stocks = writeStocks(["S0", "S1", "S2"])
+    evaluateStocks(list(stocks), "TEST", 2, valuationOnly=True)
+
+    for symbol in stocks:
+        with open(f"data/stocks/TEST/{symbol}.json") as file:
+            data = json.load(file)
+
+        # only the valuation block is replaced
+        assert data["valuation"] == modelLoader.dump(evaluate(stocks[symbol]))
+        data["valuation"] = modelLoader.dump(stocks[symbol].valuation)
+        assert data == modelLoader.dump(stocks[symbol])
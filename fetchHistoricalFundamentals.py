@@ -1,5 +1,5 @@
 import json
-import typedload
+import modelLoader
 from models import Symbol, HistoricalFundamentals
 import config
 import utils
@@ -30,9 +30,10 @@ def fetchHistoricalFundamentals(
     if not data or "Financials" not in data:
         return None
 
-    data = utils.falsyToInt(data)
+    # we only use the General and Financials data
+    data = utils.sanitize(data, ["General", "Financials"])
 
-    fundamentals = typedload.load(data, HistoricalFundamentals)
+    fundamentals = modelLoader.load(data, HistoricalFundamentals)
 
     if not data or "Financials" not in data:
         removeSymbol(symbol, exchange)
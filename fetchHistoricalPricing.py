@@ -1,27 +1,42 @@
+from typing import Dict
 from yahooquery import Ticker
 import utils
 from models import (
+    Symbol,
     HistoricalPrice,
     HistoricalPricing,
     YahooQueryTickerData,
 )
 
 
+def getHistoricalPricingFromDataFrame(dataframe) -> Dict[Symbol, HistoricalPricing]:
+    """
+    convert a yahooquery history dataframe (indexed by symbol and date)
+    into HistoricalPricing for every symbol in the frame
+    """
+    symbols = dataframe.index.get_level_values(0)
+    dates = map(str, dataframe.index.get_level_values(1))
+    opens = dataframe["open"].round(2).tolist()
+    closes = dataframe["close"].round(2).tolist()
+    historicalPricings = {}
+
+    for symbol, date, open, close in zip(symbols, dates, opens, closes):
+        if symbol not in historicalPricings:
+            historicalPricings[symbol] = {}
+
+        historicalPricings[symbol][date] = HistoricalPrice(open=open, close=close)
+
+    return historicalPricings
+
+
 def fetchHistoricalPricing(symbol: str) -> HistoricalPricing:
     data: YahooQueryTickerData = Ticker(symbol)
     priceHistoryDf = data.history(period="1y")
-    historicalPricing = {}
 
-    # sometimes iterrows is undefined
+    # sometimes we get an error dict instead of a dataframe
     try:
-        for index, row in priceHistoryDf.iterrows():
-            date = index[1].__str__()
-            pricing = HistoricalPrice()
-            pricing.open = round(row.open, 2)
-            pricing.close = round(row.close, 2)
-            historicalPricing[date] = pricing
+        historicalPricings = getHistoricalPricingFromDataFrame(priceHistoryDf)
     except:
         return None
 
-    return historicalPricing
-
+    return historicalPricings.get(symbol, {})
@@ -1,5 +1,6 @@
+from typing import Any, Dict
+import numpy as np
 from yahooquery import Ticker
-import utils
 from models import (
     Date,
     Symbol,
@@ -11,23 +12,26 @@ from models import (
 )
 
 
-def getFinancialStatementsFromDataFrame(dataframe):
-    financialStatements = {}
+def cleanFinancialStatementsDataFrame(dataframe):
+    """
+    drop TTM rows, convert asOfDate to a date string and replace any
+    None, NaN or inf values with 0 (column-wise equivalent of sanitize)
+    """
+    # unfortunately TTM statements are inaccurate (US/ACB), we want actual statements
+    frame = dataframe[dataframe["periodType"] != "TTM"].copy()
+    frame["asOfDate"] = frame["asOfDate"].dt.strftime("%Y-%m-%d")
+    frame = frame.replace([np.inf, -np.inf], np.nan).fillna(0)
 
-    try:
-        for _, row in dataframe.iterrows():
-            dateString: Date = utils.pandasDateToDateString(row["asOfDate"], True)
-            rowData = row.to_dict()
+    return frame
 
-            # unfortunately TTM statements are inaccurate (US/ACB), we want actual statements
-            if rowData["periodType"] != "TTM":
-                financialStatements[dateString] = rowData
-    except:
-        return financialStatements
 
-    financialStatements = utils.falsyToInt(financialStatements)
+def getFinancialStatementsFromDataFrame(dataframe) -> Dict[Date, Any]:
+    try:
+        frame = cleanFinancialStatementsDataFrame(dataframe)
+    except:
+        return {}
 
-    return financialStatements
+    return dict(zip(frame["asOfDate"], frame.to_dict("records")))
 
 
 def fetchLatestFinancialStatements(symbol: Symbol) -> YahooQueryFinancialStatements:
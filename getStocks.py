@@ -1,8 +1,10 @@
 import os
 from datetime import datetime
 import json
-import typedload
+import modelLoader
 from models import Stocks, Stock
+from compactModels import compactStock
+import priceSeries
 
 
 def getStockList(exchange, toIndex=0, fromIndex=0):
@@ -22,7 +24,7 @@ def getStockList(exchange, toIndex=0, fromIndex=0):
     return stockList
 
 
-def getStocks(exchange, toIndex=0, fromIndex=0) -> Stocks:
+def getStocks(exchange, toIndex=0, fromIndex=0, compact=False, float32=False) -> Stocks:
     # create a list of stocks from each file in data/stocks/{exchange}
     print("Getting stocks...")
     startTime = datetime.now()
@@ -33,8 +35,15 @@ def getStocks(exchange, toIndex=0, fromIndex=0) -> Stocks:
     stocks = {}
     stock = None
     for fileName in stockList:
-        with open(f"{pathToStocks}{fileName}") as file:
-            stock = typedload.load(json.load(file), Stock)
+        with open(f"{pathToStocks}{fileName}.json") as file:
+            stock = modelLoader.load(json.load(file), Stock)
+
+            if compact:
+                # use the slotted statements and pricing to save memory
+                stock = compactStock(stock, float32)
+
+            # index the pricing now so that price lookups are O(1) from the start
+            priceSeries.getPriceSeries(stock.historicalPricing)
             stocks[stock.symbol] = stock
 
     endTime = datetime.now()
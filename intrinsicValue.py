@@ -0,0 +1,64 @@
+import numpy as np
+
+noYrs = 10
+valuationLastFcf = 12  # 12 is conservative, 15 is aggressive
+
+
+def safeDivide(a, b) -> np.ndarray:
+    """
+    a / b with 0 wherever b is 0 (utils.safeDivide for arrays)
+    """
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+
+    return np.divide(a, b, out=np.zeros(a.shape), where=b != 0)
+
+
+def getYearAxis(value) -> np.ndarray:
+    # add a trailing axis for the years
+    return np.asarray(value, dtype=float)[..., None]
+
+
+def getDcfIvs(
+    fcf, cash, liabilities, sharesOutstanding, growthRate, declineRate, discountRate
+) -> np.ndarray:
+    """
+    evaluate.getDcfIv for arrays, every argument is broadcast against the others
+    e.g. pass discountRate[:, None] to get a (discount rate x stock) grid
+    the years are an extra (last) axis so there are no python loops
+    """
+    years = np.arange(noYrs)
+
+    # futureFcf[i] = fcf * prod(1 + growthRate * (1 - declineRate) ** k for k <= i)
+    growthFactors = (
+        1 + getYearAxis(growthRate) * (1 - getYearAxis(declineRate)) ** years
+    )
+    futureFcfs = getYearAxis(fcf) * np.cumprod(growthFactors, axis=-1)
+    npvs = futureFcfs / (1 + getYearAxis(discountRate)) ** (years + 1)
+
+    companyValue = (
+        npvs.sum(axis=-1) + npvs[..., -1] * valuationLastFcf + cash - liabilities
+    )
+
+    return safeDivide(companyValue, sharesOutstanding)
+
+
+def getRoeIvs(
+    equity, avgRoe, sharesOutstanding, dividendYield, growthRate, discountRate
+) -> np.ndarray:
+    """
+    evaluate.getRoeIv for arrays, every argument is broadcast against the others
+    the years are an extra (last) axis so there are no python loops
+    """
+    growthRate = np.asarray(growthRate, dtype=float)
+    discountRate = np.asarray(discountRate, dtype=float)
+    equityPerShare = safeDivide(equity, sharesOutstanding)
+
+    year10NetIncome = equityPerShare * (1 + growthRate) ** noYrs * avgRoe
+    requiredValue = year10NetIncome / discountRate
+    npvRequiredValue = requiredValue / (1 + discountRate) ** noYrs
+
+    # sum of dividendYield * (1 + growthRate) ** (i + 1) / (1 + discountRate) ** i
+    ratios = getYearAxis((1 + growthRate) / (1 + discountRate)) ** np.arange(noYrs)
+    npvDividends = dividendYield * (1 + growthRate) * ratios.sum(axis=-1)
+
+    return npvRequiredValue + npvDividends
@@ -0,0 +1,83 @@
+import argparse
+import numpy as np
+import evaluate
+import intrinsicValue
+from benchmarkUtils import benchmark
+
+
+def runBenchmark():
+    argParser = argparse.ArgumentParser()
+    argParser.add_argument("--stocks", type=int, default=2000)
+    argParser.add_argument("--discountRates", type=int, default=10)
+    argParser.add_argument("--runs", type=int, default=3)
+    args = argParser.parse_known_args()
+    noStocks = args[0].stocks
+    noRuns = args[0].runs
+
+    random = np.random.default_rng(0)
+    fcf = random.uniform(-100, 500, noStocks)
+    cash = random.uniform(0, 300, noStocks)
+    liabilities = random.uniform(0, 1000, noStocks)
+    equity = random.uniform(-500, 5000, noStocks)
+    avgRoe = random.uniform(-0.2, 0.4, noStocks)
+    sharesOutstanding = random.uniform(50, 500, noStocks)
+    dividendYield = random.uniform(0, 0.1, noStocks)
+    growthRate = random.uniform(-0.2, 0.3, noStocks)
+    declineRate = 0.05
+    discountRates = np.linspace(0.05, 0.2, args[0].discountRates)
+    print(f"{noStocks} stocks x {len(discountRates)} discount rates")
+
+    before = benchmark(
+        "evaluate.getDcfIv + evaluate.getRoeIv",
+        lambda: [
+            (
+                evaluate.getDcfIv(
+                    fcf[i],
+                    cash[i],
+                    liabilities[i],
+                    sharesOutstanding[i],
+                    growthRate[i],
+                    declineRate,
+                    discountRate,
+                ),
+                evaluate.getRoeIv(
+                    equity[i],
+                    avgRoe[i],
+                    sharesOutstanding[i],
+                    dividendYield[i],
+                    growthRate[i],
+                    discountRate,
+                ),
+            )
+            for discountRate in discountRates
+            for i in range(noStocks)
+        ],
+        noRuns,
+    )
+    after = benchmark(
+        "intrinsicValue.getDcfIvs + intrinsicValue.getRoeIvs",
+        lambda: (
+            intrinsicValue.getDcfIvs(
+                fcf,
+                cash,
+                liabilities,
+                sharesOutstanding,
+                growthRate,
+                declineRate,
+                discountRates[:, None],
+            ),
+            intrinsicValue.getRoeIvs(
+                equity,
+                avgRoe,
+                sharesOutstanding,
+                dividendYield,
+                growthRate,
+                discountRates[:, None],
+            ),
+        ),
+        noRuns,
+    )
+    print(f"Speed-up: {round(before / after, 1)}x")
+
+
+runBenchmark()
@@ -0,0 +1,86 @@
+import numpy as np
+import evaluate
+import intrinsicValue
+
+
+def testGetDcfIvs():
+    random = np.random.default_rng(1)
+    fcf = random.uniform(-100, 500, 50)
+    cash = random.uniform(0, 300, 50)
+    liabilities = random.uniform(0, 1000, 50)
+    sharesOutstanding = random.uniform(50, 500, 50)
+    growthRate = random.uniform(-0.2, 0.3, 50)
+    declineRates = np.array([0, 0.05, 0.1])
+    discountRates = np.array([0.05, 0.1, 0.15, 0.2])
+
+    # a (discount rate x decline rate x stock) grid
+    dcfIvs = intrinsicValue.getDcfIvs(
+        fcf,
+        cash,
+        liabilities,
+        sharesOutstanding,
+        growthRate,
+        declineRates[:, None],
+        discountRates[:, None, None],
+    )
+
+    assert dcfIvs.shape == (4, 3, 50)
+
+    for i, discountRate in enumerate(discountRates):
+        for j, declineRate in enumerate(declineRates):
+            for k in range(50):
+                expected = evaluate.getDcfIv(
+                    fcf[k],
+                    cash[k],
+                    liabilities[k],
+                    sharesOutstanding[k],
+                    growthRate[k],
+                    declineRate,
+                    discountRate,
+                )
+                assert np.isclose(dcfIvs[i, j, k], expected, rtol=1e-9)
+
+
+def testGetRoeIvs():
+    random = np.random.default_rng(2)
+    equity = random.uniform(-500, 5000, 50)
+    avgRoe = random.uniform(-0.2, 0.4, 50)
+    sharesOutstanding = random.uniform(50, 500, 50)
+    dividendYield = random.uniform(0, 0.1, 50)
+    growthRate = random.uniform(-0.2, 0.3, 50)
+    discountRates = np.array([0.05, 0.1, 0.15, 0.2])
+
+    roeIvs = intrinsicValue.getRoeIvs(
+        equity,
+        avgRoe,
+        sharesOutstanding,
+        dividendYield,
+        growthRate,
+        discountRates[:, None],
+    )
+
+    assert roeIvs.shape == (4, 50)
+
+    for i, discountRate in enumerate(discountRates):
+        for k in range(50):
+            expected = evaluate.getRoeIv(
+                equity[k],
+                avgRoe[k],
+                sharesOutstanding[k],
+                dividendYield[k],
+                growthRate[k],
+                discountRate,
+            )
+            assert np.isclose(roeIvs[i, k], expected, rtol=1e-9)
+
+
+def testGetRoeIvsEqualRates():
+    # growthRate == discountRate
+    roeIv = intrinsicValue.getRoeIvs(1000, 0.1, 100, 0.05, 0.1, 0.1)
+    expected = evaluate.getRoeIv(1000, 0.1, 100, 0.05, 0.1, 0.1)
+
+    assert np.isclose(roeIv, expected)
+
+
+def testGetDcfIvsNoShares():
+    assert intrinsicValue.getDcfIvs(100, 10, 10, 0, 0.1, 0.05, 0.1) == 0
@@ -1,11 +1,11 @@
 import json
 import argparse
 from datetime import datetime
-import typedload
+import modelLoader
 from alive_progress import alive_bar
 from firebase import db
 from utils import (
-    falsyToInt,
+    sanitize,
     getNumberOfSymbolsToProcess,
     dateToDateString,
     safeOpenWrite,
@@ -69,9 +69,9 @@ def processStock(symbol):
             return
     else:
         # replace any None, NaN values with 0 (lord knows how they got in there, probably my spaghetti code)
-        stockData = falsyToInt(stockData)
+        stockData = sanitize(stockData)
 
-        stock = typedload.load(stockData, Stock)
+        stock = modelLoader.load(stockData, Stock)
 
     # don't process stocks that have already been updated today
     if unprocessed and stock.lastUpdated == today:
@@ -173,7 +173,7 @@ def processStock(symbol):
     stock.lastUpdated = today
 
     # convert our stock class to a json string
-    stockJson = json.loads(json.dumps(stock, default=lambda o: o.__dict__, indent=2))
+    stockJson = modelLoader.dump(stock)
 
     stockRef.set(stockJson, merge=True)
 
@@ -181,7 +181,7 @@ def processStock(symbol):
         # store the data locally
         filepath = f"data/stocks/{exchange}/{symbol}.json"
         with safeOpenWrite(filepath) as file:
-            jsonString = json.dumps(stockJson, default=lambda o: o.__dict__, indent=2)
+            jsonString = json.dumps(stockJson, indent=2)
             file.write(jsonString)
 
     print(
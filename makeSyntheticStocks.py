@@ -0,0 +1,166 @@
+import argparse
+import json
+from datetime import datetime, timedelta
+from dateutil.relativedelta import relativedelta
+import numpy as np
+import modelLoader
+import utils
+from models import (
+    Stock,
+    Stocks,
+    FinancialStatements,
+    IncomeStatement,
+    BalanceSheet,
+    CashFlowStatement,
+    HistoricalPrice,
+    AllFinancialStatements,
+    AllIncomeStatements,
+    AllBalanceSheets,
+    AllCashFlowStatements,
+)
+
+
+def makeHistoricalPricing(random, startDate, endDate):
+    # a random walk of weekday prices
+    historicalPricing = {}
+    price = random.uniform(1, 50)
+    date = startDate
+
+    while date <= endDate:
+        if date.weekday() < 5:
+            price = max(0.01, price * (1 + random.normal(0.0003, 0.02)))
+            historicalPricing[utils.dateToDateString(date)] = HistoricalPrice(
+                open=round(price, 2),
+                close=round(price * (1 + random.normal(0, 0.01)), 2),
+            )
+
+        date = date + timedelta(days=1)
+
+    return historicalPricing
+
+
+def makeSyntheticStock(
+    symbol: str, noYears: int, seed: int = 0, endDate: datetime = None
+) -> Stock:
+    """
+    a stock with noYears of random (but plausible) quarterly statements and daily prices
+    the same symbol, noYears, seed and endDate always make the same stock
+    """
+    random = np.random.default_rng([seed, *symbol.encode()])
+    endDate = endDate or datetime.now()
+    date = utils.getEndOfMonth(endDate - relativedelta(years=noYears))
+    incomeStatements = {}
+    balanceSheets = {}
+    cashFlowStatements = {}
+    netIncome = random.uniform(-50, 200)
+    assets = random.uniform(1000, 5000)
+    historicalPricing = makeHistoricalPricing(random, date, endDate)
+
+    while date <= endDate:
+        dateString = utils.dateToDateString(date)
+        netIncome = netIncome * random.uniform(0.9, 1.15)
+        assets = assets * random.uniform(0.97, 1.05)
+        incomeStatements[dateString] = IncomeStatement(
+            totalRevenue=random.uniform(500, 2000),
+            netIncome=netIncome,
+            incomeBeforeTax=netIncome * 1.3,
+            interestIncome=random.uniform(0, 10),
+            interestExpense=random.uniform(0, 10),
+            source="actual",
+        )
+        balanceSheets[dateString] = BalanceSheet(
+            assets=assets,
+            currentAssets=assets * random.uniform(0.2, 0.6),
+            liabilities=assets * random.uniform(0.1, 0.7),
+            currentLiabilities=assets * random.uniform(0.05, 0.3),
+            retainedEarnings=random.uniform(-100, 500),
+            cash=random.uniform(10, 300),
+            source="actual",
+        )
+        cashFlowStatements[dateString] = CashFlowStatement(
+            dividendsPaid=random.uniform(0, 20),
+            cashFromOperations=random.uniform(50, 300),
+            capex=random.uniform(-100, 0),
+            source="actual",
+        )
+        date = utils.getEndOfMonth(date + relativedelta(months=3))
+
+    prices = list(historicalPricing.values())
+
+    return Stock(
+        symbol=symbol,
+        currentPrice=prices[-1].close if prices else 0,
+        sharesOutstanding=int(random.uniform(50, 500)),
+        historicalPricing=historicalPricing,
+        financialStatements=FinancialStatements(
+            incomeStatements=incomeStatements,
+            balanceSheets=balanceSheets,
+            cashFlowStatements=cashFlowStatements,
+        ),
+    )
+
+
+def makeSyntheticStocks(
+    noStocks: int, noYears: int, seed: int = 0, endDate: datetime = None
+) -> Stocks:
+    endDate = endDate or datetime.now()
+    symbols = [f"SYN{i}" for i in range(noStocks)]
+
+    return {
+        symbol: makeSyntheticStock(symbol, noYears, seed, endDate) for symbol in symbols
+    }
+
+
+def makeLatestStatements(stock: Stock) -> AllFinancialStatements:
+    """
+    the stock's statements as makeFinancialStatements gets them from a fetch
+    every 5th quarter is missing (so it's filled from the yearly statements or a trend)
+    """
+    statements = stock.financialStatements
+    allStatements = {}
+
+    for statementType, allFactory in [
+        ("incomeStatements", AllIncomeStatements),
+        ("balanceSheets", AllBalanceSheets),
+        ("cashFlowStatements", AllCashFlowStatements),
+    ]:
+        dates = sorted(statements[statementType])
+        allStatements[statementType] = allFactory(
+            quarterly={
+                date: statements[statementType][date]
+                for i, date in enumerate(dates)
+                if i % 5 != 4
+            },
+            yearly={
+                date: statements[statementType][date]
+                for i, date in enumerate(dates)
+                if i % 4 == 3
+            },
+        )
+
+    return AllFinancialStatements(**allStatements)
+
+
+def writeSyntheticStocks(stocks: Stocks, exchange: str):
+    for symbol in stocks:
+        with utils.safeOpenWrite(f"data/stocks/{exchange}/{symbol}.json") as file:
+            file.write(json.dumps(modelLoader.dump(stocks[symbol])))
+
+
+def runMakeSyntheticStocks():
+    argParser = argparse.ArgumentParser()
+    argParser.add_argument("--exchange", type=str, default="SYNTH")
+    argParser.add_argument("--stocks", type=int, default=100)
+    argParser.add_argument("--years", type=int, default=10)
+    argParser.add_argument("--seed", type=int, default=0)
+    argParser.add_argument("--endDate", type=str)
+    args = argParser.parse_known_args()
+
+    endDate = args[0].endDate and utils.dateStringToDate(args[0].endDate) or None
+    stocks = makeSyntheticStocks(args[0].stocks, args[0].years, args[0].seed, endDate)
+    writeSyntheticStocks(stocks, args[0].exchange)
+    print(f"Wrote {len(stocks)} stocks to data/stocks/{args[0].exchange}/.")
+
+
+if __name__ == "__main__":
+    runMakeSyntheticStocks()
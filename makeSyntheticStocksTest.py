@@ -0,0 +1,34 @@
+from datetime import datetime
+import modelLoader
+from makeFinancialStatements import makeFinancialStatements
+from makeSyntheticStocks import makeSyntheticStocks, makeLatestStatements
+
+
+def testMakeSyntheticStocks():
+    endDate = datetime(2020, 6, 30)
+    stocks = makeSyntheticStocks(3, 2, seed=1, endDate=endDate)
+    stock = stocks["SYN0"]
+
+    assert list(stocks) == ["SYN0", "SYN1", "SYN2"]
+    assert len(stock.financialStatements.incomeStatements) == 9
+    assert len(stock.financialStatements.balanceSheets) == 9
+    assert max(stock.historicalPricing) <= "2020-06-30"
+    assert len(stock.historicalPricing) > 500
+
+    # seeded
+    assert modelLoader.dump(stocks) == modelLoader.dump(
+        makeSyntheticStocks(3, 2, seed=1, endDate=endDate)
+    )
+    assert modelLoader.dump(stocks) != modelLoader.dump(
+        makeSyntheticStocks(3, 2, seed=2, endDate=endDate)
+    )
+    assert modelLoader.dump(stocks["SYN1"]) != modelLoader.dump(stocks["SYN2"])
+
+
+def testMakeLatestStatements():
+    stock = makeSyntheticStocks(1, 3, endDate=datetime(2020, 6, 30))["SYN0"]
+    latestStatements = makeLatestStatements(stock)
+
+    assert len(latestStatements.incomeStatements.quarterly) == 11
+    assert len(latestStatements.incomeStatements.yearly) == 3
+    assert makeFinancialStatements(stock.financialStatements, latestStatements)
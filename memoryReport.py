@@ -0,0 +1,43 @@
+import argparse
+import gc
+import tracemalloc
+from getStocks import getStocks
+
+
+def getMegabytes(noBytes):
+    return round(noBytes / 1024 / 1024, 2)
+
+
+def getLoadedSize(exchange, compact=False, float32=False):
+    gc.collect()
+    tracemalloc.start()
+    stocks = getStocks(exchange, compact=compact, float32=float32)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return size, len(stocks)
+
+
+def makeMemoryReport():
+    # report how much memory an exchange takes up with each of our model types
+    argParser = argparse.ArgumentParser()
+    argParser.add_argument("--exchange", type=str)
+    args = argParser.parse_known_args()
+    exchange = args[0].exchange
+
+    size, noStocks = getLoadedSize(exchange)
+    compactSize, _ = getLoadedSize(exchange, compact=True)
+    float32Size, _ = getLoadedSize(exchange, compact=True, float32=True)
+
+    print(f"\nMemory report for {exchange} ({noStocks} stocks)")
+    print(f"dataclasses: {getMegabytes(size)}MB")
+    print(
+        f"compact: {getMegabytes(compactSize)}MB ({round(100 * (1 - compactSize / size))}% less)"
+    )
+    print(
+        f"compact float32: {getMegabytes(float32Size)}MB ({round(100 * (1 - float32Size / size))}% less)"
+    )
+
+
+makeMemoryReport()
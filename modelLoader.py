@@ -0,0 +1,203 @@
+import dataclasses
+import typing
+from typing import Any, Callable, Dict
+import typedload
+
+# generated load/dump functions per type, the same type always uses the same function
+loaders: Dict[Any, Callable] = {}
+dumpers: Dict[Any, Callable] = {}
+
+basicTypes = (str, int, float, bool)
+
+
+class MissingField(ValueError):
+    pass
+
+
+def getLoadExpression(type_, value: str, namespace, depth: int = 0) -> str:
+    """
+    return a python expression that loads value (a variable name) as type_
+    casting basic types the same way typedload does
+    """
+    origin = typing.get_origin(type_)
+
+    if type_ in basicTypes:
+        name = type_.__name__
+        return f"({value} if {value}.__class__ is {name} else {name}({value}))"
+
+    if dataclasses.is_dataclass(type_):
+        name = f"load{type_.__name__}"
+        namespace[name] = getLoader(type_)
+        return f"{name}({value})"
+
+    if origin in (dict, list):
+        item = f"item{depth}"
+        itemExpression = getLoadExpression(
+            typing.get_args(type_)[-1], item, namespace, depth + 1
+        )
+
+        if origin is dict:
+            key = f"key{depth}"
+            return f"{{{key}: {itemExpression} for {key}, {item} in {value}.items()}}"
+
+        return f"[{itemExpression} for {item} in {value}]"
+
+    if type_ is Any:
+        return value
+
+    # anything else we don't generate code for (yet)
+    name = f"typedload{depth}_{len(namespace)}"
+    namespace[name] = lambda data: typedload.load(data, type_)
+    return f"{name}({value})"
+
+
+def getDumpExpression(type_, value: str, namespace, depth: int = 0) -> str:
+    """
+    return a python expression that dumps value (a variable name) of type_
+    to json compatible data, the same as json.dumps(default=lambda o: o.__dict__)
+    """
+    origin = typing.get_origin(type_)
+
+    if dataclasses.is_dataclass(type_):
+        name = f"dump{type_.__name__}"
+        namespace[name] = getDumper(type_)
+        return f"{name}({value})"
+
+    if origin in (dict, list):
+        item = f"item{depth}"
+        itemExpression = getDumpExpression(
+            typing.get_args(type_)[-1], item, namespace, depth + 1
+        )
+
+        if origin is dict:
+            if itemExpression == item:
+                return f"dict({value})"
+
+            key = f"key{depth}"
+            return f"{{{key}: {itemExpression} for {key}, {item} in {value}.items()}}"
+
+        if itemExpression == item:
+            return f"list({value})"
+
+        return f"[{itemExpression} for {item} in {value}]"
+
+    return value
+
+
+def makeDataclassLoader(cls) -> Callable:
+    """
+    generate a loader that fills the instance __dict__ directly, skipping __init__
+    """
+    namespace = {"cls": cls, "new": object.__new__, "MissingField": MissingField}
+    lines = [f"def load{cls.__name__}(data):"]
+    names = []
+
+    for field in dataclasses.fields(cls):
+        name = f"field_{field.name}"
+        names.append(f"{field.name!r}: {name}")
+        hasDefault = field.default is not dataclasses.MISSING
+
+        if field.type in basicTypes and hasDefault:
+            # the common case, a basic value with a default of the same type
+            typeName = field.type.__name__
+            namespace[f"default_{field.name}"] = field.default
+            lines.append(f"    {name} = data.get({field.name!r}, default_{field.name})")
+            lines.append(f"    if {name}.__class__ is not {typeName}:")
+            lines.append(f"        {name} = {typeName}({name})")
+            continue
+
+        expression = getLoadExpression(field.type, "value", namespace)
+        lines.append(f"    if {field.name!r} in data:")
+        lines.append(f"        value = data[{field.name!r}]")
+        lines.append(f"        {name} = {expression}")
+        lines.append("    else:")
+
+        if hasDefault:
+            namespace[f"default_{field.name}"] = field.default
+            lines.append(f"        {name} = default_{field.name}")
+        elif field.default_factory is not dataclasses.MISSING:
+            namespace[f"factory_{field.name}"] = field.default_factory
+            lines.append(f"        {name} = factory_{field.name}()")
+        else:
+            lines.append(f"        raise MissingField({field.name!r})")
+
+    lines.append("    obj = new(cls)")
+    lines.append(f"    obj.__dict__ = {{{', '.join(names)}}}")
+
+    if hasattr(cls, "__post_init__"):
+        lines.append("    obj.__post_init__()")
+
+    lines.append("    return obj")
+    exec("\n".join(lines), namespace)
+
+    return namespace[f"load{cls.__name__}"]
+
+
+def makeDataclassDumper(cls) -> Callable:
+    namespace = {}
+    lines = [f"def dump{cls.__name__}(obj):", "    data = {}"]
+
+    for field in dataclasses.fields(cls):
+        expression = getDumpExpression(field.type, "value", namespace)
+        lines.append(f"    value = obj.{field.name}")
+
+        if expression == "value":
+            lines.append(f"    data[{field.name!r}] = value")
+        else:
+            lines.append(
+                f"    data[{field.name!r}] = None if value is None else {expression}"
+            )
+
+    lines.append("    return data")
+    exec("\n".join(lines), namespace)
+
+    return namespace[f"dump{cls.__name__}"]
+
+
+def getLoader(type_) -> Callable:
+    if type_ in loaders:
+        return loaders[type_]
+
+    if dataclasses.is_dataclass(type_):
+        # register a trampoline first in case the dataclass references itself
+        loaders[type_] = lambda data: loaders[type_](data)
+        loader = makeDataclassLoader(type_)
+    else:
+        namespace = {}
+        expression = getLoadExpression(type_, "value", namespace)
+        loader = eval(f"lambda value: {expression}", namespace)
+
+    loaders[type_] = loader
+
+    return loader
+
+
+def getDumper(type_) -> Callable:
+    if type_ in dumpers:
+        return dumpers[type_]
+
+    if dataclasses.is_dataclass(type_):
+        dumpers[type_] = lambda obj: dumpers[type_](obj)
+        dumper = makeDataclassDumper(type_)
+    else:
+        namespace = {}
+        expression = getDumpExpression(type_, "value", namespace)
+        dumper = eval(f"lambda value: {expression}", namespace)
+
+    dumpers[type_] = dumper
+
+    return dumper
+
+
+def load(data, type_):
+    """
+    drop in replacement for typedload.load for our models
+    """
+    return getLoader(type_)(data)
+
+
+def dump(obj, type_=None):
+    """
+    dump a model (or a type_ such as Stocks) to json compatible data
+    """
+    return getDumper(type_ or type(obj))(obj)
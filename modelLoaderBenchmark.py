@@ -0,0 +1,113 @@
+import argparse
+import json
+from datetime import datetime, timedelta
+import typedload
+import modelLoader
+import utils
+from models import Stock
+from benchmarkUtils import benchmark
+
+
+def makeStockData(symbol, noYears):
+    """
+    make the json data of a stock with noYears of quarterly statements and daily prices
+    """
+    endDate = datetime(2020, 6, 30)
+    incomeStatements = {}
+    balanceSheets = {}
+    cashFlowStatements = {}
+
+    for i in range(noYears * 4):
+        date = utils.dateToDateString(utils.getEndOfMonth(endDate - timedelta(91 * i)))
+        incomeStatements[date] = {
+            "totalRevenue": 1000.0 + i,
+            "netIncome": 100.0 + i,
+            "incomeBeforeTax": 120.0 + i,
+            "interestIncome": 1.0,
+            "interestExpense": 2.0,
+            "estimate": False,
+            "source": "actual",
+            "dateAdded": "",
+        }
+        balanceSheets[date] = {
+            "assets": 5000.0,
+            "currentAssets": 2000.0,
+            "liabilities": 2500.0,
+            "currentLiabilities": 1000.0,
+            "retainedEarnings": 500.0,
+            "cash": 300.0,
+            "estimate": False,
+            "source": "actual",
+            "dateAdded": "",
+        }
+        cashFlowStatements[date] = {
+            "dividendsPaid": 10.0,
+            "cashFromOperations": 150.0,
+            "capex": 50.0,
+            "estimate": False,
+            "source": "actual",
+            "dateAdded": "",
+        }
+
+    historicalPricing = {}
+    for i in range(noYears * 365):
+        date = utils.dateToDateString(endDate - timedelta(i))
+        historicalPricing[date] = {"open": 10.0 + i % 7, "close": 10.5 + i % 5}
+
+    return {
+        "symbol": symbol,
+        "currentPrice": 10.0,
+        "sharesOutstanding": 1000000,
+        "historicalPricing": historicalPricing,
+        "financialStatements": {
+            "incomeStatements": incomeStatements,
+            "balanceSheets": balanceSheets,
+            "cashFlowStatements": cashFlowStatements,
+        },
+        "lastUpdated": "2020-06-30",
+    }
+
+
+def runBenchmark():
+    argParser = argparse.ArgumentParser()
+    argParser.add_argument("--stocks", type=int, default=20)
+    argParser.add_argument("--years", type=int, default=10)
+    argParser.add_argument("--runs", type=int, default=3)
+    args = argParser.parse_known_args()
+    noRuns = args[0].runs
+
+    stocksData = [
+        makeStockData(f"SYM{i}", args[0].years) for i in range(args[0].stocks)
+    ]
+    print(f"{len(stocksData)} stocks with {args[0].years} years of data")
+
+    before = benchmark(
+        "typedload.load",
+        lambda: [typedload.load(data, Stock) for data in stocksData],
+        noRuns,
+    )
+    after = benchmark(
+        "modelLoader.load",
+        lambda: [modelLoader.load(data, Stock) for data in stocksData],
+        noRuns,
+    )
+    print(f"Speed-up: {round(before / after, 1)}x\n")
+
+    stocks = [modelLoader.load(data, Stock) for data in stocksData]
+    before = benchmark(
+        "json roundtrip (o.__dict__)",
+        lambda: [
+            json.loads(json.dumps(stock, default=lambda o: o.__dict__))
+            for stock in stocks
+        ],
+        noRuns,
+    )
+    after = benchmark(
+        "modelLoader.dump",
+        lambda: [modelLoader.dump(stock) for stock in stocks],
+        noRuns,
+    )
+    print(f"Speed-up: {round(before / after, 1)}x")
+
+
+runBenchmark()
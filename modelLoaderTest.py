@@ -0,0 +1,101 @@
+import json
+from typing import List
+import typedload
+import modelLoader
+from models import (
+    Stock,
+    FinancialStatements,
+    IncomeStatement,
+    BalanceSheet,
+    CashFlowStatement,
+    HistoricalPrice,
+    HistoricalFundamentals,
+    Portfolio,
+    PortfolioTransaction,
+    PortfolioStock,
+    ValuationModel,
+    Valuation,
+)
+
+
+def makeStockData():
+    stock = Stock(
+        symbol="SS",
+        currentPrice=10.5,
+        sharesOutstanding=1000,
+        historicalPricing={"2020-07-01": HistoricalPrice(open=10, close=11.5)},
+        financialStatements=FinancialStatements(
+            incomeStatements={"2020-06-30": IncomeStatement(netIncome=100)},
+            balanceSheets={"2020-06-30": BalanceSheet(assets=1000, source="actual")},
+            cashFlowStatements={"2020-06-30": CashFlowStatement(estimate=True)},
+        ),
+        valuation=Valuation(pe=12.5, instruction="BUY"),
+        lastUpdated="2020-07-01",
+    )
+
+    return json.loads(json.dumps(stock, default=lambda o: o.__dict__))
+
+
+def testLoad():
+    # it loads the same models as typedload
+    stockData = makeStockData()
+    assert modelLoader.load(stockData, Stock) == typedload.load(stockData, Stock)
+
+    portfolioData = {
+        "cash": 100,
+        "transactionHistory": {"1": {"date": "2020-07-01", "amount": 100}},
+        "stocks": {"SS": {"avgPrice": 10, "noShares": 10.0}},
+        "model": {"name": "strict", "maxPe": 15},
+    }
+    assert modelLoader.load(portfolioData, Portfolio) == typedload.load(
+        portfolioData, Portfolio
+    )
+    assert modelLoader.load(portfolioData, Portfolio) == Portfolio(
+        cash=100.0,
+        transactionHistory={"1": PortfolioTransaction(date="2020-07-01", amount=100.0)},
+        stocks={"SS": PortfolioStock(avgPrice=10.0, noShares=10)},
+        model=ValuationModel(name="strict", maxPe=15.0),
+    )
+
+    modelsData = [{"name": "a"}, {"name": "b", "minRoe": 1}]
+    assert modelLoader.load(modelsData, List[ValuationModel]) == typedload.load(
+        modelsData, List[ValuationModel]
+    )
+
+    # it uses the defaults for missing fields and ignores extra fields
+    assert modelLoader.load({"open": 1, "high": 2}, HistoricalPrice) == HistoricalPrice(
+        open=1.0
+    )
+
+    fundamentalsData = {
+        "General": {
+            "Name": "SS",
+            "Sector": "",
+            "Industry": "",
+            "Description": "",
+            "Address": "",
+            "Phone": "",
+            "WebURL": "",
+            "Officers": {"0": {"Name": "A", "Title": "CEO"}},
+        },
+        "Financials": {
+            "Income_Statement": {"yearly": {}, "quarterly": {}},
+            "Balance_Sheet": {"yearly": {}, "quarterly": {}},
+            "Cash_Flow": {"yearly": {}, "quarterly": {}},
+        },
+    }
+    assert modelLoader.load(fundamentalsData, HistoricalFundamentals) == typedload.load(
+        fundamentalsData, HistoricalFundamentals
+    )
+
+
+def testDump():
+    # it dumps the same data as json.dumps(default=lambda o: o.__dict__)
+    stockData = makeStockData()
+    assert modelLoader.dump(modelLoader.load(stockData, Stock)) == stockData
+
+    # it dumps containers of models when given their type
+    models = [ValuationModel(name="a")]
+    assert modelLoader.dump(models, List[ValuationModel]) == json.loads(
+        json.dumps(models, default=lambda o: o.__dict__)
+    )
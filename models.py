@@ -352,6 +352,17 @@ class SimulateTestStockModel:
     endDate: str = ""
 
 
+@dataclass
+class SimulationDay:
+    date: Date = ""
+    isTradingDay: bool = False  # some stock has a price
+    isMonthEnd: bool = False  # deposit day
+    dividendSymbols: List[Symbol] = field(default_factory=list)  # statement dates
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
 @dataclass
 class DateRange:
     start: str = ""
@@ -390,6 +401,42 @@ class Valuation:
         return getattr(self, key)
 
 
+@dataclass
+class Fundamentals:
+    # everything in a Valuation that doesn't depend on the current price
+    sharesOutstanding: Shares = 0
+    assets: Currency = 0.00
+    equity: Currency = 0.00
+    netIncomeAvg: Currency = 0.00
+    dividendsPaid: Currency = 0.00
+    roe: Ratio = 0.00
+    roa: Ratio = 0.00
+    eps: Ratio = 0.00
+    growthRate: Ratio = 0.0
+    priceGrowthRate: Ratio = 0.0
+    dte: Ratio = 0.00
+    cr: Ratio = 0.00
+    fcf: Currency = 0.00
+    altmanZScore: Ratio = 0.00
+    statementYears: int = 0
+    grahamIv: Currency = 0.00
+    dcfIv: Currency = 0.00
+    liquidationIv: Currency = 0.00
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+@dataclass
+class Screening:
+    instruction: str = ""
+    stage: str = ""  # the stage that rejected the stock, empty if none did
+    valuation: Valuation = None
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
 @dataclass
 class ValuationModel:
     name: str = ""
@@ -0,0 +1,182 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List
+import numpy as np
+from models import Currency, Date, HistoricalPricing, Stock
+import utils
+
+
+@dataclass
+class PriceSeries:
+    """
+    a stock's historical pricing as sorted dates and price columns
+    """
+
+    dates: List[Date] = field(default_factory=list)
+    opens: np.ndarray = field(default_factory=lambda: np.array([]))
+    closes: np.ndarray = field(default_factory=lambda: np.array([]))
+    # one item per calendar day from the first date (an ordinal) to the last date
+    firstDay: int = 0
+    dailyOpens: np.ndarray = field(
+        default_factory=lambda: np.array([])
+    )  # forward filled
+    isPricingDay: np.ndarray = field(default_factory=lambda: np.array([], bool))
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __len__(self):
+        return len(self.dates)
+
+
+# the price series of the historical pricing we've seen, least recently used first
+# keyed by id, the entries keep their pricing alive so an id can't be reused
+priceSeriesCache = OrderedDict()
+maxSize = 10000
+
+epochOrdinal = date(1970, 1, 1).toordinal()
+
+
+def makePriceSeries(historicalPricing: HistoricalPricing) -> PriceSeries:
+    dates = sorted(historicalPricing)
+    opens = np.array([historicalPricing[date].open or 0 for date in dates], dtype=float)
+    priceSeries = PriceSeries(
+        dates=dates,
+        opens=opens,
+        closes=np.array(
+            [historicalPricing[date].close or 0 for date in dates], dtype=float
+        ),
+    )
+
+    if dates:
+        # each day gets the open of the latest date on or before it
+        days = np.array(dates, dtype="datetime64[D]").astype(np.int64) + epochOrdinal
+        dayIndexes = days - days[0]
+        priceSeries.firstDay = int(days[0])
+        priceSeries.dailyOpens = opens[
+            np.searchsorted(dayIndexes, np.arange(dayIndexes[-1] + 1), side="right") - 1
+        ]
+        priceSeries.isPricingDay = np.zeros(dayIndexes[-1] + 1, dtype=bool)
+        priceSeries.isPricingDay[dayIndexes] = True
+
+    return priceSeries
+
+
+def getPriceSeries(historicalPricing: HistoricalPricing) -> PriceSeries:
+    """
+    sort the pricing into arrays once, later calls return the same series
+    the series is rebuilt if prices were added or removed since
+    """
+    key = id(historicalPricing)
+    entry = priceSeriesCache.get(key)
+
+    if entry is not None and len(entry[1]) == len(historicalPricing):
+        priceSeriesCache.move_to_end(key)
+        return entry[1]
+
+    priceSeries = makePriceSeries(historicalPricing)
+    priceSeriesCache[key] = (historicalPricing, priceSeries)
+    priceSeriesCache.move_to_end(key)
+
+    while len(priceSeriesCache) > maxSize:
+        priceSeriesCache.popitem(last=False)
+
+    return priceSeries
+
+
+def toDateString(date) -> Date:
+    # accepts date strings and datetimes
+    return date if isinstance(date, str) else utils.dateToDateString(date)
+
+
+def toOrdinal(day) -> int:
+    # accepts date strings and datetimes
+    if isinstance(day, str):
+        return date.fromisoformat(day[:10]).toordinal()
+
+    return day.toordinal()
+
+
+def getPriceOnOrBefore(stock: Stock, day) -> Currency:
+    """
+    the open of the latest pricing date on or before day, 0 if there is none
+    """
+    priceSeries = getPriceSeries(stock.historicalPricing)
+    index = toOrdinal(day) - priceSeries.firstDay
+
+    if not len(priceSeries) or index < 0:
+        return 0
+
+    return float(priceSeries.dailyOpens[min(index, len(priceSeries.dailyOpens) - 1)])
+
+
+def hasPriceOn(stock: Stock, day) -> bool:
+    # whether day is one of the pricing dates
+    priceSeries = getPriceSeries(stock.historicalPricing)
+    index = toOrdinal(day) - priceSeries.firstDay
+
+    return 0 <= index < len(priceSeries.isPricingDay) and bool(
+        priceSeries.isPricingDay[index]
+    )
+
+
+def getWindowRange(priceSeries: PriceSeries, start=None, end=None):
+    # the [startIndex, endIndex) of the dates in [start, end]
+    startIndex = (
+        0 if start is None else bisect_left(priceSeries.dates, toDateString(start))
+    )
+    endIndex = (
+        len(priceSeries)
+        if end is None
+        else bisect_right(priceSeries.dates, toDateString(end))
+    )
+
+    return startIndex, max(startIndex, endIndex)
+
+
+def getPriceWindow(
+    stock: Stock, start=None, end=None, key: str = "opens"
+) -> np.ndarray:
+    """
+    the prices (oldest first) from start to end, both inclusive and optional
+    the array is a view (nothing is copied)
+    """
+    priceSeries = getPriceSeries(stock.historicalPricing)
+    startIndex, endIndex = getWindowRange(priceSeries, start, end)
+
+    return priceSeries[key][startIndex:endIndex]
+
+
+def getPriceWindowDates(stock: Stock, start=None, end=None) -> List[Date]:
+    priceSeries = getPriceSeries(stock.historicalPricing)
+    startIndex, endIndex = getWindowRange(priceSeries, start, end)
+
+    return priceSeries.dates[startIndex:endIndex]
+
+
+def getPriceVolatility(stock: Stock, start=None, end=None, key: str = "opens") -> float:
+    """
+    the standard deviation of the daily log returns from start to end
+    """
+    prices = getPriceWindow(stock, start, end, key)
+    prices = prices[prices > 0]
+
+    if len(prices) <= 2:
+        return 0
+
+    return float(np.std(np.diff(np.log(prices)), ddof=1))
+
+
+def clearPriceSeriesEntries(historicalPricings):
+    # drop the series of pricing that is no longer used, e.g. of reloaded stocks
+    for historicalPricing in historicalPricings:
+        entry = priceSeriesCache.get(id(historicalPricing))
+
+        if entry is not None and entry[0] is historicalPricing:
+            priceSeriesCache.pop(id(historicalPricing))
+
+
+def clearPriceSeriesCache():
+    priceSeriesCache.clear()
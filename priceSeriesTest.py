@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta
+import numpy as np
+import priceSeries
+import utils
+from evaluate import getGrowthRate, getPriceGrowthRate
+from models import HistoricalPrice, Stock
+
+
+def makePricedStock(noDays, startDate=None, seed=0):
+    random = np.random.RandomState(seed)
+    startDate = startDate or datetime.now() - timedelta(days=noDays)
+    historicalPricing = {}
+
+    # add the dates newest first to check that nothing relies on the dict order
+    for i in reversed(range(noDays)):
+        # some days have no price
+        price = 0 if i % 7 == 3 else float(10 + i * 0.01 + random.rand())
+        historicalPricing[utils.dateToDateString(startDate + timedelta(days=i))] = (
+            HistoricalPrice(open=price, close=price + 1)
+        )
+
+    return Stock(symbol="TEST", historicalPricing=historicalPricing)
+
+
+def getOldPriceGrowthRate(stock, asOfDate):
+    # the scan that getPriceGrowthRate used to do (over sorted dates)
+    aYearAgoString = utils.dateToDateString(asOfDate - timedelta(days=365))
+    asOfDateString = utils.dateToDateString(asOfDate)
+    values = [
+        stock.historicalPricing[date].open
+        for date in sorted(stock.historicalPricing)
+        if aYearAgoString < date <= asOfDateString
+        and stock.historicalPricing[date].open
+    ]
+
+    return getGrowthRate(values)
+
+
+def testGetPriceWindow():
+    stock = makePricedStock(30, datetime(2020, 1, 1))
+    window = priceSeries.getPriceWindow(stock, "2020-01-05", datetime(2020, 1, 10))
+    dates = priceSeries.getPriceWindowDates(stock, "2020-01-05", "2020-01-10")
+
+    assert dates == [f"2020-01-{day:02d}" for day in range(5, 11)]
+    assert window.tolist() == [stock.historicalPricing[date].open for date in dates]
+    assert priceSeries.getPriceWindow(stock, key="closes")[0] == (
+        stock.historicalPricing["2020-01-01"].close
+    )
+    assert len(priceSeries.getPriceWindow(stock)) == 30
+    assert len(priceSeries.getPriceWindow(stock, "2021-01-01")) == 0
+    assert len(priceSeries.getPriceWindow(stock, "2020-01-10", "2020-01-05")) == 0
+
+
+def testGetPriceSeriesIsCached():
+    stock = makePricedStock(30)
+    priceSeriesA = priceSeries.getPriceSeries(stock.historicalPricing)
+
+    assert priceSeries.getPriceSeries(stock.historicalPricing) is priceSeriesA
+
+    # a new price rebuilds the series
+    stock.historicalPricing["2999-01-01"] = HistoricalPrice(open=1, close=1)
+    priceSeriesB = priceSeries.getPriceSeries(stock.historicalPricing)
+
+    assert priceSeriesB is not priceSeriesA
+    assert priceSeriesB.dates[-1] == "2999-01-01"
+
+
+def testGetPriceGrowthRate():
+    stock = makePricedStock(800, datetime(2019, 1, 1), seed=1)
+
+    for asOfDate in [datetime(2019, 1, 1), datetime(2019, 6, 1), datetime(2020, 8, 3)]:
+        assert getPriceGrowthRate(stock, asOfDate) == getOldPriceGrowthRate(
+            stock, asOfDate
+        )
+
+    # defaults to the year up to now
+    stock = makePricedStock(500, seed=2)
+
+    assert getPriceGrowthRate(stock) == getOldPriceGrowthRate(stock, datetime.now())
+    assert getPriceGrowthRate(Stock()) == 0
+
+
+def testGetPriceVolatility():
+    stock = makePricedStock(100, datetime(2020, 1, 1))
+    prices = [
+        stock.historicalPricing[date].open
+        for date in sorted(stock.historicalPricing)
+        if stock.historicalPricing[date].open
+    ]
+
+    assert np.isclose(
+        priceSeries.getPriceVolatility(stock),
+        np.std(np.diff(np.log(prices)), ddof=1),
+    )
+    assert priceSeries.getPriceVolatility(Stock()) == 0
+
+
+def getOldHistoricalPrice(stock, date):
+    # the recursive walk back that getHistoricalPrice used to do
+    dateString = utils.dateToDateString(date)
+
+    if dateString in stock.historicalPricing:
+        return stock.historicalPricing[dateString].open
+    elif dateString >= min(stock.historicalPricing):
+        return getOldHistoricalPrice(stock, date - timedelta(days=1))
+
+    return 0
+
+
+def testGetPriceOnOrBefore():
+    stock = makePricedStock(60, datetime(2020, 1, 1), seed=3)
+
+    # a long gap
+    for i in range(20, 40):
+        stock.historicalPricing.pop(
+            utils.dateToDateString(datetime(2020, 1, 1) + timedelta(days=i))
+        )
+
+    date = datetime(2019, 12, 1)
+    while date < datetime(2020, 4, 1):
+        assert priceSeries.getPriceOnOrBefore(stock, date) == getOldHistoricalPrice(
+            stock, date
+        )
+        assert priceSeries.getPriceOnOrBefore(
+            stock, utils.dateToDateString(date)
+        ) == getOldHistoricalPrice(stock, date)
+        assert priceSeries.hasPriceOn(stock, date) == (
+            utils.dateToDateString(date) in stock.historicalPricing
+        )
+        date = date + timedelta(days=1)
+
+    assert priceSeries.getPriceOnOrBefore(Stock(), date) == 0
+    assert not priceSeries.hasPriceOn(Stock(), date)
@@ -0,0 +1,124 @@
+from models import Screening, Stock, Valuation, ValuationModel
+from evaluate import (
+    customRound,
+    evaluate,
+    getAltmanZScore,
+    getCr,
+    getDte,
+    getEarningsBeforeInterestAndTaxForYear,
+    getEps,
+    getEquity,
+    getFairValue,
+    getLatestValidBalanceSheet,
+    getNetIncomeAvg,
+    getNetIncomeGrowthRate,
+    getPb,
+    getPe,
+    getPeMultipleIv,
+    getPeg,
+    getRoe,
+    getStatementYears,
+    getTotalRevenueForYear,
+    validateBalanceSheet,
+)
+
+
+def getRejection(stage: str, valuation: Valuation) -> Screening:
+    valuation.instruction = "SELL"
+
+    return Screening(instruction="SELL", stage=stage, valuation=valuation)
+
+
+def screen(stock: Stock, model: ValuationModel = None) -> Screening:
+    """
+    the checks of getViability ordered by cost, stopping at the first stage that
+    makes the stock a certain SELL (the valuation is only partially filled then)
+    stocks that pass every stage get the full valuation from evaluate
+    """
+    model = model or ValuationModel()
+    valuation = Valuation()
+
+    # stage 1: a valid balance sheet (an empty valuation is always a SELL)
+    latestBalanceSheet = getLatestValidBalanceSheet(stock)
+
+    if not validateBalanceSheet(latestBalanceSheet):
+        return getRejection("balanceSheet", valuation)
+
+    # stage 2: the balance sheet ratios
+    assets = latestBalanceSheet.assets
+    equity = getEquity(assets, latestBalanceSheet.liabilities)
+    currentLiabilities = customRound(latestBalanceSheet.currentLiabilities, 2)
+    valuation.dte = customRound(getDte(currentLiabilities, equity), 2)
+    valuation.cr = customRound(getCr(assets, currentLiabilities), 2)
+    valuation.statementYears = getStatementYears(stock)
+
+    if (
+        valuation.dte > model.maxDte
+        or valuation.dte < 0
+        or valuation.cr < model.minCr
+        or valuation.statementYears < model.minStatementYears
+    ):
+        return getRejection("balanceSheetRatios", valuation)
+
+    # stage 3: the earnings multiples
+    netIncomeAvg = getNetIncomeAvg(stock, model.yearsForEarningsCalcs)
+    eps = getEps(netIncomeAvg, stock.sharesOutstanding)
+    pe = getPe(stock.currentPrice, eps)
+    pb = customRound(getPb(stock.currentPrice, equity, stock.sharesOutstanding), 2)
+    valuation.roe = customRound(getRoe(netIncomeAvg, equity), 2)
+    valuation.eps = customRound(eps, 2)
+    valuation.pe = customRound(pe, 2)
+    valuation.pb = pb
+    valuation.blendedMultiplier = customRound(pe * pb, 2)
+
+    if (
+        valuation.roe < model.minRoe
+        or valuation.eps < model.minEps
+        or valuation.pe > model.maxPe
+        or valuation.pe < 0
+        or valuation.pb > model.maxPb
+        or valuation.pb < 0
+        or valuation.blendedMultiplier > model.maxBlendedMultiplier
+        or valuation.blendedMultiplier <= 0
+    ):
+        return getRejection("earnings", valuation)
+
+    # stage 4: the altman z score
+    valuation.altmanZScore = customRound(
+        getAltmanZScore(
+            assets,
+            latestBalanceSheet.liabilities,
+            latestBalanceSheet.retainedEarnings,
+            getEarningsBeforeInterestAndTaxForYear(stock),
+            getTotalRevenueForYear(stock),
+        ),
+        2,
+    )
+
+    if valuation.altmanZScore < model.minAltmanZScore:
+        return getRejection("altmanZScore", valuation)
+
+    # stage 5: the growth rate (a trend fit)
+    growthRate = getNetIncomeGrowthRate(stock, model)
+    valuation.growthRate = customRound(growthRate, 2)
+    valuation.peg = customRound(getPeg(pe, growthRate), 2)
+
+    if (
+        valuation.growthRate < model.minGrowthRate
+        or valuation.peg > model.maxPeg
+        or valuation.peg <= 0
+    ):
+        return getRejection("growth", valuation)
+
+    # stage 6: the fair value
+    valuation.peMultipleIv = customRound(
+        getPeMultipleIv(eps, pe, growthRate, model.discountRate), 2
+    )
+    valuation.fairValue = getFairValue(valuation)
+
+    if stock.currentPrice >= valuation.fairValue:
+        return getRejection("fairValue", valuation)
+
+    valuation = evaluate(stock, model)
+
+    return Screening(instruction=valuation.instruction, valuation=valuation)
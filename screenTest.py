@@ -0,0 +1,51 @@
+from batchEvaluateTest import makeStock
+from evaluate import evaluate
+from models import BalanceSheet, ValuationModel
+from screen import screen
+
+
+def testScreen():
+    models = [
+        ValuationModel(),
+        # a lenient model so that we get BUYs and late stage rejections too
+        ValuationModel(
+            discountRate=0.01,
+            minRoe=0,
+            minGrowthRate=0,
+            maxDte=10,
+            minCr=0,
+            maxPe=1000,
+            maxPeg=1000,
+            maxPb=1000,
+            minAltmanZScore=0,
+            maxBlendedMultiplier=10000,
+        ),
+    ]
+    stocks = [makeStock(f"S{i}", i) for i in range(50)]
+    stages = set()
+
+    for model in models:
+        for stock in stocks:
+            screening = screen(stock, model)
+            valuation = evaluate(stock, model)
+            stages.add(screening.stage)
+
+            # it gives the same instruction as evaluate
+            assert screening.instruction == valuation.instruction, stock.symbol
+
+            if screening.stage:
+                assert screening.instruction == "SELL"
+            else:
+                assert screening.valuation == valuation
+
+    assert "" in stages
+    assert len(stages) > 2
+
+
+def testScreenInvalidBalanceSheet():
+    stock = makeStock("INVALID", 1)
+    stock.financialStatements.balanceSheets = {"2020-12-31": BalanceSheet()}
+    screening = screen(stock)
+
+    assert screening.instruction == "SELL"
+    assert screening.stage == "balanceSheet"
@@ -0,0 +1,296 @@
+import weakref
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+import numpy as np
+from models import Date, FinancialStatements, Stock
+from statementSeries import (
+    FinancialStatementSeries,
+    StatementSeries,
+    makeStatementSeries,
+    getAsOfIndex,
+    statementTypes,
+)
+from statementsView import StatementsView
+
+# the series of every FinancialStatements we've seen, keyed by id
+# entries are removed when their FinancialStatements is garbage collected
+# the statements are treated as immutable once cached, a statement restated in
+# place must be dropped with clearStatementsCache
+seriesCache: Dict[int, Tuple] = {}
+
+
+def getStatementsVersion(financialStatements: FinancialStatements):
+    # changes when statements are added or removed or a statement type is replaced
+    return tuple(
+        (
+            id(financialStatements[statementType]),
+            len(financialStatements[statementType]),
+        )
+        for statementType in statementTypes
+    )
+
+
+def makeSeries(statements, statementType: str) -> StatementSeries:
+    # the series of a view is a slice of the series of the statements it views
+    if isinstance(statements, StatementsView):
+        series = getFinancialStatementSeries(statements.financialStatements)[
+            statements.statementType
+        ]
+
+        return StatementSeries(
+            dates=series.dates[: statements.end],
+            columns={
+                name: column[: statements.end]
+                for name, column in series.columns.items()
+            },
+        )
+
+    return makeStatementSeries(statements, statementTypes[statementType])
+
+
+def getCacheEntry(financialStatements: FinancialStatements):
+    """
+    returns the cache entry of financialStatements, (re)building it if needed
+    the entry is rebuilt if statements were added or removed or a statement type
+    was replaced since
+    """
+    key = id(financialStatements)
+    version = getStatementsVersion(financialStatements)
+    entry = seriesCache.get(key)
+
+    if entry is not None and entry[0]() is financialStatements and entry[1] == version:
+        return entry
+
+    if entry is None or entry[0]() is not financialStatements:
+        weakref.finalize(financialStatements, seriesCache.pop, key, None)
+
+    # the last item holds anything else derived from the statements
+    entry = (
+        weakref.ref(financialStatements),
+        version,
+        FinancialStatementSeries(
+            **{
+                statementType: makeSeries(
+                    financialStatements[statementType], statementType
+                )
+                for statementType in statementTypes
+            }
+        ),
+        {},
+    )
+    seriesCache[key] = entry
+
+    return entry
+
+
+def getFinancialStatementSeries(
+    financialStatements: FinancialStatements,
+) -> FinancialStatementSeries:
+    """
+    extract the statements into sorted arrays once, later calls return the same series
+    """
+    return getCacheEntry(financialStatements)[2]
+
+
+def getValidDates(
+    financialStatements: FinancialStatements, statementType: str, validator
+) -> List[Date]:
+    """
+    the sorted dates of the statements that pass validator, computed once
+    """
+    derived = getCacheEntry(financialStatements)[3]
+    key = ("validDates", statementType, validator)
+
+    if key not in derived:
+        statements = financialStatements[statementType]
+        derived[key] = sorted(
+            date for date in statements if validator(statements[date])
+        )
+
+    return derived[key]
+
+
+def getLatestValidStatement(
+    financialStatements: FinancialStatements,
+    statementType: str,
+    validator,
+    asOfDate: Date = None,
+):
+    """
+    the latest statement on or before asOfDate (or ever) that passes validator
+    the statements of a snapshot (views) use the index of the stock's statements
+    """
+    statements = financialStatements[statementType]
+
+    if isinstance(statements, StatementsView):
+        if not statements.end:
+            return None
+
+        cutoffDate = statements.dates[statements.end - 1]
+        asOfDate = cutoffDate if asOfDate is None else min(asOfDate, cutoffDate)
+        financialStatements = statements.financialStatements
+
+    validDates = getValidDates(financialStatements, statementType, validator)
+    index = len(validDates) if asOfDate is None else bisect_right(validDates, asOfDate)
+
+    if not index:
+        return None
+
+    return financialStatements[statementType][validDates[index - 1]]
+
+
+def getSortedDates(
+    financialStatements: FinancialStatements, statementType: str
+) -> List[Date]:
+    derived = getCacheEntry(financialStatements)[3]
+    key = ("sortedDates", statementType)
+
+    if key not in derived:
+        derived[key] = sorted(financialStatements[statementType])
+
+    return derived[key]
+
+
+def getStatementsAsOf(
+    financialStatements: FinancialStatements, date: Date
+) -> FinancialStatements:
+    """
+    the statements on or before date, as views of financialStatements (nothing is copied)
+    """
+    views = {}
+
+    for statementType in statementTypes:
+        dates = getSortedDates(financialStatements, statementType)
+        views[statementType] = StatementsView(
+            financialStatements, statementType, dates, bisect_right(dates, date)
+        )
+
+    return FinancialStatements(**views)
+
+
+def getStatementEpoch(financialStatements: FinancialStatements, date) -> Tuple:
+    """
+    the number of each type of statement on or before date
+    anything computed from the statements only changes when this does
+    """
+    financialStatementSeries = getFinancialStatementSeries(financialStatements)
+
+    return (
+        getAsOfIndex(financialStatementSeries.incomeStatements, date),
+        getAsOfIndex(financialStatementSeries.balanceSheets, date),
+        getAsOfIndex(financialStatementSeries.cashFlowStatements, date),
+    )
+
+
+# columns computed from a statement type's columns, usable like any other column
+derivedColumns = {
+    ("cashFlowStatements", "fcf"): lambda series: series["cashFromOperations"]
+    - np.abs(series["capex"]),
+}
+
+
+def getColumn(
+    financialStatements: FinancialStatements, statementType: str, key: str
+) -> np.ndarray:
+    entry = getCacheEntry(financialStatements)
+    series = entry[2][statementType]
+
+    if (statementType, key) not in derivedColumns:
+        return series[key]
+
+    cacheKey = ("column", statementType, key)
+    if cacheKey not in entry[3]:
+        entry[3][cacheKey] = derivedColumns[(statementType, key)](series)
+
+    return entry[3][cacheKey]
+
+
+def getPrefixSums(
+    financialStatements: FinancialStatements, statementType: str, key: str
+) -> np.ndarray:
+    """
+    [0, v0, v0 + v1, ...] of a column, built once per statements
+    the sum of the values in [start, end) is prefixSums[end] - prefixSums[start]
+    """
+    derived = getCacheEntry(financialStatements)[3]
+    cacheKey = ("prefixSums", statementType, key)
+
+    if cacheKey not in derived:
+        column = getColumn(financialStatements, statementType, key)
+        derived[cacheKey] = np.concatenate(([0.0], np.cumsum(column, dtype=float)))
+
+    return derived[cacheKey]
+
+
+def getTrailingRange(
+    financialStatements: FinancialStatements,
+    statementType: str,
+    noQuarters: int,
+    asOfDate=None,
+):
+    # the [start, end) indexes of the latest noQuarters statements on or before asOfDate
+    series = getFinancialStatementSeries(financialStatements)[statementType]
+    end = len(series) if asOfDate is None else getAsOfIndex(series, asOfDate)
+
+    return max(end - noQuarters, 0), end
+
+
+def getTrailingSum(
+    stock: Stock, statementType: str, key: str, noQuarters: int, asOfDate=None
+) -> float:
+    """
+    the sum of the latest noQuarters values on or before asOfDate (or ever)
+    e.g. noQuarters=4 is the trailing twelve months
+    """
+    prefixSums = getPrefixSums(stock.financialStatements, statementType, key)
+    start, end = getTrailingRange(
+        stock.financialStatements, statementType, noQuarters, asOfDate
+    )
+
+    return float(prefixSums[end] - prefixSums[start])
+
+
+def getTrailingAverage(
+    stock: Stock, statementType: str, key: str, noQuarters: int, asOfDate=None
+) -> float:
+    """
+    the average of the latest noQuarters values on or before asOfDate (or ever)
+    """
+    prefixSums = getPrefixSums(stock.financialStatements, statementType, key)
+    start, end = getTrailingRange(
+        stock.financialStatements, statementType, noQuarters, asOfDate
+    )
+
+    if end == start:
+        return 0
+
+    return float(prefixSums[end] - prefixSums[start]) / (end - start)
+
+
+def getStockValues(
+    stock: Stock, statementType: str, key: str, limitTo: int = None, asOfDate=None
+) -> np.ndarray:
+    """
+    the latest limitTo values of a stock's statements field (oldest first)
+    """
+    column = getColumn(stock.financialStatements, statementType, key)
+    start, end = getTrailingRange(
+        stock.financialStatements, statementType, len(column), asOfDate
+    )
+
+    if limitTo is not None:
+        start = max(end - limitTo, 0)
+
+    return column[start:end]
+
+
+def clearStatementsCache(financialStatements: FinancialStatements):
+    # drop everything derived from financialStatements, e.g. after restating one
+    entry = seriesCache.get(id(financialStatements))
+
+    if entry is not None and entry[0]() is financialStatements:
+        seriesCache.pop(id(financialStatements))
+
+
+def clearSeriesCache():
+    seriesCache.clear()
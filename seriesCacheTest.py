@@ -0,0 +1,183 @@
+import math
+import gc
+import evaluate
+import seriesCache
+from batchEvaluateTest import makeStock
+from models import BalanceSheet, IncomeStatement, Stock
+
+
+def testGetFinancialStatementSeries():
+    stock = makeStock("TEST", 1)
+    series = seriesCache.getFinancialStatementSeries(stock.financialStatements)
+
+    assert seriesCache.getFinancialStatementSeries(stock.financialStatements) is series
+    assert len(series.incomeStatements) == 20
+
+    # adding a statement rebuilds the series
+    stock.financialStatements.incomeStatements["2099-12-31"] = IncomeStatement(
+        netIncome=1
+    )
+    newSeries = seriesCache.getFinancialStatementSeries(stock.financialStatements)
+
+    assert newSeries is not series
+    assert len(newSeries.incomeStatements) == 21
+    assert newSeries.incomeStatements["netIncome"][-1] == 1
+
+
+def testGetFinancialStatementSeriesGarbageCollected():
+    seriesCache.clearSeriesCache()
+    stock = makeStock("TEST", 1)
+    seriesCache.getFinancialStatementSeries(stock.financialStatements)
+    assert len(seriesCache.seriesCache) == 1
+
+    del stock
+    gc.collect()
+    assert len(seriesCache.seriesCache) == 0
+
+
+def testGetStockValues():
+    stock = makeStock("TEST", 2)
+    statements = stock.financialStatements.incomeStatements
+    dates = sorted(statements)[-4:]
+    values = seriesCache.getStockValues(stock, "incomeStatements", "netIncome", 4)
+
+    assert values.tolist() == [statements[date].netIncome for date in dates]
+    assert len(seriesCache.getStockValues(stock, "incomeStatements", "netIncome")) == 20
+    assert (
+        len(seriesCache.getStockValues(stock, "incomeStatements", "netIncome", 40))
+        == 20
+    )
+
+
+def testGetStockValuesRestated():
+    stock = makeStock("TEST", 2)
+    statements = stock.financialStatements.incomeStatements
+    latestDate = max(statements)
+    seriesCache.getStockValues(stock, "incomeStatements", "netIncome", 1)
+
+    # replacing the statements (with as many) is a new series
+    stock.financialStatements.incomeStatements = {
+        date: IncomeStatement(netIncome=1.0) for date in statements
+    }
+    values = seriesCache.getStockValues(stock, "incomeStatements", "netIncome", 1)
+    assert values.tolist() == [1.0]
+
+    # a statement restated in place needs the cache cleared
+    stock.financialStatements.incomeStatements[latestDate].netIncome = 2.0
+    seriesCache.clearStatementsCache(stock.financialStatements)
+    values = seriesCache.getStockValues(stock, "incomeStatements", "netIncome", 1)
+    assert values.tolist() == [2.0]
+
+
+def testGetTrailingSum():
+    stock = makeStock("TEST", 3)
+    statements = stock.financialStatements.cashFlowStatements
+    dates = sorted(statements)
+    expected = sum(statements[date].dividendsPaid for date in dates[-4:])
+    result = seriesCache.getTrailingSum(stock, "cashFlowStatements", "dividendsPaid", 4)
+
+    assert math.isclose(result, expected)
+
+    # as of a date between statements
+    asOfDate = dates[9][:8] + "01"  # the start of the month of the 10th statement
+    expected = sum(statements[date].dividendsPaid for date in dates[5:9])
+    result = seriesCache.getTrailingSum(
+        stock, "cashFlowStatements", "dividendsPaid", 4, asOfDate
+    )
+
+    assert math.isclose(result, expected)
+
+    # fewer statements than quarters
+    expected = sum(statements[date].dividendsPaid for date in dates[:2])
+    result = seriesCache.getTrailingSum(
+        stock, "cashFlowStatements", "dividendsPaid", 4, dates[1]
+    )
+
+    assert math.isclose(result, expected)
+    assert (
+        seriesCache.getTrailingSum(
+            stock, "cashFlowStatements", "dividendsPaid", 4, "1900-01-01"
+        )
+        == 0
+    )
+
+
+def testGetTrailingSumFcf():
+    stock = makeStock("TEST", 4)
+    statements = stock.financialStatements.cashFlowStatements
+    dates = sorted(statements)[-4:]
+    expected = sum(
+        statements[date].cashFromOperations - abs(statements[date].capex)
+        for date in dates
+    )
+    result = seriesCache.getTrailingSum(stock, "cashFlowStatements", "fcf", 4)
+
+    assert math.isclose(result, expected)
+
+
+def testGetTrailingAverage():
+    stock = makeStock("TEST", 5)
+    statements = stock.financialStatements.incomeStatements
+    dates = sorted(statements)[-8:]
+    expected = sum(statements[date].netIncome for date in dates) / 8
+    result = seriesCache.getTrailingAverage(stock, "incomeStatements", "netIncome", 8)
+
+    assert math.isclose(result, expected)
+    assert (
+        seriesCache.getTrailingAverage(
+            stock, "incomeStatements", "netIncome", 8, "1900-01-01"
+        )
+        == 0
+    )
+
+
+def testGetLatestValidStatement():
+    stock = makeStock("TEST", 4)
+    balanceSheets = stock.financialStatements.balanceSheets
+    dates = sorted(balanceSheets)
+
+    # the latest two balance sheets are invalid
+    for date in dates[-2:]:
+        balanceSheets[date] = BalanceSheet()
+
+    latestBalanceSheet = evaluate.getLatestValidBalanceSheet(stock)
+
+    assert latestBalanceSheet is balanceSheets[dates[-3]]
+    assert len(balanceSheets) == 20  # nothing was removed
+    assert (
+        evaluate.getLatestValidBalanceSheet(stock, dates[5]) is balanceSheets[dates[5]]
+    )
+    assert evaluate.getLatestValidBalanceSheet(stock, "1900-01-01") is None
+    assert (
+        evaluate.getLatestValidFinancialStatement(
+            balanceSheets, evaluate.validateBalanceSheet
+        )
+        is latestBalanceSheet
+    )
+
+
+def testGetLatestValidStatementAsOfView():
+    stock = makeStock("TEST", 4)
+    balanceSheets = stock.financialStatements.balanceSheets
+    dates = sorted(balanceSheets)
+    balanceSheets[dates[8]] = BalanceSheet()
+
+    for date in dates:
+        snapshot = Stock(
+            symbol=stock.symbol,
+            financialStatements=seriesCache.getStatementsAsOf(
+                stock.financialStatements, date
+            ),
+        )
+        expected = evaluate.getLatestValidFinancialStatement(
+            {d: balanceSheets[d] for d in dates if d <= date},
+            evaluate.validateBalanceSheet,
+        )
+
+        assert evaluate.getLatestValidBalanceSheet(snapshot) is expected
+        assert evaluate.getLatestValidBalanceSheet(snapshot, dates[2]) is (
+            balanceSheets[min(date, dates[2])]
+        )
+
+        # the index is the stock's, the snapshot's statements aren't indexed
+        assert id(snapshot.financialStatements) not in seriesCache.seriesCache
@@ -1,9 +1,11 @@
 import argparse
+import gc
 import json
-from typing import List
+import multiprocessing
+from typing import Dict, List
 from datetime import datetime
 import math
-import typedload
+import modelLoader
 from dateutil.relativedelta import relativedelta
 from alive_progress import alive_bar
 from models import (
@@ -14,10 +16,14 @@ from models import (
     PortfolioTransaction,
     PortfolioStock,
     ValuationModel,
+    SimulationDay,
 )
-from getStockSnapshot import getStockSnapshot
-from evaluate import evaluate
+from simulationEngine import SimulationEngine
+from snapshotWriter import SnapshotWriter, snapshotModes
 import utils
+import priceSeries
+import seriesCache
+import tradingCalendar
 from getStocks import getStocks
 
 
@@ -230,7 +236,7 @@ def getPortfolio(startAmount, filename) -> Portfolio:
     # if a portfolio exists, use it
     if utils.fileExists(filename):
         with open(filename) as file:
-            portfolio = typedload.load(json.load(file), Portfolio)
+            portfolio = modelLoader.load(json.load(file), Portfolio)
 
     else:
         portfolio = Portfolio()
@@ -259,33 +265,27 @@ def getStartDate(stocks: Stocks) -> Date:
 
 
 def stockHasHistoricalPriceForDate(stock: Stock, date) -> bool:
-    dateString = utils.dateToDateString(date)
-
-    if dateString not in stock.historicalPricing:
-        return False
-    elif (
-        dateString in stock.historicalPricing
-        and stock.historicalPricing[dateString] == 0.0
-    ):
-        return False
-
-    return True
+    return priceSeries.hasPriceOn(stock, date)
 
 
 def trade(
     portfolio: Portfolio,
     stocksToBuy: List[Stock],
     stocksToSell: List[Stock],
-    date,
+    day: SimulationDay,
     stocks: Stocks,
     model: ValuationModel,
 ):
-    if utils.isEndOfMonth(date):
+    date = utils.dateStringToDate(day.date)
+
+    if day.isMonthEnd:
         portfolio = makeDeposit(portfolio, date, model.topUp)
 
     # buy stocks and add them to our portfolio
-    # TODO distribute buy amount proportionally based on mos
-    stocksToBuy.sort(key=lambda e: e["valuation"]["mos"], reverse=True)  # sort by mos
+    # TODO distribute buy amount proportionally based on expected return
+    stocksToBuy.sort(
+        key=lambda e: e["valuation"]["expectedReturn"], reverse=True
+    )  # sort by expected return
     for stock in stocksToBuy:
         portfolio = makePurchase(portfolio, date, stock, model)
 
@@ -297,26 +297,13 @@ def trade(
     # for any stocks in our portfolio
     # if the current date matches a date in its cash flow statements (TODO this will break if we use quarterly statements or if statement dates aren't yearly)
     # and dividends were paid, pay out the dividends
-    dateString = utils.dateToDateString(date)
     for symbol in portfolio.stocks:
-        if dateString in stocks[symbol].financialStatements.cashFlowStatements:
+        if symbol in day.dividendSymbols:
             portfolio = makeDividendPayment(portfolio, date, stocks[symbol], model)
 
     return portfolio
 
 
-def getSnapshotUrl(symbol, date, modelName, exchange):
-    return (
-        f"data/snapshots/{exchange}/{modelName}/{date.date().__str__()}/{symbol}.json"
-    )
-
-
-def saveSnapshot(snapshotUrl, snapshot):
-    with utils.safeOpenWrite(snapshotUrl) as file:
-        jsonString2 = json.dumps(snapshot, default=lambda o: o.__dict__, indent=2)
-        file.write(jsonString2)
-
-
 def getRoi(portfolio: Portfolio, stocks: Stocks, startDate, endDate) -> Portfolio:
     # TODO test this
     # cash + current price of the stocks we own
@@ -351,6 +338,8 @@ def simulate(
     startDateArg,
     endDateArg,
     exchange,
+    tradingDates: List[Date] = None,
+    snapshots: str = "store",
 ) -> Portfolio:
     startDateString = model.startDate or getStartDate(stocks)
 
@@ -363,24 +352,38 @@ def simulate(
     endDate = endDateArg and utils.dateStringToDate(endDateArg) or datetime.now()
     stock = None
     stockSnapshot = None
+    # the statements grow a quarter at a time, so the growth rate trends are running fits
+    engine = SimulationEngine(model, closedForm=True)
+    writer = SnapshotWriter(snapshots)
+
+    # skip the days that nothing happens on (no prices, deposits or dividends)
+    simulationDays = tradingCalendar.getSimulationDays(
+        startDate,
+        endDate,
+        tradingDates or tradingCalendar.getTradingDates(stocks),
+        tradingCalendar.getDividendDates(stocks),
+    )
 
-    with alive_bar(len(list(utils.dateRange(startDate, endDate)))) as aliveBar:
-        for date in utils.dateRange(startDate, endDate):
+    with alive_bar(len(simulationDays)) as aliveBar:
+        for day in simulationDays:
+            date = utils.dateStringToDate(day.date)
             print(f"Simulating {date}...")
             stocksToBuy = []
             stocksToSell = []
 
-            for symbol in stocks:
+            # there's nothing to evaluate on deposit or dividend days without prices
+            symbols = day.isTradingDay and list(stocks) or []
+
+            for symbol in symbols:
                 stock = stocks[symbol]
 
                 if stockHasHistoricalPriceForDate(stock, date):
                     # get the stock's snapshot at that date and
-                    # evaluate it
-                    stockSnapshot = getStockSnapshot(stock, date)
+                    # evaluate it (the fundamentals are reused until the next statement)
+                    stockSnapshot = engine.getStockSnapshot(stock, date)
 
                     if stockSnapshot:
-                        stockSnapshot.valuation = evaluate(stockSnapshot, model)
-                        snapshotUrl = getSnapshotUrl(
+                        snapshotUrl = writer.getUrl(
                             stock.symbol, date, model.name, exchange
                         )
 
@@ -390,24 +393,25 @@ def simulate(
                                 f"{utils.dateToDateString(date)}: Buying {stock.symbol}! {snapshotUrl}"
                             )
 
-                            # NOTE this function call increases execution time by 33%
-                            saveSnapshot(snapshotUrl, stockSnapshot)
+                            # saved in the background
+                            writer.save(stockSnapshot, date, model.name, exchange)
 
                         elif stockSnapshot.valuation.instruction == "HOT":
                             print(
                                 f"{utils.dateToDateString(date)}: {stock.symbol} is hot! {snapshotUrl}"
                             )
 
-                            # NOTE this function call increases execution time by 33%
-                            saveSnapshot(snapshotUrl, stockSnapshot)
+                            # saved in the background
+                            writer.save(stockSnapshot, date, model.name, exchange)
 
                         elif stockSnapshot.valuation.instruction == "SELL":
                             stocksToSell.append(stockSnapshot)
 
-            portfolio = trade(portfolio, stocksToBuy, stocksToSell, date, stocks, model)
+            portfolio = trade(portfolio, stocksToBuy, stocksToSell, day, stocks, model)
 
             aliveBar()
 
+    writer.close()
     portfolio.roi = getRoi(portfolio, stocks, startDate, endDate)
     portfolio.model = model
 
@@ -416,6 +420,81 @@ def simulate(
 
 startingCash = 1000
 
+# the stocks (and settings) that simulateModelJob simulates a model over, set before
+# the pool forks so that the workers share them (copy on write) instead of loading them
+universe = {}
+
+
+def simulateModelJob(model: ValuationModel):
+    # simulate a model over the universe and save its portfolio, returns (name, roi)
+    exchange = universe["exchange"]
+    filename = f"data/simulations/{exchange}/{universe['today']}/{model.name}.json"
+
+    # TEMP
+    # if utils.fileExists(filename):
+    #     print("Skipping", model.name)
+    # else:
+    print(f"Simulation started for: {model.name}")
+    portfolio = getPortfolio(startingCash, filename)
+    portfolio = simulate(
+        portfolio,
+        universe["stocks"],
+        model,
+        universe["startDate"],
+        universe["endDate"],
+        exchange,
+        universe["tradingDates"],
+        universe["snapshots"],
+    )
+    print(f"Simulation completed. Annualised roi: {round(portfolio.roi, 2) * 100}%")
+
+    with utils.safeOpenWrite(filename) as file:
+        jsonString = json.dumps(modelLoader.dump(portfolio), indent=2)
+        file.write(jsonString)
+
+    return model.name, portfolio.roi
+
+
+def simulateModels(
+    stocks: Stocks,
+    models: List[ValuationModel],
+    exchange,
+    startDate,
+    endDate,
+    noProcesses: int = 1,
+    snapshots: str = "store",
+) -> Dict[str, float]:
+    """
+    simulate every model over the same stocks, concurrently in a pool of noProcesses
+    forked processes, returns the roi of each model
+    """
+    universe.update(
+        stocks=stocks,
+        tradingDates=tradingCalendar.getTradingDates(stocks),
+        exchange=exchange,
+        startDate=startDate,
+        endDate=endDate,
+        today=datetime.now().date().__str__(),
+        snapshots=snapshots,
+    )
+
+    # build the shared indexes once, before the fork
+    for symbol in stocks:
+        priceSeries.getPriceSeries(stocks[symbol].historicalPricing)
+        seriesCache.getFinancialStatementSeries(stocks[symbol].financialStatements)
+
+    if noProcesses <= 1:
+        return dict(simulateModelJob(model) for model in models)
+
+    # keep the garbage collector from touching (and so copying) the universe's pages
+    gc.freeze()
+
+    try:
+        with multiprocessing.get_context("fork").Pool(noProcesses) as pool:
+            return dict(pool.imap_unordered(simulateModelJob, models))
+    finally:
+        gc.unfreeze()
+
 
 def runSimulations():
     startTime = datetime.now()
@@ -427,6 +506,10 @@ def runSimulations():
     argParser.add_argument("--endDate", type=str)
     argParser.add_argument("--fromIndex", type=int)
     argParser.add_argument("--toIndex", type=int)
+    argParser.add_argument("--processes", type=int, default=1)
+    argParser.add_argument(
+        "--snapshots", type=str, choices=snapshotModes, default="store"
+    )
     args = argParser.parse_known_args()
 
     exchange = args[0].exchange
@@ -434,33 +517,19 @@ def runSimulations():
     endDate = args[0].endDate
     fromIndex = args[0].fromIndex
     toIndex = args[0].toIndex
+    processes = args[0].processes
+    snapshots = args[0].snapshots
 
     # for model in simulation models, run the simulation and store the result
     with open("data/models.json") as file:
-        models = typedload.load(json.load(file), List[ValuationModel])
+        models = modelLoader.load(json.load(file), List[ValuationModel])
 
-    today = datetime.now().date().__str__()
     stocks = getStocks(exchange, toIndex, fromIndex)
-    portfolio = None
-
-    for model in models:
-        filename = f"data/simulations/{exchange}/{today}/{model.name}.json"
-
-        # TEMP
-        # if utils.fileExists(filename):
-        #     print("Skipping", model.name)
-        # else:
-        print(f"Simulation started for: {model.name}")
-        portfolio = getPortfolio(startingCash, filename)
-        portfolio = simulate(portfolio, stocks, model, startDate, endDate, exchange)
-        print(f"Simulation completed. Annualised roi: {round(portfolio.roi, 2) * 100}%")
-
-        with utils.safeOpenWrite(filename) as file:
-            jsonString = json.dumps(portfolio, default=lambda o: o.__dict__, indent=2)
-            file.write(jsonString)
+    simulateModels(stocks, models, exchange, startDate, endDate, processes, snapshots)
 
     endTime = datetime.now()
     print(f"Simulation complete in: {endTime - startTime}.")
 
 
-runSimulations()
+if __name__ == "__main__":
+    runSimulations()
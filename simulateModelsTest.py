@@ -0,0 +1,69 @@
+import json
+from datetime import datetime
+import simulate
+from makeSyntheticStocks import makeSyntheticStocks
+from models import ValuationModel
+
+
+def makeModels():
+    lenient = dict(
+        discountRate=0.01,
+        minRoe=0,
+        minGrowthRate=-1,
+        maxPe=1000,
+        maxPeg=1000,
+        maxPb=1000,
+        minCr=0,
+        maxDte=10,
+        minAltmanZScore=0,
+        maxBlendedMultiplier=10000,
+        minStatementYears=0,
+    )
+
+    return [
+        ValuationModel(name="default"),
+        ValuationModel(name="lenient", **lenient),
+        ValuationModel(name="lenientLonger", yearsForEarningsCalcs=1, **lenient),
+    ]
+
+
+def getPortfolios(models):
+    today = datetime.now().date().__str__()
+    portfolios = {}
+
+    for model in models:
+        with open(f"data/simulations/TEST/{today}/{model.name}.json") as file:
+            portfolio = json.load(file)
+
+        # the transaction ids are random
+        portfolio["transactionHistory"] = list(portfolio["transactionHistory"].values())
+        portfolios[model.name] = portfolio
+
+    return portfolios
+
+
+def testSimulateModels(tmp_path, monkeypatch):
+    stocks = makeSyntheticStocks(4, 2, seed=2, endDate=datetime(2020, 6, 30))
+    models = makeModels()
+
+    # (simulate continues from the saved portfolios, so each run gets a directory)
+    (tmp_path / "parallel").mkdir()
+    monkeypatch.chdir(tmp_path / "parallel")
+    rois = simulate.simulateModels(
+        stocks, models, "TEST", "2020-01-01", "2020-03-01", 2
+    )
+    portfolios = getPortfolios(models)
+
+    # the same as simulating the models one after another
+    (tmp_path / "sequential").mkdir()
+    monkeypatch.chdir(tmp_path / "sequential")
+    expectedRois = simulate.simulateModels(
+        stocks, models, "TEST", "2020-01-01", "2020-03-01", 1
+    )
+
+    assert rois == expectedRois
+    assert portfolios == getPortfolios(models)
+    assert any(
+        transaction["transactionType"] == "BUY"
+        for transaction in portfolios["lenient"]["transactionHistory"]
+    )
@@ -0,0 +1,86 @@
+from typing import Dict, Tuple
+from models import Fundamentals, FinancialStatements, Stock, Symbol, ValuationModel
+from evaluate import evaluateFundamentals, getFundamentals
+from getStockSnapshot import (
+    getHistoricalPrice,
+    getHistoricalFinancialStatements,
+    stockHasStatements,
+)
+import seriesCache
+
+
+class SimulationEngine:
+    """
+    the daily stock snapshots of a simulation with their valuations
+    a stock's statements and fundamentals are only rebuilt when its statement
+    epoch changes (a statement date passes), on the days in between only the
+    price dependent fields of the valuation are recomputed
+    closedForm is passed on to getFundamentals
+    """
+
+    def __init__(self, model: ValuationModel, closedForm: bool = False):
+        self.model = model
+        self.closedForm = closedForm
+        # the latest (epoch, financialStatements, fundamentals) of each stock
+        self.epochs: Dict[Symbol, Tuple[Tuple, FinancialStatements, Fundamentals]] = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def getEpochEntry(self, stock: Stock, date):
+        """
+        the statements and fundamentals of stock on date
+        the statements are None if the stock doesn't have every type of statement yet
+        """
+        epoch = seriesCache.getStatementEpoch(stock.financialStatements, date)
+        entry = self.epochs.get(stock.symbol)
+
+        if entry is not None and entry[0] == epoch:
+            self.stats["hits"] += 1
+            return entry[1], entry[2]
+
+        self.stats["misses"] += 1
+        stockSnapshot = Stock(
+            symbol=stock.symbol,
+            sharesOutstanding=stock.sharesOutstanding,
+            financialStatements=getHistoricalFinancialStatements(stock, date),
+            historicalPricing=stock.historicalPricing,
+        )
+
+        if stockHasStatements(stockSnapshot):
+            entry = (
+                epoch,
+                stockSnapshot.financialStatements,
+                getFundamentals(stockSnapshot, self.model, self.closedForm),
+            )
+        else:
+            entry = (epoch, None, None)
+
+        self.epochs[stock.symbol] = entry
+
+        return entry[1], entry[2]
+
+    def getStockSnapshot(self, stock: Stock, date) -> Stock:
+        """
+        the same snapshot as getStockSnapshot with the valuation of evaluate
+        """
+        currentPrice = getHistoricalPrice(stock, date)
+
+        if not currentPrice:
+            return None
+
+        financialStatements, fundamentals = self.getEpochEntry(stock, date)
+
+        if financialStatements is None:
+            return None
+
+        stockSnapshot = Stock(
+            symbol=stock.symbol,
+            currentPrice=currentPrice,
+            sharesOutstanding=stock.sharesOutstanding,
+            financialStatements=financialStatements,
+            historicalPricing=stock.historicalPricing,
+        )
+        stockSnapshot.valuation = evaluateFundamentals(
+            fundamentals, currentPrice, self.model
+        )
+
+        return stockSnapshot
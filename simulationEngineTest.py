@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+import modelLoader
+from evaluate import evaluate
+from getStockSnapshot import getStockSnapshot
+from makeSyntheticStocks import makeSyntheticStocks
+from models import ValuationModel
+from screen import screen
+from simulationEngine import SimulationEngine
+
+
+def testSimulationEngine():
+    endDate = datetime(2020, 6, 30)
+    stocks = makeSyntheticStocks(6, 4, seed=3, endDate=endDate)
+    model = ValuationModel(
+        discountRate=0.01,
+        minRoe=0,
+        minGrowthRate=-1,
+        maxPe=1000,
+        maxPeg=1000,
+        maxPb=1000,
+        minCr=0,
+        maxDte=10,
+        minAltmanZScore=0,
+        maxBlendedMultiplier=10000,
+        minStatementYears=0,
+    )
+    engine = SimulationEngine(model)
+    instructions = set()
+    date = endDate - timedelta(days=250)
+
+    while date <= endDate:
+        for symbol in stocks:
+            expected = getStockSnapshot(stocks[symbol], date)
+            stockSnapshot = engine.getStockSnapshot(stocks[symbol], date)
+
+            if not expected:
+                assert stockSnapshot is None
+                continue
+
+            # the same snapshot and valuation as evaluating from scratch
+            expected.valuation = evaluate(expected, model)
+            instructions.add(expected.valuation.instruction)
+
+            assert modelLoader.dump(stockSnapshot) == modelLoader.dump(expected)
+            assert (
+                stockSnapshot.valuation.instruction
+                == screen(expected, model).instruction
+            )
+
+        date = date + timedelta(days=1)
+
+    assert instructions == {"BUY", "SELL"}
+
+    # the fundamentals were only computed once per stock per statement date
+    assert engine.stats["misses"] <= len(stocks) * 6
+    assert engine.stats["hits"] > 10 * engine.stats["misses"]
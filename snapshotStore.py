@@ -0,0 +1,122 @@
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from typing import Dict, Tuple
+from models import Stock, Symbol
+import modelLoader
+import utils
+
+blobsDirectory = "data/snapshots/blobs"
+
+# the parts of a snapshot that are stored once as blobs and referenced by their hash
+blobKeys = ["financialStatements", "historicalPricing"]
+
+
+def getBlobUrl(key: str) -> str:
+    return f"{blobsDirectory}/{key[:2]}/{key}.json"
+
+
+def getSnapshotRecordsUrl(date, modelName, exchange) -> str:
+    return (
+        f"data/snapshots/{exchange}/{modelName}/{date.date().__str__()}.records.jsonl"
+    )
+
+
+def hashBlob(data) -> Tuple[str, str]:
+    """
+    the (key, json) of data, the key is the sha256 of its json so equal data has
+    the same key regardless of the model or day it came from
+    """
+    jsonString = json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+    return hashlib.sha256(jsonString.encode()).hexdigest(), jsonString
+
+
+def writeBlob(key: str, jsonString: str):
+    # write to a temporary file first, concurrent simulations may write the same blob
+    url = getBlobUrl(key)
+
+    if utils.fileExists(url):
+        return
+
+    directory = os.path.dirname(url)
+    utils.mkdirP(directory)
+
+    with tempfile.NamedTemporaryFile("w", dir=directory, delete=False) as file:
+        file.write(jsonString)
+
+    os.replace(file.name, url)
+
+
+@lru_cache(maxsize=64)
+def readBlob(key: str) -> str:
+    # blobs never change so the latest ones are kept (opening a stock's days reuses them)
+    with open(getBlobUrl(key)) as file:
+        return file.read()
+
+
+class SnapshotStore:
+    """
+    saves snapshots as a small record per day (price, valuation etc) that references
+    content addressed blobs of the statements and pricing
+    consecutive days of a stock and the same stock in every model share their blobs
+    """
+
+    def __init__(self):
+        # the latest (part, key) of each stock's blobs, the engine reuses the same
+        # statements between statement dates and the pricing never changes
+        self.latestBlobs: Dict[Tuple[Symbol, str], Tuple[object, str]] = {}
+        self.noBlobsWritten = 0
+
+    def getBlobKey(self, snapshot: Stock, blobKey: str) -> str:
+        part = snapshot[blobKey]
+        latest = self.latestBlobs.get((snapshot.symbol, blobKey))
+
+        if latest is not None and latest[0] is part:
+            return latest[1]
+
+        key, jsonString = hashBlob(
+            modelLoader.dump(part, Stock.__dataclass_fields__[blobKey].type)
+        )
+
+        if not utils.fileExists(getBlobUrl(key)):
+            writeBlob(key, jsonString)
+            self.noBlobsWritten += 1
+
+        self.latestBlobs[(snapshot.symbol, blobKey)] = (part, key)
+
+        return key
+
+    def makeRecord(self, snapshot: Stock) -> str:
+        """
+        the json line of snapshot with its blobs replaced by their keys
+        """
+        record = modelLoader.dump(
+            dataclasses.replace(
+                snapshot,
+                **{
+                    blobKey: Stock.__dataclass_fields__[blobKey].default_factory()
+                    for blobKey in blobKeys
+                },
+            )
+        )
+
+        for blobKey in blobKeys:
+            record[blobKey] = self.getBlobKey(snapshot, blobKey)
+
+        return json.dumps(record, separators=(",", ":"))
+
+
+def loadRecord(record) -> Stock:
+    """
+    the snapshot of a record made by makeRecord
+    """
+    data = dict(record)
+
+    for blobKey in blobKeys:
+        data[blobKey] = json.loads(readBlob(record[blobKey]))
+
+    return modelLoader.load(data, Stock)
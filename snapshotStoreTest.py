@@ -0,0 +1,120 @@
+import dataclasses
+import json
+import os
+from datetime import datetime
+import simulate
+from batchEvaluateTest import makeStock
+from makeSyntheticStocks import makeSyntheticStocks
+from simulateModelsTest import makeModels
+from snapshotStore import SnapshotStore, blobsDirectory, loadRecord
+from snapshotWriter import SnapshotWriter, getSnapshotUrl, openSnapshot
+
+
+def getSize(directory):
+    return sum(
+        os.path.getsize(os.path.join(path, filename))
+        for path, _, filenames in os.walk(directory)
+        for filename in filenames
+    )
+
+
+def testSnapshotRecords(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stock = makeStock("STOCK", 0)
+    store = SnapshotStore()
+    record = json.loads(store.makeRecord(stock))
+
+    # the same blobs for the same statements and pricing, whatever the object
+    assert json.loads(SnapshotStore().makeRecord(makeStock("STOCK", 0))) == record
+    assert store.noBlobsWritten == 2
+    assert sum(len(filenames) for _, _, filenames in os.walk(blobsDirectory)) == 2
+
+    # another day's price only adds a record
+    stock.currentPrice += 1
+    nextRecord = json.loads(store.makeRecord(stock))
+
+    assert store.noBlobsWritten == 2
+    assert nextRecord["historicalPricing"] == record["historicalPricing"]
+    assert nextRecord["currentPrice"] == record["currentPrice"] + 1
+    assert loadRecord(nextRecord) == stock
+
+
+def testOpenSnapshot(tmp_path, monkeypatch):
+    stocks = makeSyntheticStocks(4, 2, seed=2, endDate=datetime(2020, 6, 30))
+    models = makeModels()
+    directories = {}
+
+    for snapshots in ["full", "store"]:
+        directories[snapshots] = tmp_path / snapshots
+        directories[snapshots].mkdir()
+        monkeypatch.chdir(directories[snapshots])
+        simulate.simulateModels(
+            stocks, models, "TEST", "2020-01-01", "2020-03-01", 1, snapshots
+        )
+
+    monkeypatch.chdir(directories["full"])
+    fullSnapshots = {}
+
+    for path, _, filenames in os.walk("data/snapshots/TEST"):
+        modelName, date = path.split("/")[-2:]
+
+        for filename in filenames:
+            symbol = filename[: -len(".json")]
+            fullSnapshots[(symbol, date, modelName)] = openSnapshot(
+                symbol, datetime.fromisoformat(date), modelName, "TEST"
+            )
+
+    assert fullSnapshots
+
+    # every snapshot opens the same from the records and blobs
+    monkeypatch.chdir(directories["store"])
+
+    for (symbol, date, modelName), snapshot in fullSnapshots.items():
+        assert (
+            openSnapshot(symbol, datetime.fromisoformat(date), modelName, "TEST")
+            == snapshot
+        )
+
+    assert openSnapshot("NONE", datetime(2020, 1, 2), "lenient", "TEST") is None
+    assert getSize(directories["store"] / "data/snapshots") * 10 < getSize(
+        directories["full"] / "data/snapshots"
+    )
+
+
+def testOpenNewestSnapshot(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    date = datetime(2020, 1, 2)
+    stock = makeStock("STOCK", 0)
+
+    # a full snapshot from an older run
+    writer = SnapshotWriter("full")
+    writer.save(dataclasses.replace(stock, currentPrice=1.0), date, "model", "TEST")
+    writer.close()
+    snapshotUrl = getSnapshotUrl("STOCK", date, "model", "TEST")
+    os.utime(snapshotUrl, (0, 0))
+
+    for currentPrice in [10.0, 99.0]:
+        writer = SnapshotWriter("store")
+        writer.save(
+            dataclasses.replace(stock, currentPrice=currentPrice), date, "model", "TEST"
+        )
+        writer.close()
+
+    assert openSnapshot("STOCK", date, "model", "TEST").currentPrice == 99.0
+
+    # and the records of a run saved twice
+    writer = SnapshotWriter("store")
+
+    for currentPrice in [5.0, 6.0]:
+        writer.save(
+            dataclasses.replace(stock, currentPrice=currentPrice), date, "model", "TEST"
+        )
+
+    writer.close()
+
+    assert openSnapshot("STOCK", date, "model", "TEST").currentPrice == 6.0
+
+    # a newer full snapshot wins over the records
+    os.utime(snapshotUrl)
+
+    assert openSnapshot("STOCK", date, "model", "TEST").currentPrice == 1.0
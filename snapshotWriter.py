@@ -0,0 +1,163 @@
+import atexit
+import json
+import os
+import queue
+import threading
+from models import Stock
+import modelLoader
+from snapshotStore import SnapshotStore, getSnapshotRecordsUrl, loadRecord
+import utils
+
+snapshotModes = ["off", "compact", "full", "store"]
+
+
+def getSnapshotUrl(symbol, date, modelName, exchange):
+    return (
+        f"data/snapshots/{exchange}/{modelName}/{date.date().__str__()}/{symbol}.json"
+    )
+
+
+def getCompactSnapshotsUrl(date, modelName, exchange):
+    return f"data/snapshots/{exchange}/{modelName}/{date.date().__str__()}.jsonl"
+
+
+def saveSnapshot(snapshotUrl, snapshot):
+    with utils.safeOpenWrite(snapshotUrl) as file:
+        jsonString2 = json.dumps(modelLoader.dump(snapshot), indent=2)
+        file.write(jsonString2)
+
+
+def dumpCompactSnapshot(snapshot: Stock) -> str:
+    # one line without the pricing (it's the same for every snapshot of a stock)
+    data = modelLoader.dump(snapshot)
+    data.pop("historicalPricing")
+
+    return json.dumps(data, separators=(",", ":"))
+
+
+def openSnapshot(symbol, date, modelName, exchange) -> Stock:
+    """
+    the snapshot of symbol that simulate last saved on date, None if there isn't one
+    whichever of its full file and records file was saved last is used
+    """
+    snapshotUrl = getSnapshotUrl(symbol, date, modelName, exchange)
+    recordsUrl = getSnapshotRecordsUrl(date, modelName, exchange)
+    hasSnapshot = utils.fileExists(snapshotUrl)
+    hasRecords = utils.fileExists(recordsUrl)
+
+    if hasSnapshot and (
+        not hasRecords or os.path.getmtime(snapshotUrl) >= os.path.getmtime(recordsUrl)
+    ):
+        with open(snapshotUrl) as file:
+            return modelLoader.load(json.load(file), Stock)
+
+    if not hasRecords:
+        return None
+
+    latestRecord = None
+
+    # the last of the symbol's records is the newest
+    with open(recordsUrl) as file:
+        for line in file:
+            record = json.loads(line)
+
+            if record["symbol"] == symbol:
+                latestRecord = record
+
+    return latestRecord and loadRecord(latestRecord)
+
+
+class SnapshotWriter:
+    """
+    saves simulate's snapshots from a background thread, in batches
+    full: a json file per snapshot (at getSnapshotUrl)
+    compact: a line per snapshot appended to a file per day (at getCompactSnapshotsUrl)
+    store: a line per snapshot appended to a file per day (at getSnapshotRecordsUrl)
+    that references the statements and pricing, which are saved once (see snapshotStore)
+    off: nothing is saved
+    close (or exiting) writes whatever is still queued
+    """
+
+    def __init__(self, mode: str = "store", batchSize: int = 256):
+        if mode not in snapshotModes:
+            raise ValueError(f"Unknown snapshots mode: {mode}")
+
+        self.mode = mode
+        self.batchSize = batchSize
+        self.queue = queue.Queue()
+        self.noSaved = 0
+        self.thread = None
+        self.store = SnapshotStore()
+        # the day files written to by this run, they're emptied on their first write
+        # so that simulating the same dates again replaces their lines
+        self.writtenUrls = set()
+
+        if mode != "off":
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+            atexit.register(self.close)
+
+    def getUrl(self, symbol, date, modelName, exchange) -> str:
+        if self.mode == "full":
+            return getSnapshotUrl(symbol, date, modelName, exchange)
+        if self.mode == "compact":
+            return getCompactSnapshotsUrl(date, modelName, exchange)
+        if self.mode == "store":
+            return getSnapshotRecordsUrl(date, modelName, exchange)
+
+        return ""
+
+    def save(self, snapshot: Stock, date, modelName, exchange):
+        # the snapshot is serialized later so it mustn't change after this
+        if self.thread:
+            self.queue.put((snapshot, date, modelName, exchange))
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+
+            # take whatever else is already waiting
+            while len(batch) < self.batchSize:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            isClosed = None in batch
+            self.writeBatch([item for item in batch if item is not None])
+
+            if isClosed:
+                break
+
+    def writeBatch(self, batch):
+        lines = {}
+
+        for snapshot, date, modelName, exchange in batch:
+            url = self.getUrl(snapshot.symbol, date, modelName, exchange)
+
+            try:
+                if self.mode == "full":
+                    saveSnapshot(url, snapshot)
+                elif self.mode == "store":
+                    lines.setdefault(url, []).append(self.store.makeRecord(snapshot))
+                else:
+                    lines.setdefault(url, []).append(dumpCompactSnapshot(snapshot))
+
+                self.noSaved += 1
+            except:
+                print(f"Could not save the snapshot of {snapshot.symbol} to {url}")
+
+        # one write per file for the whole batch
+        for url in lines:
+            utils.mkdirP(os.path.dirname(url))
+
+            with open(url, url in self.writtenUrls and "a" or "w") as file:
+                file.write("\n".join(lines[url]) + "\n")
+
+            self.writtenUrls.add(url)
+
+    def close(self):
+        if self.thread and self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+            atexit.unregister(self.close)
@@ -0,0 +1,84 @@
+import json
+import os
+from datetime import datetime
+import pytest
+import modelLoader
+from batchEvaluateTest import makeStock
+from snapshotWriter import SnapshotWriter, getSnapshotUrl, getCompactSnapshotsUrl
+
+
+def makeSnapshots():
+    return [makeStock(f"S{i}", i) for i in range(5)]
+
+
+def testFullSnapshots(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    date = datetime(2020, 1, 2)
+    snapshots = makeSnapshots()
+    writer = SnapshotWriter("full", batchSize=2)
+
+    for snapshot in snapshots:
+        writer.save(snapshot, date, "model", "TEST")
+
+    writer.close()
+
+    assert writer.noSaved == len(snapshots)
+
+    for snapshot in snapshots:
+        with open(getSnapshotUrl(snapshot.symbol, date, "model", "TEST")) as file:
+            assert json.load(file) == modelLoader.dump(snapshot)
+
+
+def testCompactSnapshots(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    snapshots = makeSnapshots()
+    writer = SnapshotWriter("compact", batchSize=3)
+
+    for i, snapshot in enumerate(snapshots):
+        writer.save(snapshot, datetime(2020, 1, 2 + i % 2), "model", "TEST")
+
+    writer.close()
+
+    with open(getCompactSnapshotsUrl(datetime(2020, 1, 2), "model", "TEST")) as file:
+        lines = [json.loads(line) for line in file]
+
+    # one line per snapshot on that day, without the pricing
+    assert [line["symbol"] for line in lines] == ["S0", "S2", "S4"]
+    assert "historicalPricing" not in lines[0]
+    assert lines[1]["financialStatements"] == modelLoader.dump(
+        snapshots[2].financialStatements
+    )
+    assert writer.getUrl("S0", datetime(2020, 1, 3), "model", "TEST").endswith(
+        "2020-01-03.jsonl"
+    )
+
+
+def testCompactSnapshotsRerun(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    date = datetime(2020, 1, 2)
+    snapshots = makeSnapshots()
+
+    # simulating the same dates again replaces the day's lines
+    for run in range(2):
+        writer = SnapshotWriter("compact", batchSize=2)
+
+        for snapshot in snapshots:
+            writer.save(snapshot, date, "model", "TEST")
+
+        writer.close()
+
+    with open(getCompactSnapshotsUrl(date, "model", "TEST")) as file:
+        assert len(file.readlines()) == len(snapshots)
+
+
+def testNoSnapshots(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    writer = SnapshotWriter("off")
+    writer.save(makeSnapshots()[0], datetime(2020, 1, 2), "model", "TEST")
+    writer.close()
+
+    assert writer.noSaved == 0
+    assert not os.path.exists("data")
+
+    with pytest.raises(ValueError):
+        SnapshotWriter("everything")
@@ -0,0 +1,163 @@
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Dict
+import numpy as np
+from models import (
+    Date,
+    FinancialStatements,
+    IncomeStatement,
+    BalanceSheet,
+    CashFlowStatement,
+)
+
+
+@dataclass
+class StatementSeries:
+    """
+    struct of arrays version of Dict[Date, Statement]
+    dates are sorted ascending and every field is a column with the same order
+    """
+
+    dates: np.ndarray = field(default_factory=lambda: np.array([], "datetime64[D]"))
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __getitem__(self, key):
+        return self.columns[key]
+
+    def __len__(self):
+        return len(self.dates)
+
+
+@dataclass
+class FinancialStatementSeries:
+    incomeStatements: StatementSeries = field(default_factory=StatementSeries)
+    balanceSheets: StatementSeries = field(default_factory=StatementSeries)
+    cashFlowStatements: StatementSeries = field(default_factory=StatementSeries)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+statementTypes = {
+    "incomeStatements": IncomeStatement,
+    "balanceSheets": BalanceSheet,
+    "cashFlowStatements": CashFlowStatement,
+}
+
+
+def toDatetime64(date) -> np.datetime64:
+    # accepts date strings and datetimes
+    return np.datetime64(date, "D")
+
+
+def getColumnType(fieldType):
+    if fieldType is float:
+        return np.float64
+    if fieldType is bool:
+        return np.bool_
+
+    return object
+
+
+def makeStatementSeries(statements, factory) -> StatementSeries:
+    """
+    convert a Dict[Date, Statement] to a StatementSeries
+    factory is the statement class which tells us which fields to extract
+    """
+    dateStrings = sorted(statements)
+    sortedStatements = [statements[date] for date in dateStrings]
+    columns = {}
+
+    for statementField in dataclasses.fields(factory):
+        name = statementField.name
+        columns[name] = np.array(
+            [statement[name] for statement in sortedStatements],
+            dtype=getColumnType(statementField.type),
+        )
+
+    return StatementSeries(
+        dates=np.array(dateStrings, dtype="datetime64[D]"), columns=columns
+    )
+
+
+def getStatementsFromSeries(series: StatementSeries, factory) -> Dict[Date, object]:
+    """
+    convert a StatementSeries back to a Dict[Date, Statement]
+    """
+    names = list(series.columns)
+    rows = zip(*[series.columns[name].tolist() for name in names])
+    dateStrings = np.datetime_as_string(series.dates).tolist()
+
+    return {
+        date: factory(**dict(zip(names, row))) for date, row in zip(dateStrings, rows)
+    }
+
+
+def getAsOfIndex(series: StatementSeries, date) -> int:
+    """
+    the number of statements with a date on or before date
+    """
+    return int(np.searchsorted(series.dates, toDatetime64(date), side="right"))
+
+
+def getStatementSeriesAsOf(series: StatementSeries, date) -> StatementSeries:
+    """
+    the statements on or before date, the arrays are views (nothing is copied)
+    """
+    index = getAsOfIndex(series, date)
+
+    return StatementSeries(
+        dates=series.dates[:index],
+        columns={name: column[:index] for name, column in series.columns.items()},
+    )
+
+
+def getLatestValues(series: StatementSeries, key: str, limitTo: int = None):
+    """
+    the last limitTo values of a field (oldest first)
+    """
+    column = series.columns[key]
+
+    if limitTo is None:
+        return column
+
+    return column[max(len(column) - limitTo, 0) :]
+
+
+def makeFinancialStatementSeries(
+    financialStatements: FinancialStatements,
+) -> FinancialStatementSeries:
+    return FinancialStatementSeries(
+        **{
+            statementType: makeStatementSeries(
+                financialStatements[statementType], statementTypes[statementType]
+            )
+            for statementType in statementTypes
+        }
+    )
+
+
+def getFinancialStatementsFromSeries(
+    financialStatementSeries: FinancialStatementSeries,
+) -> FinancialStatements:
+    return FinancialStatements(
+        **{
+            statementType: getStatementsFromSeries(
+                financialStatementSeries[statementType], statementTypes[statementType]
+            )
+            for statementType in statementTypes
+        }
+    )
+
+
+def getFinancialStatementSeriesAsOf(
+    financialStatementSeries: FinancialStatementSeries, date
+) -> FinancialStatementSeries:
+    return FinancialStatementSeries(
+        **{
+            statementType: getStatementSeriesAsOf(
+                financialStatementSeries[statementType], date
+            )
+            for statementType in statementTypes
+        }
+    )
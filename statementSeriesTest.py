@@ -0,0 +1,76 @@
+import numpy as np
+from models import (
+    FinancialStatements,
+    IncomeStatement,
+    BalanceSheet,
+    CashFlowStatement,
+)
+import statementSeries
+
+
+def makeFinancialStatements() -> FinancialStatements:
+    # deliberately out of order
+    dates = ["2020-06-30", "2019-12-31", "2020-03-31", "2019-09-30"]
+
+    return FinancialStatements(
+        incomeStatements={
+            date: IncomeStatement(netIncome=float(i), source="actual")
+            for i, date in enumerate(dates)
+        },
+        balanceSheets={
+            date: BalanceSheet(assets=float(i * 10), estimate=True)
+            for i, date in enumerate(dates)
+        },
+        cashFlowStatements={dates[0]: CashFlowStatement(capex=5.0)},
+    )
+
+
+def testMakeFinancialStatementSeries():
+    financialStatements = makeFinancialStatements()
+    series = statementSeries.makeFinancialStatementSeries(financialStatements)
+
+    # the dates are sorted and the columns follow them
+    assert np.datetime_as_string(series.incomeStatements.dates).tolist() == [
+        "2019-09-30",
+        "2019-12-31",
+        "2020-03-31",
+        "2020-06-30",
+    ]
+    assert series.incomeStatements["netIncome"].tolist() == [3.0, 1.0, 2.0, 0.0]
+    assert series.balanceSheets["estimate"].all()
+    assert len(series.cashFlowStatements) == 1
+
+    # it converts back to the same statements
+    assert (
+        statementSeries.getFinancialStatementsFromSeries(series) == financialStatements
+    )
+
+
+def testGetFinancialStatementSeriesAsOf():
+    series = statementSeries.makeFinancialStatementSeries(makeFinancialStatements())
+    asOfSeries = statementSeries.getFinancialStatementSeriesAsOf(series, "2020-03-31")
+
+    # it includes statements on the date
+    assert asOfSeries.incomeStatements["netIncome"].tolist() == [3.0, 1.0, 2.0]
+    assert len(asOfSeries.cashFlowStatements) == 0
+
+    # it doesn't copy
+    assert np.shares_memory(
+        asOfSeries.incomeStatements["netIncome"], series.incomeStatements["netIncome"]
+    )
+
+    # it works for dates before and after all statements
+    assert statementSeries.getAsOfIndex(series.incomeStatements, "2000-01-01") == 0
+    assert statementSeries.getAsOfIndex(series.incomeStatements, "2030-01-01") == 4
+
+
+def testGetLatestValues():
+    series = statementSeries.makeFinancialStatementSeries(makeFinancialStatements())
+
+    assert statementSeries.getLatestValues(
+        series.incomeStatements, "netIncome", 2
+    ).tolist() == [2.0, 0.0]
+    assert (
+        len(statementSeries.getLatestValues(series.incomeStatements, "netIncome", 10))
+        == 4
+    )
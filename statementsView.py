@@ -0,0 +1,53 @@
+from collections.abc import Mapping
+from itertools import islice
+from typing import List
+from models import Date, FinancialStatements
+
+
+class StatementsView(Mapping):
+    """
+    a read only Dict[Date, Statement] of the statements of a type on or before a
+    cutoff, backed by the original statements (nothing is copied)
+    dates are the sorted dates of the original statements and end is the index
+    of the first date after the cutoff
+    """
+
+    __slots__ = ("financialStatements", "statementType", "dates", "end")
+
+    def __init__(
+        self,
+        financialStatements: FinancialStatements,
+        statementType: str,
+        dates: List[Date],
+        end: int,
+    ):
+        self.financialStatements = financialStatements
+        self.statementType = statementType
+        self.dates = dates
+        self.end = end
+
+    def __getitem__(self, date):
+        if date not in self:
+            raise KeyError(date)
+
+        return self.financialStatements[self.statementType][date]
+
+    def __contains__(self, date):
+        return (
+            isinstance(date, str)
+            and bool(self.end)
+            and date <= self.dates[self.end - 1]
+            and date in self.financialStatements[self.statementType]
+        )
+
+    def __iter__(self):
+        return islice(self.dates, self.end)
+
+    def __reversed__(self):
+        return reversed(self.dates[: self.end])
+
+    def __len__(self):
+        return self.end
+
+    def __repr__(self):
+        return f"StatementsView({dict(self)})"
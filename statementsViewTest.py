@@ -0,0 +1,94 @@
+from datetime import datetime
+import numpy as np
+import modelLoader
+import seriesCache
+from batchEvaluateTest import makeStock
+from evaluate import evaluate
+from getStockSnapshot import getHistoricalFinancialStatements
+from models import FinancialStatements, Stock
+
+
+def getCopiedStatements(stock, dateString):
+    # the statements that getHistoricalFinancialStatements used to copy
+    return FinancialStatements(
+        **{
+            statementType: {
+                date: statement
+                for date, statement in stock.financialStatements[statementType].items()
+                if date <= dateString
+            }
+            for statementType in [
+                "incomeStatements",
+                "balanceSheets",
+                "cashFlowStatements",
+            ]
+        }
+    )
+
+
+def testStatementsView():
+    stock = makeStock("TEST", 0)
+    dates = sorted(stock.financialStatements.incomeStatements)
+    dateString = dates[9]
+    views = seriesCache.getStatementsAsOf(stock.financialStatements, dateString)
+    incomeStatements = views.incomeStatements
+
+    assert len(incomeStatements) == 10
+    assert list(incomeStatements) == dates[:10]
+    assert list(reversed(incomeStatements)) == dates[:10][::-1]
+    assert dates[9] in incomeStatements
+    assert dates[10] not in incomeStatements
+    assert "1999-01-01" not in incomeStatements
+    assert None not in incomeStatements
+    assert (
+        incomeStatements[dates[3]]
+        is stock.financialStatements.incomeStatements[dates[3]]
+    )
+    assert incomeStatements.get(dates[10]) is None
+    assert views == getCopiedStatements(stock, dateString)
+
+    # nothing is before the first date
+    views = seriesCache.getStatementsAsOf(stock.financialStatements, "1999-01-01")
+
+    assert not views.balanceSheets
+    assert list(views.balanceSheets) == []
+
+
+def testGetHistoricalFinancialStatements():
+    stock = makeStock("TEST", 1)
+
+    for date in sorted(stock.financialStatements.balanceSheets)[::3]:
+        targetDate = datetime.strptime(date, "%Y-%m-%d")
+        financialStatements = getHistoricalFinancialStatements(stock, targetDate)
+        copiedStatements = getCopiedStatements(stock, date)
+
+        assert modelLoader.dump(financialStatements) == modelLoader.dump(
+            copiedStatements
+        )
+
+        # the views are evaluated and serialized like dicts
+        viewStock = Stock(
+            symbol="TEST",
+            currentPrice=stock.currentPrice,
+            sharesOutstanding=stock.sharesOutstanding,
+            financialStatements=financialStatements,
+        )
+        copiedStock = Stock(
+            symbol="TEST",
+            currentPrice=stock.currentPrice,
+            sharesOutstanding=stock.sharesOutstanding,
+            financialStatements=copiedStatements,
+        )
+
+        assert modelLoader.dump(evaluate(viewStock)) == modelLoader.dump(
+            evaluate(copiedStock)
+        )
+
+        # the series of the views are slices of the stock's series
+        series = seriesCache.getFinancialStatementSeries(financialStatements)
+        baseSeries = seriesCache.getFinancialStatementSeries(stock.financialStatements)
+
+        assert np.shares_memory(
+            series.incomeStatements["netIncome"],
+            baseSeries.incomeStatements["netIncome"],
+        )
@@ -0,0 +1,83 @@
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+from typing import Dict, List
+from models import Date, SimulationDay, Stocks, Symbol
+import utils
+
+
+def getTradingDates(stocks: Stocks) -> List[Date]:
+    """
+    the exchange's trading calendar, the sorted dates that any of its stocks has a price on
+    """
+    dates = set()
+
+    for symbol in stocks:
+        dates.update(stocks[symbol].historicalPricing)
+
+    return sorted(dates)
+
+
+def getMonthEnds(firstDate, lastDate) -> List[Date]:
+    monthEnds = []
+    date = utils.getEndOfMonth(firstDate)
+
+    while date <= lastDate:
+        monthEnds.append(utils.dateToDateString(date))
+        date = utils.getEndOfMonth(date + timedelta(days=1))
+
+    return monthEnds
+
+
+def getDividendDates(stocks: Stocks) -> Dict[Date, List[Symbol]]:
+    # the symbols that may pay dividends on each date (their cash flow statement dates)
+    dividendDates = {}
+
+    for symbol in stocks:
+        for date in stocks[symbol].financialStatements.cashFlowStatements:
+            dividendDates.setdefault(date, []).append(symbol)
+
+    return dividendDates
+
+
+def getSimulationDays(
+    startDate,
+    endDate,
+    tradingDates: List[Date],
+    dividendDates: Dict[Date, List[Symbol]],
+) -> List[SimulationDay]:
+    """
+    the days from startDate up to (not including) endDate that something happens on
+    i.e. trading days, month end deposits and dividend dates, every other day is skipped
+    """
+    noDays = int((endDate - startDate).days)
+
+    if noDays <= 0:
+        return []
+
+    firstDate = startDate
+    lastDate = startDate + timedelta(days=noDays - 1)
+    firstDateString = utils.dateToDateString(firstDate)
+    lastDateString = utils.dateToDateString(lastDate)
+    dates = set(
+        tradingDates[
+            bisect_left(tradingDates, firstDateString) : bisect_right(
+                tradingDates, lastDateString
+            )
+        ]
+    )
+    tradingDays = set(dates)
+    monthEnds = set(getMonthEnds(firstDate, lastDate))
+    dates.update(monthEnds)
+    dates.update(
+        date for date in dividendDates if firstDateString <= date <= lastDateString
+    )
+
+    return [
+        SimulationDay(
+            date=date,
+            isTradingDay=date in tradingDays,
+            isMonthEnd=date in monthEnds,
+            dividendSymbols=dividendDates.get(date, []),
+        )
+        for date in sorted(dates)
+    ]
@@ -0,0 +1,62 @@
+from datetime import datetime
+import simulate
+import tradingCalendar
+from makeSyntheticStocks import makeSyntheticStocks
+from models import Portfolio, ValuationModel
+
+
+def testGetSimulationDays():
+    stocks = makeSyntheticStocks(3, 2, seed=1, endDate=datetime(2020, 6, 30))
+    tradingDates = tradingCalendar.getTradingDates(stocks)
+    dividendDates = tradingCalendar.getDividendDates(stocks)
+    days = tradingCalendar.getSimulationDays(
+        datetime(2020, 1, 1), datetime(2020, 4, 1), tradingDates, dividendDates
+    )
+    dates = [day.date for day in days]
+
+    # the synthetic stocks only trade on weekdays
+    assert tradingDates == sorted(
+        set(date for symbol in stocks for date in stocks[symbol].historicalPricing)
+    )
+    assert "2020-01-04" not in dates  # a saturday
+    assert "2020-01-06" in dates
+    assert dates == sorted(dates)
+    assert dates[0] == "2020-01-01"
+    assert dates[-1] == "2020-03-31"  # the end date isn't included
+
+    # month ends are days even on weekends
+    monthEnds = [day.date for day in days if day.isMonthEnd]
+
+    assert monthEnds == ["2020-01-31", "2020-02-29", "2020-03-31"]
+
+    # the statement dates are dividend days
+    assert [day.date for day in days if day.dividendSymbols] == ["2020-03-31"]
+    assert days[-1].dividendSymbols == ["SYN0", "SYN1", "SYN2"]
+
+    for day in days:
+        assert day.isTradingDay == (day.date in tradingDates)
+        assert day.dividendSymbols == dividendDates.get(day.date, [])
+        assert day.isTradingDay or day.isMonthEnd or day.dividendSymbols
+
+    assert (
+        tradingCalendar.getSimulationDays(
+            datetime(2020, 1, 2), datetime(2020, 1, 1), tradingDates, dividendDates
+        )
+        == []
+    )
+
+
+def testSimulateDeposits(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stocks = makeSyntheticStocks(3, 2, seed=1, endDate=datetime(2020, 6, 30))
+    portfolio = simulate.simulate(
+        Portfolio(), stocks, ValuationModel(), "2020-01-01", "2020-04-01", "TEST"
+    )
+    deposits = [
+        transaction.date
+        for transaction in portfolio.transactionHistory.values()
+        if transaction.transactionType == "DEPOSIT"
+    ]
+
+    # a deposit on every month end (a saturday too)
+    assert deposits == ["2020-01-31", "2020-02-29", "2020-03-31"]
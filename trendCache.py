@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from statementsView import StatementsView
+import utils
+
+# fitted trend models, least recently used first
+trendModels = OrderedDict()
+maxSize = 10000
+stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def getStatementsEpoch(statements):
+    """
+    the statements visible to a stock only change when a new statement is added
+    so the latest date and the number of statements identify them
+    the view of a snapshot knows both without looking at its statements
+    """
+    if not statements:
+        return "", 0
+
+    if isinstance(statements, StatementsView):
+        return statements.dates[statements.end - 1], len(statements)
+
+    return max(statements), len(statements)
+
+
+def getTrendModel(symbol, statements, key, factory, order=2):
+    """
+    memoized utils.getTrendModel, keyed by the statements' epoch
+    restated statements of a symbol must be dropped with clearTrendCacheEntries
+    """
+    cacheKey = (symbol, key, order, getStatementsEpoch(statements))
+
+    if cacheKey in trendModels:
+        stats["hits"] += 1
+        trendModels.move_to_end(cacheKey)
+
+        return trendModels[cacheKey]
+
+    stats["misses"] += 1
+    model = utils.getTrendModel(statements, key, factory, order)
+    trendModels[cacheKey] = model
+
+    while len(trendModels) > maxSize:
+        trendModels.popitem(last=False)
+        stats["evictions"] += 1
+
+    return model
+
+
+def getTrendEstimateForDate(symbol, statements, key, factory, targetDate, order=2):
+    """
+    memoized version of utils.getTrendEstimateForDate
+    """
+    model = getTrendModel(symbol, statements, key, factory, order)
+
+    return utils.getTrendEstimate(model, targetDate)
+
+
+def setTrendCacheSize(size: int):
+    global maxSize
+    maxSize = size
+
+    while len(trendModels) > maxSize:
+        trendModels.popitem(last=False)
+        stats["evictions"] += 1
+
+
+def clearTrendCacheEntries(symbols):
+    # drop the fits of symbols, e.g. when their statements are reloaded
+    symbols = set(symbols)
+
+    for cacheKey in [cacheKey for cacheKey in trendModels if cacheKey[0] in symbols]:
+        trendModels.pop(cacheKey)
+
+
+def clearTrendCache():
+    trendModels.clear()
+
+    for stat in stats:
+        stats[stat] = 0
+
+
+def getTrendCacheStats():
+    lookups = stats["hits"] + stats["misses"]
+
+    return {
+        **stats,
+        "size": len(trendModels),
+        "hitRate": round(stats["hits"] / lookups, 4) if lookups else 0,
+    }
@@ -0,0 +1,124 @@
+import numpy as np
+from models import FinancialStatements, IncomeStatement
+import seriesCache
+import trendCache
+import utils
+
+
+def makeIncomeStatements(netIncomes):
+    dates = ["2019-03-31", "2019-06-30", "2019-09-30", "2019-12-31", "2020-03-31"]
+
+    return {
+        date: IncomeStatement(netIncome=netIncome)
+        for date, netIncome in zip(dates, netIncomes)
+    }
+
+
+def testGetTrendEstimateForDate():
+    trendCache.clearTrendCache()
+    statements = makeIncomeStatements([100, 110, 125, 130, 150])
+    expected = utils.getTrendEstimateForDate(
+        statements, "netIncome", IncomeStatement(), "2020-06-30", 1
+    )
+
+    for _ in range(3):
+        result = trendCache.getTrendEstimateForDate(
+            "TEST", statements, "netIncome", IncomeStatement(), "2020-06-30", 1
+        )
+        assert result == expected
+
+    stats = trendCache.getTrendCacheStats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+    assert stats["size"] == 1
+
+
+def testGetTrendEstimateForDateNewStatement():
+    trendCache.clearTrendCache()
+    statements = makeIncomeStatements([100, 110, 125, 130])
+    trendCache.getTrendEstimateForDate(
+        "TEST", statements, "netIncome", IncomeStatement(), "2020-06-30", 1
+    )
+
+    # a new quarter is a new fit
+    statements = makeIncomeStatements([100, 110, 125, 130, 150])
+    result = trendCache.getTrendEstimateForDate(
+        "TEST", statements, "netIncome", IncomeStatement(), "2020-06-30", 1
+    )
+    expected = utils.getTrendEstimateForDate(
+        statements, "netIncome", IncomeStatement(), "2020-06-30", 1
+    )
+
+    assert result == expected
+    assert trendCache.getTrendCacheStats()["misses"] == 2
+
+
+def testGetTrendEstimateForDateRestatement():
+    trendCache.clearTrendCache()
+    statements = makeIncomeStatements([100, 110, 125, 130, 150])
+    trendCache.getTrendEstimateForDate(
+        "TEST", statements, "netIncome", IncomeStatement(), "2020-06-30", 1
+    )
+
+    # an older quarter is restated, the latest one is the same
+    statements = makeIncomeStatements([100, 60, 125, 130, 150])
+    trendCache.clearTrendCacheEntries(["TEST"])
+    result = trendCache.getTrendEstimateForDate(
+        "TEST", statements, "netIncome", IncomeStatement(), "2020-06-30", 1
+    )
+    expected = utils.getTrendEstimateForDate(
+        statements, "netIncome", IncomeStatement(), "2020-06-30", 1
+    )
+
+    assert result == expected
+    assert trendCache.getTrendCacheStats()["misses"] == 2
+
+
+def testGetTrendEstimateForDateNotEnoughValues():
+    trendCache.clearTrendCache()
+    statements = makeIncomeStatements([100, 0])
+    result = trendCache.getTrendEstimateForDate(
+        "TEST", statements, "netIncome", IncomeStatement(), "2020-06-30", 1
+    )
+
+    assert result == 0
+
+
+def testSetTrendCacheSize():
+    trendCache.clearTrendCache()
+    trendCache.setTrendCacheSize(2)
+    statements = makeIncomeStatements([100, 110, 125, 130, 150])
+
+    for symbol in ["A", "B", "C"]:
+        trendCache.getTrendEstimateForDate(
+            symbol, statements, "netIncome", IncomeStatement(), "2020-06-30", 1
+        )
+
+    stats = trendCache.getTrendCacheStats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+
+    trendCache.setTrendCacheSize(10000)
+
+
+def testGetTrendModelAsOfView():
+    trendCache.clearTrendCache()
+    statements = makeIncomeStatements([100, 110, 125, 130, 150])
+    financialStatements = FinancialStatements(incomeStatements=statements)
+    dates = sorted(statements)
+
+    # every day between two statement dates is the same epoch
+    for date in [dates[3], "2020-01-15", "2020-02-28"]:
+        view = seriesCache.getStatementsAsOf(financialStatements, date)
+        model = trendCache.getTrendModel(
+            "TEST", view.incomeStatements, "netIncome", IncomeStatement(), 1
+        )
+        expected = utils.getTrendModel(
+            {d: statements[d] for d in dates[:4]}, "netIncome", IncomeStatement(), 1
+        )
+
+        assert np.isclose(model(18500), expected(18500))
+
+    stats = trendCache.getTrendCacheStats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
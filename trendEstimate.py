@@ -0,0 +1,202 @@
+from typing import List, Tuple
+import numpy as np
+from models import FinancialStatements
+from statementsView import StatementsView
+import seriesCache
+import utils
+
+
+class RunningLinearFit:
+    """
+    closed form least squares line fit from running sums, adding a point is O(1)
+    x values are shifted by the first x so that the sums stay well conditioned
+    can be used in place of the np.poly1d returned by utils.getTrendModel (order=1)
+    """
+
+    __slots__ = ("x0", "n", "su", "sy", "suu", "suy")
+
+    def __init__(self):
+        self.x0 = None
+        self.n = 0
+        self.su = 0.0
+        self.sy = 0.0
+        self.suu = 0.0
+        self.suy = 0.0
+
+    def add(self, x: float, y: float):
+        if self.x0 is None:
+            self.x0 = x
+
+        u = x - self.x0
+        self.n += 1
+        self.su += u
+        self.sy += y
+        self.suu += u * u
+        self.suy += u * y
+
+    def copy(self) -> "RunningLinearFit":
+        fit = RunningLinearFit()
+
+        for name in self.__slots__:
+            setattr(fit, name, getattr(self, name))
+
+        return fit
+
+    def getCoefficients(self) -> Tuple[float, float]:
+        """
+        returns the slope and the intercept (at x0)
+        """
+        if not self.n:
+            return 0.0, 0.0
+
+        denominator = self.n * self.suu - self.su * self.su
+        slope = denominator and (self.n * self.suy - self.su * self.sy) / denominator
+        intercept = (self.sy - slope * self.su) / self.n
+
+        return slope, intercept
+
+    def predict(self, x: float) -> float:
+        slope, intercept = self.getCoefficients()
+
+        return intercept + slope * (x - (self.x0 or 0))
+
+    def __call__(self, x: float) -> float:
+        return self.predict(x)
+
+    def __len__(self):
+        return self.n
+
+
+def getRunningFits(
+    financialStatements: FinancialStatements, statementType: str, key, factory
+):
+    """
+    the running fit of the non empty values of key after each statement (oldest
+    first), built once per statements by adding one value at a time
+    returns the number of values fitted after the first i statements and the fit
+    of the first n values, (counts, fits)
+    """
+    derived = seriesCache.getCacheEntry(financialStatements)[3]
+    cacheKey = ("runningFits", statementType, key)
+
+    if cacheKey not in derived:
+        statements = financialStatements[statementType]
+        fit = RunningLinearFit()
+        counts = [0]
+        fits = [fit.copy()]
+
+        for date in seriesCache.getSortedDates(financialStatements, statementType):
+            statement = statements[date]
+            value = statement[key]
+
+            if statement != factory and value:
+                fit.add(utils.dateStringToNum(date), float(value))
+                fits.append(fit.copy())
+
+            counts.append(len(fit))
+
+        derived[cacheKey] = counts, fits
+
+    return derived[cacheKey]
+
+
+def getLinearTrendModel(
+    financialStatements: FinancialStatements, statementType: str, key, factory
+) -> RunningLinearFit:
+    """
+    the closed form equivalent of utils.getTrendModel(statements, key, factory, 1)
+    of financialStatements[statementType], as of a view's cutoff if it is one
+    the fit is shared, don't add to it
+    """
+    statements = financialStatements[statementType]
+
+    if isinstance(statements, StatementsView):
+        financialStatements = statements.financialStatements
+        end = statements.end
+    else:
+        end = len(statements)
+
+    counts, fits = getRunningFits(financialStatements, statementType, key, factory)
+    fit = fits[counts[end]]
+
+    # require at least 3 values
+    if len(fit) <= 2:
+        return None
+
+    return fit
+
+
+def getLinearFits(x, y, mask=None):
+    """
+    fit a line to every row of x and y in one go, mask marks the points to use
+    returns the slopes, intercepts and number of points of every row
+    the intercepts are at x = 0
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    weights = np.ones(x.shape) if mask is None else np.asarray(mask, dtype=float)
+    counts = weights.sum(axis=1)
+    safeCounts = np.where(counts > 0, counts, 1)
+
+    # center x and y per row
+    xMean = (weights * x).sum(axis=1) / safeCounts
+    yMean = (weights * y).sum(axis=1) / safeCounts
+    dx = weights * (x - xMean[:, None])
+    sxx = (dx * dx).sum(axis=1)
+    sxy = (dx * np.where(weights > 0, y, 0)).sum(axis=1)
+
+    slopes = np.divide(sxy, sxx, out=np.zeros(sxx.shape), where=sxx > 0)
+    intercepts = yMean - slopes * xMean
+
+    return slopes, intercepts, counts
+
+
+def getStatementMatrix(statementsList: List, key, factory):
+    """
+    pad the non empty values of key in each statements into x, y and mask rows
+    x is utils.dateStringToNum of the statement dates
+    """
+    rows = [
+        utils.getNonEmptyHistoricalValues(statements, key, factory)
+        for statements in statementsList
+    ]
+    noColumns = max([len(row) for row in rows] or [0])
+    x = np.zeros((len(rows), noColumns))
+    y = np.zeros((len(rows), noColumns))
+    mask = np.zeros((len(rows), noColumns), dtype=bool)
+
+    for i, row in enumerate(rows):
+        for j, item in enumerate(row):
+            x[i, j] = utils.dateStringToNum(item["date"])
+            y[i, j] = item["value"]
+            mask[i, j] = True
+
+    return x, y, mask
+
+
+def getTrendFits(statementsList: List, key, factory):
+    """
+    the linear fits (slopes, intercepts and counts) of key in every statements
+    """
+    return getLinearFits(*getStatementMatrix(statementsList, key, factory))
+
+
+def getFitEstimates(fits, targetX):
+    """
+    the rounded estimates of fits at targetX, 0 where a fit has less than 3 values
+    targetX can be an array of x values, e.g. a column of one x per model
+    """
+    slopes, intercepts, counts = fits
+    estimates = np.round(slopes * targetX + intercepts, 2)
+
+    return np.where(counts > 2, estimates, 0)
+
+
+def getTrendEstimates(statementsList: List, key, factory, targetDate):
+    """
+    the batched equivalent of utils.getTrendEstimateForDate(..., order=1)
+    for every statements in statementsList
+    """
+    fits = getTrendFits(statementsList, key, factory)
+
+    return getFitEstimates(fits, utils.dateStringToNum(targetDate))
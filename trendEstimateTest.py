@@ -0,0 +1,143 @@
+import numpy as np
+import batchEvaluate
+import evaluate
+import seriesCache
+import trendEstimate
+import utils
+from batchEvaluateTest import makeStock
+from models import FinancialStatements, IncomeStatement, ValuationModel
+
+
+def makeIncomeStatements(netIncomes):
+    dates = ["2019-03-31", "2019-06-30", "2019-09-30", "2019-12-31", "2020-03-31"]
+
+    return {
+        date: IncomeStatement(netIncome=netIncome)
+        for date, netIncome in zip(dates, netIncomes)
+    }
+
+
+def testRunningLinearFit():
+    fit = trendEstimate.RunningLinearFit()
+    x = [18000, 18091, 18182, 18273, 18364]
+    y = [100, 110, 125, 130, 150]
+
+    for xValue, yValue in zip(x, y):
+        fit.add(xValue, yValue)
+
+    expected = np.poly1d(np.polyfit(x, y, 1))
+
+    assert len(fit) == 5
+    assert np.isclose(fit(18500), expected(18500))
+
+
+def testGetLinearTrendModel():
+    statements = makeIncomeStatements([100, 110, 125, 130, 150])
+    financialStatements = FinancialStatements(incomeStatements=statements)
+
+    for targetDate in ["2017-06-30", "2020-06-30"]:
+        expected = utils.getTrendEstimateForDate(
+            statements, "netIncome", IncomeStatement(), targetDate, 1
+        )
+        fit = trendEstimate.getLinearTrendModel(
+            financialStatements, "incomeStatements", "netIncome", IncomeStatement()
+        )
+        assert np.isclose(utils.getTrendEstimate(fit, targetDate), expected)
+
+
+def testGetLinearTrendModelAsOf():
+    statements = makeIncomeStatements([100, 110, 125, 130, 150])
+    financialStatements = FinancialStatements(incomeStatements=statements)
+    dates = list(statements)
+
+    # each view's fit is the running fit up to its cutoff, built once
+    for i in range(3, len(dates) + 1):
+        view = seriesCache.getStatementsAsOf(financialStatements, dates[i - 1])
+        fit = trendEstimate.getLinearTrendModel(
+            view, "incomeStatements", "netIncome", IncomeStatement()
+        )
+        expected = utils.getTrendModel(
+            {date: statements[date] for date in dates[:i]},
+            "netIncome",
+            IncomeStatement(),
+            1,
+        )
+
+        assert len(fit) == i
+        assert np.isclose(fit(18500), expected(18500))
+        assert (
+            fit
+            is trendEstimate.getRunningFits(
+                financialStatements, "incomeStatements", "netIncome", IncomeStatement()
+            )[1][i]
+        )
+
+
+def testGetLinearTrendModelRestatement():
+    statements = makeIncomeStatements([100, 110, 125, 130, 150])
+    trendEstimate.getLinearTrendModel(
+        FinancialStatements(incomeStatements=statements),
+        "incomeStatements",
+        "netIncome",
+        IncomeStatement(),
+    )
+
+    # an older quarter is restated in the reloaded statements
+    statements = makeIncomeStatements([100, 60, 125, 130, 150])
+    fit = trendEstimate.getLinearTrendModel(
+        FinancialStatements(incomeStatements=statements),
+        "incomeStatements",
+        "netIncome",
+        IncomeStatement(),
+    )
+    expected = utils.getTrendModel(statements, "netIncome", IncomeStatement(), 1)
+
+    assert np.isclose(fit(18500), expected(18500))
+
+
+def testGetLinearTrendModelNotEnoughValues():
+    statements = makeIncomeStatements([100, 0, 0])
+
+    assert (
+        trendEstimate.getLinearTrendModel(
+            FinancialStatements(incomeStatements=statements),
+            "incomeStatements",
+            "netIncome",
+            IncomeStatement(),
+        )
+        is None
+    )
+
+
+def testGetTrendEstimates():
+    statementsList = [
+        makeIncomeStatements([100, 110, 125, 130, 150]),
+        makeIncomeStatements([-10, 5, -20, 40]),
+        makeIncomeStatements([100, 0]),
+        {},
+    ]
+    estimates = trendEstimate.getTrendEstimates(
+        statementsList, "netIncome", IncomeStatement(), "2020-06-30"
+    )
+    expected = [
+        utils.getTrendEstimateForDate(
+            statements, "netIncome", IncomeStatement(), "2020-06-30", 1
+        )
+        for statements in statementsList
+    ]
+
+    assert np.allclose(estimates, expected)
+
+
+def testGetNetIncomeGrowthRates():
+    stocks = {f"SYM{i}": makeStock(f"SYM{i}", i) for i in range(20)}
+    model = ValuationModel()
+    growthRates = batchEvaluate.getNetIncomeGrowthRates(stocks, model)
+    expected = [evaluate.getNetIncomeGrowthRate(stocks[s], model) for s in stocks]
+    closedForm = [
+        evaluate.getNetIncomeGrowthRate(stocks[s], model, closedForm=True)
+        for s in stocks
+    ]
+
+    assert np.allclose(growthRates, expected)
+    assert np.allclose(closedForm, expected)
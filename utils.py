@@ -1,5 +1,7 @@
 import os, errno
+import math
 import uuid
+from functools import lru_cache
 from typing import TypeVar
 import urllib.request
 import json
@@ -164,6 +166,48 @@ def falsyToInt(obj):
     return cleanObj
 
 
+def sanitize(obj, keys=None):
+    """
+    replace all None, NaN and inf values in a nested dict/list with 0
+    in a single non-recursive pass, strings and bools are left untouched
+    NOTE obj is cleaned in place, pass keys to only keep (and clean)
+    those top level subtrees
+    """
+    if keys is not None:
+        obj = {key: obj[key] for key in keys if key in obj}
+
+    containers = [obj]
+
+    while containers:
+        container = containers.pop()
+        items = (
+            container.items() if isinstance(container, dict) else enumerate(container)
+        )
+
+        for key, field in items:
+            fieldType = type(field)
+
+            if fieldType is str or fieldType is bool or fieldType is int:
+                continue
+            elif fieldType is float:
+                if not math.isfinite(field):
+                    container[key] = 0
+            elif fieldType is dict or fieldType is list:
+                containers.append(field)
+            elif field is None:
+                container[key] = 0
+            elif isinstance(field, (dict, list)):
+                containers.append(field)
+            else:
+                # some other number type (e.g. numpy), keep it if it is parseable
+                try:
+                    int(field)
+                except:
+                    container[key] = 0
+
+    return obj
+
+
 def getNumberOfSymbolsToProcess(_exchanges):
     total = 0
 
@@ -211,7 +255,7 @@ def getHistoricalValuesFromFinancialStatements(
     return historicalValues
 
 
-def getTrendEstimateForDate(statements, key, factory, targetDate, order=2):
+def getNonEmptyHistoricalValues(statements, key, factory):
     # filter out empty statements and 0 values if not shouldUseZeroValues
     nonEmptyStatements = {}
     for date in statements:
@@ -219,13 +263,20 @@ def getTrendEstimateForDate(statements, key, factory, targetDate, order=2):
         value = statement[key]
         if statement != factory and value:
             nonEmptyStatements[date] = statement
-    historicalValues = getHistoricalValuesFromFinancialStatements(
-        nonEmptyStatements, key
-    )
+
+    return getHistoricalValuesFromFinancialStatements(nonEmptyStatements, key)
+
+
+def getTrendModel(statements, key, factory, order=2):
+    """
+    fit a trend to the non empty values of key in statements
+    returns None if there aren't enough values to fit a trend to
+    """
+    historicalValues = getNonEmptyHistoricalValues(statements, key, factory)
 
     # require at least 3 values
     if len(historicalValues) <= 2:
-        return 0
+        return None
 
     y = np.array([item["value"] for item in historicalValues])
 
@@ -235,8 +286,25 @@ def getTrendEstimateForDate(statements, key, factory, targetDate, order=2):
 
     # machine learning!
     model = np.polyfit(x, y, order)  # NOTE: 1 == linear, 2+ == polynomial
-    predict = np.poly1d(model)
-    predictionDate = mdates.datestr2num([targetDate])[0]
-    prediction = predict(predictionDate)
+
+    return np.poly1d(model)
+
+
+@lru_cache(maxsize=4096)
+def dateStringToNum(dateString):
+    return mdates.datestr2num([dateString])[0]
+
+
+def getTrendEstimate(model, targetDate):
+    if model is None:
+        return 0
+
+    prediction = model(dateStringToNum(targetDate))
 
     return round(prediction, 2)
+
+
+def getTrendEstimateForDate(statements, key, factory, targetDate, order=2):
+    model = getTrendModel(statements, key, factory, order)
+
+    return getTrendEstimate(model, targetDate)
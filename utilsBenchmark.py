@@ -0,0 +1,81 @@
+import argparse
+import copy
+import utils
+from benchmarkUtils import benchmark
+
+
+def makeFundamentalsPayload(noYears):
+    """
+    make an EOD fundamentals like payload, most of it (Earnings, Holders etc.)
+    is data we never use
+    """
+    statementTypes = {
+        "Income_Statement": ["totalRevenue", "netIncome", "incomeBeforeTax"],
+        "Balance_Sheet": ["totalAssets", "totalLiab", "cash", "retainedEarnings"],
+        "Cash_Flow": ["dividendsPaid", "capitalExpenditures"],
+    }
+    financials = {}
+    for statementType in statementTypes:
+        financials[statementType] = {"currency_symbol": "ZAR"}
+
+        for cycleType in ["quarterly", "yearly"]:
+            statements = {}
+
+            for i in range(noYears * (4 if cycleType == "quarterly" else 1)):
+                date = f"{2020 - i // 4}-{(i % 4) * 3 + 3:02d}-30"
+                statements[date] = {"date": date, "filing_date": None}
+
+                for j, key in enumerate(statementTypes[statementType]):
+                    statements[date][key] = (
+                        float("nan") if (i + j) % 7 == 0 else str(i * 1000.0 + j)
+                    )
+
+            financials[statementType][cycleType] = statements
+
+    history = {}
+    for i in range(noYears * 250):
+        history[str(i)] = {
+            "date": str(i),
+            "value": i * 1.5,
+            "estimate": None if i % 3 else float("inf"),
+            "tags": [{"name": "a", "weight": None}],
+        }
+
+    return {
+        "General": {
+            "Name": "Synthetic",
+            "Sector": "",
+            "Officers": {
+                str(i): {"Name": "Person", "Title": "CEO", "YearBorn": None}
+                for i in range(10)
+            },
+        },
+        "Highlights": {"MarketCapitalization": 1e9, "PERatio": float("nan")},
+        "Earnings": {"History": history},
+        "outstandingShares": {"annual": history},
+        "Financials": financials,
+    }
+
+
+def runBenchmark():
+    argParser = argparse.ArgumentParser()
+    argParser.add_argument("--years", type=int, default=20)
+    args = argParser.parse_known_args()
+
+    payload = makeFundamentalsPayload(args[0].years)
+    assert utils.falsyToInt(payload) == utils.sanitize(copy.deepcopy(payload))
+
+    # sanitize works in place so every run needs a fresh copy
+    payloads = [copy.deepcopy(payload) for _ in range(9)]
+    before = benchmark("falsyToInt", lambda: utils.falsyToInt(payloads.pop()), 3)
+    after = benchmark("sanitize", lambda: utils.sanitize(payloads.pop()), 3)
+    restricted = benchmark(
+        "sanitize (General, Financials)",
+        lambda: utils.sanitize(payloads.pop(), ["General", "Financials"]),
+        3,
+    )
+    print(f"Speed-up: {round(before / after, 1)}x")
+    print(f"Speed-up (General, Financials): {round(before / restricted, 1)}x")
+
+
+runBenchmark()
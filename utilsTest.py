@@ -99,3 +99,33 @@ def testIsEndOfMonth():
 
     # returns True for date at end of month
     assert utils.isEndOfMonth(datetime.datetime(2020, 3, 31))
+
+
+def testSanitize():
+    data = {
+        "a": None,
+        "b": float("nan"),
+        "c": float("inf"),
+        "d": "None",
+        "e": False,
+        "f": 1.5,
+        "g": [None, {"h": float("-inf")}, "i"],
+        "j": {"k": {"l": None, "m": 2}},
+    }
+
+    # it replaces None, NaN and inf with 0 and leaves the rest untouched
+    assert utils.sanitize(data) == {
+        "a": 0,
+        "b": 0,
+        "c": 0,
+        "d": "None",
+        "e": False,
+        "f": 1.5,
+        "g": [0, {"h": 0}, "i"],
+        "j": {"k": {"l": 0, "m": 2}},
+    }
+
+    # it only keeps the subtrees we ask for
+    assert utils.sanitize({"General": None, "Earnings": {}}, ["General"]) == {
+        "General": 0
+    }
@@ -0,0 +1,261 @@
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+import modelLoader
+import priceSeries
+import trendCache
+from models import Stock, Symbol, ValuationModel
+from evaluate import evaluate
+from getStockSnapshot import getStockSnapshot
+from screen import screen
+import utils
+
+
+# evaluate's caches aren't thread safe so queries are answered one at a time
+# (reentrant, a reload request refreshes the universe while holding it)
+evaluateLock = threading.RLock()
+
+
+class StockUniverse:
+    """
+    an exchange's stocks kept in memory, a stock is reloaded when its file changes
+    """
+
+    def __init__(self, exchange: str):
+        self.exchange = exchange
+        self.stocks: Dict[Symbol, Stock] = {}
+        self.mtimes: Dict[Symbol, int] = {}
+        self.lock = threading.Lock()
+
+    def getPath(self, symbol: Symbol = "") -> str:
+        return f"data/stocks/{self.exchange}/{symbol and symbol + '.json'}"
+
+    def refresh(self) -> List[Symbol]:
+        """
+        (re)load the stocks whose files were added or changed and drop the removed ones
+        returns the symbols that changed
+        """
+        mtimes = {}
+        for filename in os.listdir(self.getPath()):
+            if filename.endswith(".json"):
+                symbol = filename.replace(".json", "")
+                mtimes[symbol] = os.stat(self.getPath(symbol)).st_mtime_ns
+
+        stocks = {}
+        for symbol in mtimes:
+            if self.mtimes.get(symbol) == mtimes[symbol]:
+                continue
+
+            try:
+                with open(self.getPath(symbol)) as file:
+                    stocks[symbol] = modelLoader.load(json.load(file), Stock)
+            except:
+                # the file is probably still being written, try again next time
+                mtimes.pop(symbol)
+                print(f"Could not load {symbol}, will retry.")
+
+        removed = [symbol for symbol in self.stocks if symbol not in mtimes]
+
+        changed = list(stocks) + removed
+
+        with self.lock:
+            oldStocks = [
+                self.stocks[symbol] for symbol in changed if symbol in self.stocks
+            ]
+            self.stocks.update(stocks)
+
+            for symbol in removed:
+                self.stocks.pop(symbol, None)
+                self.mtimes.pop(symbol, None)
+
+            self.mtimes.update({symbol: mtimes[symbol] for symbol in stocks})
+
+        # the caches aren't thread safe, drop what was cached of the old stocks
+        # (the cached series hold on to their pricing) and warm the new ones
+        with evaluateLock:
+            trendCache.clearTrendCacheEntries(changed)
+            priceSeries.clearPriceSeriesEntries(
+                [stock.historicalPricing for stock in oldStocks]
+            )
+
+            for symbol in stocks:
+                priceSeries.getPriceSeries(stocks[symbol].historicalPricing)
+
+        return changed
+
+    def watch(self, interval: float):
+        # poll the stock files for changes (in a daemon thread)
+        def poll():
+            while True:
+                time.sleep(interval)
+                changed = self.refresh()
+
+                if changed:
+                    print(f"Reloaded {len(changed)} stocks.")
+
+        thread = threading.Thread(target=poll, daemon=True)
+        thread.start()
+
+        return thread
+
+    def getStock(self, symbol: Symbol) -> Stock:
+        with self.lock:
+            return self.stocks.get(symbol)
+
+    def getSymbols(self) -> List[Symbol]:
+        with self.lock:
+            return sorted(self.stocks)
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def getParamsStock(universe: StockUniverse, params) -> Stock:
+    # the stock (or its snapshot if there's a date) of the params
+    stock = universe.getStock(params.get("symbol"))
+
+    if not stock:
+        raise RpcError(-32602, f"Unknown symbol: {params.get('symbol')}")
+
+    if params.get("date"):
+        stock = getStockSnapshot(stock, utils.dateStringToDate(params["date"]))
+
+        if not stock:
+            raise RpcError(-32000, f"No snapshot on {params['date']}")
+
+    return stock
+
+
+def getParamsModel(params) -> ValuationModel:
+    if params.get("model"):
+        return modelLoader.load(params["model"], ValuationModel)
+
+    return ValuationModel()
+
+
+def handleEvaluate(universe: StockUniverse, params):
+    stock = getParamsStock(universe, params)
+
+    return modelLoader.dump(evaluate(stock, getParamsModel(params)))
+
+
+def handleScreen(universe: StockUniverse, params):
+    stock = getParamsStock(universe, params)
+
+    return modelLoader.dump(screen(stock, getParamsModel(params)))
+
+
+def handleGetStockSnapshot(universe: StockUniverse, params):
+    stock = getParamsStock(universe, params)
+    data = modelLoader.dump(stock)
+
+    # the pricing is big and the same for every snapshot
+    if not params.get("historicalPricing"):
+        data.pop("historicalPricing")
+
+    return data
+
+
+def handleListStocks(universe: StockUniverse, params):
+    return universe.getSymbols()
+
+
+def handleReload(universe: StockUniverse, params):
+    return universe.refresh()
+
+
+handlers = {
+    "evaluate": handleEvaluate,
+    "screen": handleScreen,
+    "getStockSnapshot": handleGetStockSnapshot,
+    "listStocks": handleListStocks,
+    "reload": handleReload,
+}
+
+
+def handleRequest(universe: StockUniverse, request) -> Dict:
+    """
+    answer a JSON-RPC 2.0 request
+    """
+    requestId = request.get("id") if isinstance(request, dict) else None
+    response = {"jsonrpc": "2.0", "id": requestId}
+
+    try:
+        if not isinstance(request, dict) or request.get("method") not in handlers:
+            raise RpcError(-32601, "Method not found")
+
+        params = request.get("params") or {}
+
+        with evaluateLock:
+            response["result"] = handlers[request["method"]](universe, params)
+    except RpcError as error:
+        response["error"] = {"code": error.code, "message": error.message}
+    except Exception as error:
+        response["error"] = {"code": -32000, "message": str(error)}
+
+    return response
+
+
+class ValuationRequestHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+
+        try:
+            request = json.loads(self.rfile.read(length))
+            response = handleRequest(self.server.universe, request)
+        except json.JSONDecodeError:
+            response = {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {"code": -32700, "message": "Parse error"},
+            }
+
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # don't log every request
+        pass
+
+
+def makeServer(universe: StockUniverse, host: str, port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), ValuationRequestHandler)
+    server.universe = universe
+
+    return server
+
+
+def runServer():
+    argParser = argparse.ArgumentParser()
+    argParser.add_argument("--exchange", type=str)
+    argParser.add_argument("--host", type=str, default="127.0.0.1")
+    argParser.add_argument("--port", type=int, default=8765)
+    argParser.add_argument("--interval", type=float, default=5)
+    args = argParser.parse_known_args()
+
+    universe = StockUniverse(args[0].exchange)
+    startTime = datetime.now()
+    universe.refresh()
+    print(f"Loaded {len(universe.stocks)} stocks in {datetime.now() - startTime}.")
+    universe.watch(args[0].interval)
+
+    server = makeServer(universe, args[0].host, args[0].port)
+    print(f"Serving {args[0].exchange} on http://{args[0].host}:{args[0].port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    runServer()
@@ -0,0 +1,158 @@
+import json
+import os
+import threading
+import urllib.request
+import modelLoader
+import priceSeries
+import trendCache
+import utils
+from batchEvaluateTest import makeStock
+from evaluate import evaluate
+from models import Stock
+from valuationServer import StockUniverse, handleRequest, makeServer
+
+
+def writeStock(stock):
+    with utils.safeOpenWrite(f"data/stocks/TEST/{stock.symbol}.json") as file:
+        file.write(json.dumps(modelLoader.dump(stock)))
+
+
+def makeUniverse(symbols):
+    stocks = {symbol: makeStock(symbol, i) for i, symbol in enumerate(symbols)}
+
+    for symbol in stocks:
+        writeStock(stocks[symbol])
+
+    universe = StockUniverse("TEST")
+    universe.refresh()
+
+    return universe, stocks
+
+
+def testHandleRequest(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    universe, stocks = makeUniverse(["S0", "S1"])
+
+    response = handleRequest(universe, {"id": 1, "method": "listStocks"})
+    assert response["result"] == ["S0", "S1"]
+
+    response = handleRequest(
+        universe, {"id": 2, "method": "evaluate", "params": {"symbol": "S1"}}
+    )
+    assert response["id"] == 2
+    assert response["result"] == modelLoader.dump(evaluate(stocks["S1"]))
+
+    response = handleRequest(
+        universe, {"id": 3, "method": "screen", "params": {"symbol": "S0"}}
+    )
+    assert response["result"]["instruction"] == evaluate(stocks["S0"]).instruction
+
+    date = sorted(stocks["S0"].financialStatements.incomeStatements)[10]
+    response = handleRequest(
+        universe,
+        {
+            "id": 4,
+            "method": "getStockSnapshot",
+            "params": {"symbol": "S0", "date": date},
+        },
+    )
+    incomeStatements = response["result"]["financialStatements"]["incomeStatements"]
+    assert max(incomeStatements) == date
+    assert "historicalPricing" not in response["result"]
+
+
+def testHandleRequestErrors(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    universe, stocks = makeUniverse(["S0"])
+
+    response = handleRequest(universe, {"id": 1, "method": "unknown"})
+    assert response["error"]["code"] == -32601
+
+    response = handleRequest(
+        universe, {"id": 2, "method": "evaluate", "params": {"symbol": "NOPE"}}
+    )
+    assert response["error"]["code"] == -32602
+
+
+def testRefresh(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    universe, stocks = makeUniverse(["S0", "S1"])
+
+    assert universe.refresh() == []
+
+    # a changed file is reloaded
+    stock = stocks["S0"]
+    stock.currentPrice = 123.0
+    writeStock(stock)
+    os.utime(universe.getPath("S0"), ns=(0, 1))
+    assert universe.refresh() == ["S0"]
+    assert universe.getStock("S0").currentPrice == 123.0
+
+    # a removed file is dropped
+    os.remove(universe.getPath("S1"))
+    assert universe.refresh() == ["S1"]
+    assert universe.getSymbols() == ["S0"]
+
+
+def testRefreshRestatement(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    universe, stocks = makeUniverse(["S0"])
+    before = handleRequest(
+        universe, {"id": 1, "method": "evaluate", "params": {"symbol": "S0"}}
+    )
+
+    # an older quarter is restated on disk
+    stock = stocks["S0"]
+    date = sorted(stock.financialStatements.incomeStatements)[2]
+    stock.financialStatements.incomeStatements[date].netIncome *= 5
+    writeStock(stock)
+    os.utime(universe.getPath("S0"), ns=(0, 1))
+
+    oldPricing = universe.getStock("S0").historicalPricing
+    response = handleRequest(universe, {"id": 2, "method": "reload"})
+    assert response["result"] == ["S0"]
+
+    # the old pricing's series is dropped and the new one is built
+    assert id(oldPricing) not in priceSeries.priceSeriesCache
+    newPricing = universe.getStock("S0").historicalPricing
+    assert priceSeries.priceSeriesCache[id(newPricing)][0] is newPricing
+    assert not [key for key in trendCache.trendModels if key[0] == "S0"]
+
+    response = handleRequest(
+        universe, {"id": 3, "method": "evaluate", "params": {"symbol": "S0"}}
+    )
+    trendCache.clearTrendCache()
+    with open(universe.getPath("S0")) as file:
+        expected = evaluate(modelLoader.load(json.load(file), Stock))
+
+    assert response["result"] == modelLoader.dump(expected)
+    assert response["result"]["growthRate"] != before["result"]["growthRate"]
+
+
+def testServer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    universe, stocks = makeUniverse(["S0"])
+    server = makeServer(universe, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_address[1]}",
+            data=json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "evaluate",
+                    "params": {"symbol": "S0"},
+                }
+            ).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            data = json.loads(response.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert data["result"] == modelLoader.dump(evaluate(stocks["S0"]))